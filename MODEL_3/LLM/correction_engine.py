@@ -1,8 +1,9 @@
-from groq import Groq
+from groq import Groq, APIError
 from dotenv import load_dotenv
 import os
-from .prompt_templates import create_prompt_template
-from .response_formatter import ResponseFormatter, SimpleFormatter
+import time
+from .prompt_templates import create_prompt_template, create_structured_prompt_template
+from .response_formatter import ResponseFormatter, SimpleFormatter, StructuredFormatter, parse_structured
 
 # load .env file t0 get access keys
 load_dotenv()
@@ -10,20 +11,31 @@ load_dotenv()
 class GermanTutor:
     def __init__(self,
                 model = "llama-3.3-70b-versatile",
+                length_controller = None,
                 ):
         """
         other options for model:
             - llama-3.3-70b-versatile (Best for German)
             - llama-3.1-8b-instant (Faster, less accurate)
             - mixtral-8x7b-32768 (Good alternative)
+        
+        length_controller: Optional length_controller.LengthController that sets
+                            max_tokens per turn and trims truncated replies
         """
         self.model = model
+        self.length_controller = length_controller
         self.client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+        self.last_stats = {}
+        self.last_response = None  # raw (markdown) text of the last reply
         
     def response(self,
                 prompt: str,
                 RAG_answer: str,
-                use_simple_format: bool = False):
+                use_simple_format: bool = False,
+                route = None,
+                structured: bool = False,
+                grammar_hint: str = None,
+                language: str = None):
         
         """
         Get LLM response and print it formatted.
@@ -32,27 +44,94 @@ class GermanTutor:
             prompt: User's input text
             RAG_answer: response of web search
             use_simple_format: If True, use minimal formatting
+            route: Optional intent_router.Route overriding model, temperature and max_tokens
+            structured: If True, ask for a JSON reply and return a StructuredReply
+            grammar_hint: Optional finding of grammar_checker passed on to the LLM
+            language: Language the student spoke (STT), added to the prompt as a hint
         
         Returns:
-            The raw LLM response text
+            Speech-ready response text, or a StructuredReply in structured mode
+            (falls back to text if the JSON reply can't be parsed)
+        
+        Raises:
+            groq.APIError: The request failed (last_stats has ok=False)
         """
 
         # init formatter
         formatter = SimpleFormatter() if use_simple_format else ResponseFormatter()
         
+        # Generation profile (routed or default)
+        model = route.model if route else self.model
+        temperature = route.temperature if route else 0.9
+        max_tokens = route.max_tokens if route else 500
+        length_hint = None
+        
+        # Adapt budget to input length, intent and learner verbosity
+        if self.length_controller:
+            max_tokens = self.length_controller.budget(
+                prompt,
+                intent=route.intent if route else None,
+                base=max_tokens
+            )
+            length_hint = self.length_controller.word_hint(max_tokens)
+        
+        # Structured mode: JSON object instead of free markdown
+        if structured:
+            build_messages = create_structured_prompt_template
+            extra = {"response_format": {"type": "json_object"}}
+        else:
+            build_messages = create_prompt_template
+            extra = {}
+        
         # Show thinking indicator
         with formatter.console.status("[bold magenta]🤔 Thinking...[/bold magenta]", spinner="dots"):
             # Get LLM response
-            response = self.client.chat.completions.create(
-            model= self.model,
-            messages=create_prompt_template(prompt, RAG_answer),
-            temperature = 0.9,
-            max_tokens = 500
-        )
+            start = time.perf_counter()
+            try:
+                response = self.client.chat.completions.create(
+                model= model,
+                messages=build_messages(prompt, RAG_answer, length_hint=length_hint, grammar_hint=grammar_hint,
+                                        language=language),
+                temperature = temperature,
+                max_tokens = max_tokens,
+                **extra
+            )
+            except APIError:
+                # failed turn: stats for the router's outcome log, caller decides what to do
+                self.last_stats = {"latency": time.perf_counter() - start, "completion_tokens": None, "ok": False}
+                raise
+            latency = time.perf_counter() - start
+        
+        usage = getattr(response, "usage", None)
+        self.last_stats = {
+            "latency": latency,
+            "completion_tokens": getattr(usage, "completion_tokens", None),
+            "ok": True,
+        }
         
         # Extract response text
+        truncated = response.choices[0].finish_reason == "length"
         response = response.choices[0].message.content
         
+        # Structured reply: parsed fields, no markdown post-processing
+        reply = parse_structured(response) if structured else None
+        
+        # Cut at a sentence boundary if the budget was hit (text replies only)
+        if self.length_controller:
+            if truncated and reply is None:
+                response = self.length_controller.trim(response)
+            self.length_controller.record(
+                max_tokens=max_tokens,
+                completion_tokens=self.last_stats["completion_tokens"],
+                chars=len(response),
+                latency=latency,
+                truncated=truncated
+            )
+        
+        self.last_response = response
+        if reply is not None:
+            return StructuredFormatter().format_and_print(reply, user_input=prompt)
+        
         # Format and print
         clean_response = formatter.format_and_print(response, user_input=prompt)
         
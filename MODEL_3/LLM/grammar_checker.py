@@ -0,0 +1,376 @@
+"""
+Rule-based German grammar fast path
+Catches common mechanical learner errors locally (no LLM round trip):
+    - haben vs. sein in the Perfekt / Plusquamperfekt
+    - verb-second word order after a fronted adverb
+    - article case after accusative / dative prepositions
+"""
+
+import re
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+from ..metrics import metrics
+from .response_formatter import StructuredReply
+
+
+# ========================================= #
+# ============     LEXICON     ============ #
+# ========================================= #
+
+# Participles that form the Perfekt with "sein" (motion / change of state).
+# Ambiguous ones are left to the LLM: forms that also take an object or "haben"
+# (gefahren, geflogen, geboren, gelandet, ...), reflexive ones (umgezogen) and
+# ones identical to a present-tense form (passiert, begegnet).
+SEIN_PARTICIPLES = {
+    "gegangen", "gekommen", "gerannt", "gereist", "gewandert", "geklettert",
+    "gesprungen", "gefolgt", "gestiegen", "geblieben", "gewesen", "geworden",
+    "gestorben", "gewachsen", "geschehen", "gelungen", "verschwunden", "erschienen",
+    "aufgestanden", "aufgewacht", "eingeschlafen", "aufgewachsen",
+    "angekommen", "losgefahren", "zurückgekommen",
+    "mitgekommen", "hingegangen", "weggegangen", "ausgegangen", "spazierengegangen",
+    "eingestiegen", "ausgestiegen", "umgestiegen", "abgeflogen",
+    "hereingekommen", "vorbeigekommen", "heimgekommen",
+}
+
+# haben form -> sein form with the same person / number / tense
+HABEN_TO_SEIN = {
+    "habe": "bin", "hab": "bin", "hast": "bist", "hat": "ist", "haben": "sind", "habt": "seid",
+    "hatte": "war", "hattest": "warst", "hatten": "waren", "hattet": "wart",
+}
+
+SEIN_FORMS = set(HABEN_TO_SEIN.values())
+
+# Prepositions with a fixed case (two-way prepositions need context, left to the LLM;
+# "bis" and "seit" are also conjunctions: "bis der Bus kommt")
+PREPOSITION_CASE = {
+    # Akkusativ
+    "durch": "acc", "für": "acc", "gegen": "acc", "ohne": "acc", "um": "acc",
+    # Dativ
+    "aus": "dat", "bei": "dat", "mit": "dat", "nach": "dat",
+    "von": "dat", "zu": "dat", "gegenüber": "dat", "ab": "dat",
+}
+
+# Article by (case, gender), gender: m / f / n / pl
+DEFINITE = {
+    ("acc", "m"): "den", ("acc", "f"): "die", ("acc", "n"): "das", ("acc", "pl"): "die",
+    ("dat", "m"): "dem", ("dat", "f"): "der", ("dat", "n"): "dem", ("dat", "pl"): "den",
+}
+INDEFINITE = {
+    ("acc", "m"): "einen", ("acc", "f"): "eine", ("acc", "n"): "ein",
+    ("dat", "m"): "einem", ("dat", "f"): "einer", ("dat", "n"): "einem",
+}
+DEFINITE_FORMS = {"der", "die", "das", "den", "dem", "des"}
+INDEFINITE_FORMS = {"ein", "eine", "einen", "einem", "einer", "eines"}
+
+# Article -> correct dative form when the noun is unknown but the article alone decides
+# ("das" and "ein" are never dative, "eine" is only feminine)
+DATIVE_UNAMBIGUOUS = {"das": "dem", "ein": "einem", "eine": "einer"}
+
+# Gender of common learner nouns (singular)
+NOUN_GENDER = {
+    # masculine
+    "bus": "m", "zug": "m", "bahnhof": "m", "flughafen": "m", "park": "m", "supermarkt": "m",
+    "freund": "m", "vater": "m", "bruder": "m", "mann": "m", "lehrer": "m", "arzt": "m",
+    "tisch": "m", "stuhl": "m", "hund": "m", "kaffee": "m", "tag": "m", "abend": "m",
+    "morgen": "m", "urlaub": "m", "garten": "m", "computer": "m", "film": "m", "kurs": "m",
+    # feminine
+    "bahn": "f", "straßenbahn": "f", "u-bahn": "f", "schule": "f", "arbeit": "f", "stadt": "f",
+    "freundin": "f", "mutter": "f", "schwester": "f", "frau": "f", "lehrerin": "f", "ärztin": "f",
+    "familie": "f", "wohnung": "f", "küche": "f", "universität": "f", "uni": "f", "katze": "f",
+    "woche": "f", "party": "f", "firma": "f", "bank": "f", "post": "f", "apotheke": "f",
+    # neuter
+    "auto": "n", "fahrrad": "n", "kino": "n", "haus": "n", "kind": "n", "buch": "n",
+    "restaurant": "n", "büro": "n", "hotel": "n", "zimmer": "n", "wochenende": "n",
+    "museum": "n", "theater": "n", "geschäft": "n", "handy": "n", "essen": "n", "taxi": "n",
+    "flugzeug": "n", "mädchen": "n", "krankenhaus": "n", "bett": "n", "wasser": "n",
+}
+
+# Fronted adverbials that force verb-second inversion
+FRONTED_ADVERBS = {
+    "gestern", "heute", "morgen", "jetzt", "dann", "danach", "später", "früher",
+    "manchmal", "oft", "immer", "leider", "hier", "dort", "deshalb", "deswegen",
+    "trotzdem", "zuerst", "endlich", "vielleicht", "bald", "abends", "morgens",
+}
+
+SUBJECT_PRONOUNS = {"ich", "du", "er", "sie", "es", "wir", "ihr"}
+
+# Words that start a new clause (the auxiliary and participle must share one)
+CLAUSE_BREAKS = {"und", "oder", "aber", "denn", "sondern", ",", ".", ";", ":", "!", "?"}
+
+# Reflexive / object pronouns: "habe mich umgezogen", "habe ihn gefahren" take "haben"
+OBJECT_PRONOUNS = {"mich", "dich", "sich", "uns", "euch", "ihn", "ihm", "ihr", "ihnen", "mir", "dir"}
+
+# Possessives / "kein" in any form: determiners like the articles
+_DETERMINER_RE = re.compile(r"^(mein|dein|sein|ihr|unser|euer|eur|kein)(e|en|em|er|es)?$")
+
+# Prepositions that may introduce a phrase between auxiliary and participle
+# ("bin mit dem Bus nach Hause gegangen"); a determiner without one is an object
+PHRASE_PREPOSITIONS = set(PREPOSITION_CASE) | {
+    "in", "ins", "im", "an", "am", "ans", "auf", "über", "unter", "vor", "hinter",
+    "neben", "zwischen", "zum", "zur", "vom", "beim",
+}
+
+# Finite forms that are always verbs (auxiliaries / modals)
+FINITE_AUX = {
+    "bin", "bist", "ist", "sind", "seid", "war", "warst", "waren", "wart",
+    "habe", "hab", "hast", "hat", "haben", "habt", "hatte", "hattest", "hatten", "hattet",
+    "werde", "wirst", "wird", "werden", "werdet",
+    "kann", "kannst", "können", "könnt", "muss", "musst", "müssen", "müsst",
+    "will", "willst", "wollen", "wollt", "soll", "sollst", "sollen", "sollt",
+    "darf", "darfst", "dürfen", "dürft", "möchte", "möchtest", "möchten", "möchtet",
+}
+
+# Expected regular present-tense ending per pronoun
+_PERSON_ENDING = {"ich": ("e",), "du": ("st",), "er": ("t",), "es": ("t",),
+                  "ihr": ("t",), "wir": ("en", "n"), "sie": ("t", "en", "n")}
+
+_TOKEN_RE = re.compile(r"([\w'-]+|[^\w\s])(\s*)")
+
+
+# ========================================= #
+# ============     RESULTS     ============ #
+# ========================================= #
+
+@dataclass
+class GrammarIssue:
+    """One detected error."""
+    rule: str
+    wrong: str
+    right: str
+    explanation: str
+
+
+@dataclass
+class CheckResult:
+    """Outcome of a local grammar check."""
+    original: str
+    corrected: str
+    issues: List[GrammarIssue] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    def hint(self) -> str:
+        """Compact hint for the LLM prompt."""
+        parts = [f"{i.rule}: '{i.wrong}' -> '{i.right}'" for i in self.issues]
+        return f"Local grammar check suggests: {self.corrected} ({'; '.join(parts)})"
+
+    def to_reply(self) -> StructuredReply:
+        """Templated tutor reply, ready for StructuredFormatter / EdgeTTS.speak_structured."""
+        explanation = " ".join(i.explanation for i in self.issues)
+        return StructuredReply(
+            explanation=f"Almost! {explanation}",
+            corrected_sentence=self.corrected,
+            is_correct=False,
+            alternatives=[],
+            tip="Keep practicing, you're doing great!",
+        )
+
+
+# ========================================= #
+# ============     CHECKER     ============ #
+# ========================================= #
+
+class GermanGrammarChecker:
+    """
+    Curated rules + lexicon for frequent German learner errors.
+    Runs in well under a millisecond on a typical utterance.
+    """
+
+    def check(self, text: str) -> Optional[CheckResult]:
+        """
+        Check one sentence.
+
+        Args:
+            text: Transcribed learner sentence
+
+        Returns:
+            CheckResult with the corrected sentence, or None if no rule fired
+        """
+        start = time.perf_counter()
+
+        # tokens as [text, trailing whitespace]
+        tokens = [[m.group(1), m.group(2)] for m in _TOKEN_RE.finditer(text.strip())]
+        issues = []
+        issues += self._check_perfekt_auxiliary(tokens)
+        issues += self._check_verb_second(tokens)
+        issues += self._check_preposition_case(tokens)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        metrics.observe("grammar.check_ms", elapsed_ms)
+        if not issues:
+            return None
+
+        metrics.incr("grammar.hits")
+        for issue in issues:
+            metrics.incr(f"grammar.{issue.rule}")
+        return CheckResult(
+            original=text,
+            corrected="".join(t + ws for t, ws in tokens).strip(),
+            issues=issues,
+            elapsed_ms=elapsed_ms,
+        )
+
+    # ---------------------------------------------------------------- #
+    def _check_perfekt_auxiliary(self, tokens) -> List[GrammarIssue]:
+        """'Ich habe gegangen' -> 'Ich bin gegangen'."""
+        words = [t[0].lower() for t in tokens]
+        issues = []
+        start = 0
+        for end in range(len(words) + 1):
+            if end < len(words) and words[end] not in CLAUSE_BREAKS:
+                continue
+            issue = self._clause_auxiliary(tokens, words, start, end)
+            if issue is not None:
+                issues.append(issue)
+            start = end + 1
+        return issues
+
+    def _clause_auxiliary(self, tokens, words, start: int, end: int) -> Optional[GrammarIssue]:
+        """
+        One clause: a haben form followed by a sein participle that closes the clause,
+        with nothing in between that could be an object or a reflexive.
+        """
+        if end - start < 2 or words[end - 1] not in SEIN_PARTICIPLES:
+            return None
+        participle = words[end - 1]
+        clause = words[start:end - 1]
+        if any(w in SEIN_FORMS for w in clause):
+            return None
+        aux = next((start + k for k, w in enumerate(clause) if w in HABEN_TO_SEIN), None)
+        if aux is None or _has_object(tokens[aux + 1:end - 1]):
+            return None
+
+        wrong = tokens[aux][0]
+        tokens[aux][0] = _match_case(HABEN_TO_SEIN[words[aux]], wrong)
+        return GrammarIssue(
+            rule="perfekt_auxiliary",
+            wrong=wrong,
+            right=tokens[aux][0],
+            explanation=(f"'{participle}' forms the past with 'sein', not 'haben', "
+                        f"so it's '{tokens[aux][0]} ... {participle}'. "
+                        "Verbs of motion or change of state use 'sein'."),
+        )
+
+    # ---------------------------------------------------------------- #
+    def _check_verb_second(self, tokens) -> List[GrammarIssue]:
+        """'Gestern ich bin gegangen' -> 'Gestern bin ich gegangen'."""
+        if len(tokens) < 3:
+            return []
+
+        first, pronoun, verb = (t[0] for t in tokens[:3])
+        if first.lower() not in FRONTED_ADVERBS or pronoun.lower() not in SUBJECT_PRONOUNS:
+            return []
+        # nouns are capitalized, verbs are not
+        if not verb.islower() or not _is_finite_verb(verb, pronoun.lower()):
+            return []
+
+        tokens[1][0], tokens[2][0] = verb, pronoun
+        return [GrammarIssue(
+            rule="verb_second",
+            wrong=f"{first} {pronoun} {verb}",
+            right=f"{first} {verb} {pronoun}",
+            explanation=(f"When a sentence starts with '{first}', the verb must come second, "
+                        f"before the subject: '{first} {verb} {pronoun}'."),
+        )]
+
+    # ---------------------------------------------------------------- #
+    def _check_preposition_case(self, tokens) -> List[GrammarIssue]:
+        """'mit das Auto' -> 'mit dem Auto', 'für dem Mann' -> 'für den Mann'."""
+        issues = []
+        for i in range(len(tokens) - 1):
+            prep = tokens[i][0].lower()
+            case = PREPOSITION_CASE.get(prep)
+            if case is None:
+                continue
+
+            article = tokens[i + 1][0]
+            art = article.lower()
+            if art not in DEFINITE_FORMS and art not in INDEFINITE_FORMS:
+                continue
+
+            noun = tokens[i + 2][0].lower() if i + 2 < len(tokens) else ""
+            gender = NOUN_GENDER.get(noun)
+            table = DEFINITE if art in DEFINITE_FORMS else INDEFINITE
+
+            if gender is not None:
+                right = table.get((case, gender))
+            elif case == "dat":
+                right = DATIVE_UNAMBIGUOUS.get(art)
+            else:
+                right = None
+
+            if right is None or right == art:
+                continue
+
+            tokens[i + 1][0] = _match_case(right, article)
+            case_name = "dative" if case == "dat" else "accusative"
+            issues.append(GrammarIssue(
+                rule="preposition_case",
+                wrong=f"{tokens[i][0]} {article}",
+                right=f"{tokens[i][0]} {tokens[i + 1][0]}",
+                explanation=(f"'{tokens[i][0]}' always takes the {case_name}, "
+                            f"so it's '{tokens[i][0]} {tokens[i + 1][0]}'."),
+            ))
+        return issues
+
+
+def _has_object(tokens) -> bool:
+    """True if the words between auxiliary and participle may hold an object."""
+    after_preposition = False
+    for word, _ in tokens:
+        lower = word.lower()
+        if lower in OBJECT_PRONOUNS:
+            return True
+        is_article = lower in DEFINITE_FORMS or lower in INDEFINITE_FORMS or bool(_DETERMINER_RE.match(lower))
+        # a noun (capitalized) or determiner outside a prepositional phrase
+        if (is_article or word[:1].isupper()) and not after_preposition:
+            return True
+        if lower in PHRASE_PREPOSITIONS:
+            after_preposition = True
+        elif not is_article and word[:1].isupper():
+            after_preposition = False  # the phrase's noun ends it
+    return False
+
+
+def _is_finite_verb(word: str, pronoun: str) -> bool:
+    """Cheap finite-verb test for the word following a subject pronoun."""
+    word = word.lower()
+    if word in FINITE_AUX:
+        return True
+    return len(word) > 3 and word.endswith(_PERSON_ENDING.get(pronoun, ()))
+
+
+def _match_case(word: str, like: str) -> str:
+    """Give `word` the capitalization of `like`."""
+    return word.capitalize() if like[:1].isupper() else word
+
+
+# ======================================================================== #
+#                              TESTING                                     #
+# ======================================================================== #
+
+if __name__ == "__main__":
+    checker = GermanGrammarChecker()
+
+    test_inputs = [
+        "Ich habe gestern ins Kino gegangen",
+        "Gestern ich bin ins Kino gegangen",
+        "Ich fahre mit das Auto zur Arbeit",
+        "Das Geschenk ist für dem Vater",
+        "Ich bin nach Hause gegangen",
+        "Ich habe mit meinem Bruder nach Berlin gegangen",
+        # must stay untouched
+        "Ich warte, bis der Bus kommt.",
+        "Ich habe Angst, dass etwas passiert.",
+        "Ich habe mich schnell umgezogen.",
+        "Ich habe das Auto in die Garage gefahren.",
+        "Sie hat Zwillinge geboren.",
+    ]
+
+    for text in test_inputs:
+        result = checker.check(text)
+        if result:
+            print(f"{text}\n  -> {result.corrected} ({result.elapsed_ms:.3f} ms)")
+            print(f"  {result.hint()}")
+        else:
+            print(f"{text}\n  -> OK")
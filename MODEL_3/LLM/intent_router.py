@@ -0,0 +1,192 @@
+"""
+Local intent router
+Classifies each transcript and picks the cheapest adequate LLM profile
+(model, max_tokens, temperature) for it
+"""
+
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+from ..metrics import metrics
+
+
+# Intent classes, cheapest first
+CORRECTION = "correction"
+TRANSLATION = "translation"
+EXPLANATION = "explanation"
+QUESTION = "question"
+
+INTENTS = (CORRECTION, TRANSLATION, EXPLANATION, QUESTION)
+
+# Used when the config does not define a profile for an intent
+DEFAULT_ROUTES = {
+    CORRECTION:  {"model": "llama-3.1-8b-instant",    "max_tokens": 250, "temperature": 0.7},
+    TRANSLATION: {"model": "llama-3.1-8b-instant",    "max_tokens": 200, "temperature": 0.5},
+    EXPLANATION: {"model": "llama-3.3-70b-versatile", "max_tokens": 500, "temperature": 0.9},
+    QUESTION:    {"model": "llama-3.3-70b-versatile", "max_tokens": 400, "temperature": 0.9},
+}
+
+# Keyword patterns (English + German), compiled once
+_TRANSLATION_RE = re.compile(
+    r"\b(translate|translation|how (do|would|can) (you|i) say|what does .+ mean|"
+    r"what is .+ in (german|english|french|spanish)|"
+    r"übersetz\w*|wie sagt man|was (heißt|heisst|bedeutet))\b|"
+    r"\bin (german|english|french|spanish)\??$",  # no \b after a final "?"
+    flags=re.IGNORECASE,
+)
+# Grammar terms alone ("in this case", "the rule") are common in plain sentences;
+# they count only in a question / explanation frame
+_EXPLANATION_RE = re.compile(
+    r"\b(explain|explanation|why|difference between|what'?s the difference|when (do|should) (i|you) use|"
+    r"(what|which|how|when)\b.*\b(grammar|rules?|tenses?|case|cases|conjugat\w*|declension|articles?)|"
+    r"erklär\w*|erklaer\w*|warum|wieso|unterschied|grammatik|regel\w*)\b|"
+    r"\b(grammar|rules?|tenses?|case|cases|conjugat\w*|declension|articles?)\b.*\?\s*$",
+    flags=re.IGNORECASE,
+)
+_CHECK_RE = re.compile(
+    r"\b(correct|is (this|that|it) right|richtig|stimmt das|korrigier\w*|fix)\b\s*\??",
+    flags=re.IGNORECASE,
+)
+_QUESTION_RE = re.compile(
+    r"^\s*(what|who|where|when|which|how|can|could|do|does|is|are|tell me|"
+    r"was|wer|wo|wann|welche\w*|wie|kannst|können|gibt es)\b",
+    flags=re.IGNORECASE,
+)
+
+
+@dataclass
+class Route:
+    """LLM profile chosen for one turn."""
+    intent: str
+    model: str
+    max_tokens: int
+    temperature: float
+    started: float = field(default_factory=time.perf_counter)
+
+
+class IntentRouter:
+    """
+    Rule-based transcript classifier that maps each intent
+    to a model / max_tokens / temperature profile.
+    """
+
+    def __init__(self,
+                routes: Optional[dict] = None,
+                default_model: str = "llama-3.3-70b-versatile",
+                short_words: int = 12):
+        """
+        Initialize router.
+
+        Args:
+            routes: Mapping intent -> {"model", "max_tokens", "temperature"}
+                    (missing intents / keys fall back to DEFAULT_ROUTES)
+            default_model: Model used when a profile has no model set
+            short_words: Statements up to this many words count as a correction request
+        """
+        self.default_model = default_model
+        self.short_words = short_words
+
+        self.routes = {}
+        for intent in INTENTS:
+            profile = dict(DEFAULT_ROUTES[intent])
+            profile.update((routes or {}).get(intent) or {})
+            profile["model"] = profile.get("model") or default_model
+            self.routes[intent] = profile
+
+    def classify(self, transcript: str) -> str:
+        """
+        Classify transcript into one of INTENTS.
+
+        Args:
+            transcript: User's transcribed utterance
+
+        Returns:
+            Intent name
+        """
+        text = transcript.strip()
+        n_words = len(text.split())
+
+        if _TRANSLATION_RE.search(text):
+            return TRANSLATION
+        if _EXPLANATION_RE.search(text):
+            return EXPLANATION
+        if _CHECK_RE.search(text):
+            return CORRECTION
+        if text.endswith("?") or _QUESTION_RE.match(text):
+            return QUESTION
+
+        # Plain statement -> learner sentence to be checked,
+        # long monologues get the large model
+        return CORRECTION if n_words <= self.short_words else QUESTION
+
+    def route(self, transcript: str) -> Route:
+        """
+        Classify transcript and return the matching LLM profile.
+
+        Args:
+            transcript: User's transcribed utterance
+
+        Returns:
+            Route with intent, model, max_tokens and temperature
+        """
+        intent = self.classify(transcript)
+        profile = self.routes[intent]
+        route = Route(
+            intent=intent,
+            model=profile["model"],
+            max_tokens=int(profile["max_tokens"]),
+            temperature=float(profile["temperature"]),
+        )
+
+        metrics.incr(f"router.{intent}")
+        metrics.event("route", intent=intent, model=route.model,
+                    max_tokens=route.max_tokens, temperature=route.temperature,
+                    words=len(transcript.split()))
+        return route
+
+    def log_outcome(self,
+                    route: Route,
+                    latency: Optional[float] = None,
+                    completion_tokens: Optional[int] = None,
+                    ok: bool = True):
+        """
+        Record how a routed turn went.
+
+        Args:
+            route: Route returned by route()
+            latency: LLM call duration in seconds (defaults to time since routing)
+            completion_tokens: Tokens generated by the model
+            ok: False if the call failed
+        """
+        if latency is None:
+            latency = time.perf_counter() - route.started
+
+        metrics.observe(f"router.{route.intent}.latency", latency)
+        if not ok:
+            metrics.incr(f"router.{route.intent}.errors")
+        metrics.event("route_outcome", intent=route.intent, model=route.model,
+                    latency=round(latency, 3), completion_tokens=completion_tokens, ok=ok)
+
+
+# ======================================================================== #
+#                              TESTING                                     #
+# ======================================================================== #
+
+if __name__ == "__main__":
+    router = IntentRouter()
+
+    test_inputs = [
+        "Ich habe gestern ins Kino gegangen",
+        "How do you say 'I love you' in French?",
+        "What's the capital of Japan?",
+        "Explain German articles",
+        "Ist das richtig: Ich bin nach Hause gegangen?",
+        "Apple in English?",
+        "In this case I take the bus",
+        "Which case does mit take?",
+    ]
+
+    for text in test_inputs:
+        route = router.route(text)
+        print(f"{route.intent:12} {route.model:26} {text}")
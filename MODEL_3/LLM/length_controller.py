@@ -0,0 +1,151 @@
+"""
+Response length control
+Sets the generation budget per turn and trims truncated replies
+at a clean sentence boundary
+"""
+
+import re
+from typing import Optional
+from ..metrics import metrics
+
+
+# Budget multipliers for the learner's verbosity setting
+VERBOSITY = {
+    "brief": 0.6,
+    "normal": 1.0,
+    "detailed": 1.5,
+}
+
+# Base budget per intent when no route profile is given
+INTENT_BUDGET = {
+    "correction": 200,
+    "translation": 150,
+    "explanation": 450,
+    "question": 350,
+}
+
+# Rough tokens per spoken word, used to turn a token budget into a word hint
+_TOKENS_PER_WORD = 1.4
+
+# End of a sentence: punctuation, optionally closed by markdown/quotes, then whitespace or end
+_SENTENCE_END_RE = re.compile(r"[.!?…][*_\"'»)\]]*(?=\s|$)")
+
+
+class LengthController:
+    """
+    Chooses max_tokens from input length, intent and verbosity,
+    and cuts over-long replies at the last complete sentence.
+    """
+
+    def __init__(self,
+                verbosity: str = "normal",
+                min_tokens: int = 80,
+                max_tokens: int = 600,
+                default_budget: int = 500):
+        """
+        Initialize length controller.
+
+        Args:
+            verbosity: Learner preference ("brief", "normal", "detailed")
+            min_tokens: Lower bound of any budget
+            max_tokens: Upper bound of any budget
+            default_budget: Base budget when neither route nor intent is known
+        """
+        if verbosity not in VERBOSITY:
+            raise ValueError(f"Unknown verbosity '{verbosity}', expected one of {list(VERBOSITY)}")
+
+        self.verbosity = verbosity
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+        self.default_budget = default_budget
+
+    def budget(self,
+            prompt: str,
+            intent: Optional[str] = None,
+            base: Optional[int] = None) -> int:
+        """
+        Compute the generation budget for one turn.
+
+        Args:
+            prompt: User's input text
+            intent: Detected intent (see intent_router.INTENTS)
+            base: Base budget, e.g. the routed max_tokens
+
+        Returns:
+            max_tokens to request from the LLM
+        """
+        if base is None:
+            base = INTENT_BUDGET.get(intent, self.default_budget)
+
+        # Short input -> concise answer, long input -> allow more room
+        n_words = len(prompt.split())
+        input_factor = min(1.5, 0.6 + 0.04 * n_words)
+
+        tokens = int(base * input_factor * VERBOSITY[self.verbosity])
+        return max(self.min_tokens, min(self.max_tokens, tokens))
+
+    @staticmethod
+    def word_hint(max_tokens: int) -> int:
+        """Approximate number of words that fit into max_tokens."""
+        return max(20, int(max_tokens / _TOKENS_PER_WORD) // 10 * 10)
+
+    @staticmethod
+    def trim(text: str) -> str:
+        """
+        Cut text after its last complete sentence.
+
+        Args:
+            text: Reply that hit the token limit
+
+        Returns:
+            Text ending at a sentence boundary (unchanged if no boundary is found)
+        """
+        ends = list(_SENTENCE_END_RE.finditer(text))
+        if not ends:
+            return text
+
+        cut = ends[-1].end()
+        # Don't throw away most of the reply just to end cleanly
+        if cut < len(text) * 0.4:
+            return text
+        return text[:cut].rstrip()
+
+    def record(self,
+            max_tokens: int,
+            completion_tokens: Optional[int],
+            chars: int,
+            latency: float,
+            truncated: bool):
+        """
+        Record the length distribution of one reply.
+
+        Args:
+            max_tokens: Budget that was requested
+            completion_tokens: Tokens actually generated
+            chars: Length of the final (trimmed) reply
+            latency: LLM call duration in seconds
+            truncated: True if the reply hit the budget
+        """
+        if completion_tokens is not None:
+            metrics.observe("reply.tokens", completion_tokens)
+        metrics.observe("reply.chars", chars)
+        metrics.observe("reply.latency", latency)
+        if truncated:
+            metrics.incr("reply.truncated")
+        metrics.event("reply_length", verbosity=self.verbosity, max_tokens=max_tokens,
+                    completion_tokens=completion_tokens, chars=chars,
+                    latency=round(latency, 3), truncated=truncated)
+
+
+# ======================================================================== #
+#                              TESTING                                     #
+# ======================================================================== #
+
+if __name__ == "__main__":
+    controller = LengthController(verbosity="normal")
+
+    print(controller.budget("Ich habe gegangen", intent="correction"))
+    print(controller.budget("Can you explain when to use the dative case in German and why?", intent="explanation"))
+
+    cut = "Quick fix → **Ich bin gegangen**. Motion verbs take *sein*. You could also say"
+    print(LengthController.trim(cut))
@@ -7,12 +7,30 @@ Features:
 - A1-level friendly for language learning
 """
 
-def create_prompt_template(user_input, RAG_answer):
+# Whisper language codes -> names used in the language hint
+LANGUAGE_NAMES = {
+    "de": "German", "en": "English", "fr": "French", "es": "Spanish", "it": "Italian",
+    "pt": "Portuguese", "nl": "Dutch", "pl": "Polish", "tr": "Turkish", "ru": "Russian",
+    "ja": "Japanese", "zh": "Chinese", "ar": "Arabic",
+}
+
+
+def _language_hint(language):
+    """Spoken-language note for the user message, None if unknown."""
+    name = LANGUAGE_NAMES.get(language, language)
+    return f"The student is speaking {name} (detected from their voice)" if name else None
+
+
+def create_prompt_template(user_input, RAG_answer, length_hint=None, grammar_hint=None, language=None):
     """
     Creates a dynamic prompt that produces natural, varied tutor responses.
     
     Args:
         user_input: User's sentence, question, or phrase
+        RAG_answer: response of web search (None -> no RAG message)
+        length_hint: Optional word limit for the reply
+        grammar_hint: Optional finding of the local grammar checker
+        language: Language code of the student's speech (STT), e.g. "de"
         
     Returns:
         List of message dicts for Groq API
@@ -150,6 +168,84 @@ Remember:
 - Be conversational and natural
 - ALWAYS RETURN RESPONSE IN MRKDOWN FORMAT!"""
 
+    if length_hint:
+        user_msg += f"""
+- Keep your whole reply under {length_hint} words and finish your last sentence"""
+
+    if grammar_hint:
+        user_msg += f"""
+- {grammar_hint} (verify it, then build your answer on it)"""
+
+    if _language_hint(language):
+        user_msg += f"""
+- {_language_hint(language)}"""
+
+    return _assemble(system_msg, user_msg, RAG_answer)
+
+
+def create_structured_prompt_template(user_input, RAG_answer, length_hint=None, grammar_hint=None, language=None):
+    """
+    Creates a prompt that makes the LLM reply with a single JSON object
+    (structured reply mode, no markdown).
+    
+    Args:
+        user_input: User's sentence, question, or phrase
+        RAG_answer: response of web search (None -> no RAG message)
+        length_hint: Optional word limit for the reply
+        grammar_hint: Optional finding of the local grammar checker
+        language: Language code of the student's speech (STT), e.g. "de"
+        
+    Returns:
+        List of message dicts for Groq API
+    """
+    # ========================================= #
+    # ======     1. SYSTEM MESSAGE       ====== #
+    # ========================================= #
+    system_msg = """You are a warm, adaptive AI language tutor and helpful assistant.
+
+- If the user wants language help (any language): act as a tutor, explain in English, A1-A2 level
+- If the user asks a general question: drop the tutor persona and just answer
+- Be natural, encouraging and varied, never robotic
+
+**OUTPUT FORMAT (STRICT):**
+Reply with ONE JSON object and nothing else, using exactly these keys:
+{
+  "corrected_sentence": string or null,  // the correct sentence in the target language (null for general questions)
+  "is_correct": true, false or null,     // was the user's sentence already correct (null if not a sentence to check)
+  "explanation": string,                 // the explanation or the answer itself, plain spoken text
+  "alternatives": [string],              // 0-3 other ways to say it, in the target language
+  "tip": string or null                  // short encouragement or learning tip
+}
+
+Rules:
+- Plain text only inside the fields: NO markdown, NO asterisks, NO headers, NO emojis
+- "corrected_sentence" and "alternatives" contain ONLY target-language sentences, no commentary
+- Short input → short explanation, don't over-explain simple things"""
+
+    # ========================================= #
+    # =======     2. USER MESSAGE       ======= #
+    # ========================================= #
+    user_msg = f"""Student input: {user_input}
+
+Return the JSON object only."""
+
+    if length_hint:
+        user_msg += f"""
+Keep all fields together under {length_hint} words."""
+
+    if grammar_hint:
+        user_msg += f"""
+{grammar_hint} (verify it, then build your answer on it)"""
+
+    if _language_hint(language):
+        user_msg += f"""
+{_language_hint(language)}."""
+
+    return _assemble(system_msg, user_msg, RAG_answer)
+
+
+def _assemble(system_msg, user_msg, RAG_answer):
+    """Build the message list, adding the RAG message if RAG is turned on."""
     # ========================================= #
     # =======     3. RAG MESSAGE       ======== #
     # ========================================= #
@@ -7,8 +7,13 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.markdown import Markdown
 from rich.syntax import Syntax
+from rich.text import Text
 from rich import box
+from dataclasses import dataclass, field
+from typing import List, Optional
+import json
 import re
+from .speech_compiler import to_speech_text
 
 
 class ResponseFormatter:
@@ -105,30 +110,123 @@ class SimpleFormatter:
         self.console.print()
         return _remove_md(response_text)
 
-def _remove_md(text: str):
-    """Simple markdown removal for natural speech."""
+@dataclass
+class StructuredReply:
+    """
+    Reply of the structured (JSON) output mode.
+    Fields are plain text, ready for rendering and TTS as they are.
+    """
+    explanation: str
+    corrected_sentence: Optional[str] = None
+    is_correct: Optional[bool] = None
+    alternatives: List[str] = field(default_factory=list)
+    tip: Optional[str] = None
+    
+    def speech_parts(self):
+        """
+        Split reply for TTS.
+        
+        Returns:
+            (target-language sentence or None, rest of the reply as one text)
+        """
+        rest = [self.explanation]
+        if self.alternatives:
+            rest.append("You could also say: " + ". ".join(a.rstrip(".") for a in self.alternatives) + ".")
+        if self.tip:
+            rest.append(self.tip)
+        return self.corrected_sentence, " ".join(p.strip() for p in rest if p and p.strip())
+
+
+def parse_structured(text: str) -> Optional[StructuredReply]:
+    """
+    Parse a JSON reply into a StructuredReply.
     
-    # Remove all markdown formatting
-    clean = re.sub(r"#+\s+", "", text)  # Headings
-    clean = re.sub(r"[*_`]{1,2}(.*?)[*_`]{1,2}", r"\1", clean)  # Bold/italic/code
-    clean = re.sub(r"^>\s+", "", clean, flags=re.MULTILINE)  # Blockquotes
-    clean = re.sub(r"\[(.*?)\]\(.*?\)", r"\1", clean)  # Links
-    clean = re.sub(r"!\[.*?\]\(.*?\)", "", clean)  # Images
-    clean = re.sub(r"```.*?```", "", clean, flags=re.DOTALL)  # Code blocks
+    Args:
+        text: Raw LLM output
+        
+    Returns:
+        StructuredReply or None if the text is not a valid reply object
+    """
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        return None
+    
+    if not isinstance(data, dict) or not isinstance(data.get("explanation"), str):
+        return None
     
-    # Replace symbols
-    clean = clean.replace("/", " slash ")
-    clean = clean.replace("&", " and ")
-    clean = clean.replace("#", " ")
+    alternatives = data.get("alternatives") or []
+    if not isinstance(alternatives, list):
+        alternatives = [alternatives]
     
-    # Normalize whitespace
-    clean = re.sub(r"\s+", " ", clean).strip()
+    corrected = data.get("corrected_sentence")
+    is_correct = data.get("is_correct")
+    tip = data.get("tip")
+    return StructuredReply(
+        explanation=data["explanation"].strip(),
+        corrected_sentence=corrected.strip() if isinstance(corrected, str) and corrected.strip() else None,
+        is_correct=is_correct if isinstance(is_correct, bool) else None,
+        alternatives=[str(a).strip() for a in alternatives if str(a).strip()],
+        tip=tip.strip() if isinstance(tip, str) and tip.strip() else None,
+    )
+
+
+class StructuredFormatter:
+    """
+    Renders StructuredReply fields directly (no markdown detection or parsing).
+    """
     
-    # Add natural pauses by adding extra space after punctuation
-    clean = re.sub(r"([.!?;])\s+", r"\1  ", clean)
-    clean = re.sub(r",\s+", r", ", clean)
+    def __init__(self):
+        self.console = Console()
     
-    return clean
+    def format_and_print(self, reply: StructuredReply, user_input: str = None):
+        """
+        Print structured reply.
+        
+        Args:
+            reply: Parsed StructuredReply
+            user_input: Optional user input to show context
+            
+        Returns:
+            The same reply (fields are already speech-ready)
+        """
+        if user_input:
+            self.console.print()
+            self.console.print(Panel(
+                f"[cyan]{user_input}[/cyan]",
+                title="[bold]You said[/bold]",
+                border_style="cyan",
+                box=box.ROUNDED
+            ))
+        
+        body = Text()
+        if reply.corrected_sentence:
+            mark = "✓ " if reply.is_correct else "→ "
+            body.append(mark + reply.corrected_sentence + "\n\n", style="bold green")
+        body.append(reply.explanation)
+        if reply.alternatives:
+            body.append("\n\nOther ways to say it:", style="bold")
+            for alt in reply.alternatives:
+                body.append("\n  • ")
+                body.append(alt, style="italic")
+        if reply.tip:
+            body.append("\n\n" + reply.tip, style="magenta")
+        
+        self.console.print()
+        self.console.print(Panel(
+            body,
+            title="[bold green]🎓 Tutor Response[/bold green]",
+            border_style="green",
+            box=box.DOUBLE,
+            padding=(1, 2)
+        ))
+        self.console.print()
+        return reply
+
+
+def _remove_md(text: str):
+    """Markdown -> natural speech text (single-pass speech compiler)."""
+    return to_speech_text(text)
 
 
 # ========================================================================
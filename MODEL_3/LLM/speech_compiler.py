@@ -0,0 +1,280 @@
+"""
+Markdown-to-speech compiler
+Turns an LLM markdown reply into speech segments in ONE tokenizer pass.
+Each segment carries the pause that should follow it and a language guess.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+# Pause lengths (ms) after each kind of boundary
+PAUSE_SENTENCE = 350
+PAUSE_CLAUSE = 200
+PAUSE_LINE = 250
+PAUSE_LIST_ITEM = 300
+PAUSE_HEADING = 400
+PAUSE_PARAGRAPH = 500
+
+# Characters that can start a markdown / speech token. Every token pattern
+# begins by consuming one of them, so the regex engine skips plain text at C speed
+# and only looks closer at these positions.
+_TRIGGERS = r"`!\[*_'\"\n→⟶➜\-=&/:.?…;#~|\U0001F300-\U0001FAFF☀-➿️"
+
+# One master pattern: trigger char, then the token kinds that start with it
+# (checked with a one-char lookbehind), most specific first.
+_TOKEN_RE = re.compile(
+    rf"[{_TRIGGERS}](?:"
+    # punctuation (most frequent, checked first)
+    r"(?<=[.!?…])(?P<stop>[.!?…]*)(?=[\s\"')\]]|\Z)"
+    r"|(?<=[;:])(?P<clause>)(?=\s|\Z)"
+    # line starts (the input is prefixed with a newline)
+    r"|(?<=\n)(?:(?P<paragraph>[ \t]*(?=\n))"
+    r"|(?P<rule>[ \t]*(?:-{3,}|\*{3,}|_{3,})[ \t]*(?=\n|\Z))"
+    r"|(?P<heading>[ \t]*\#{1,6}[ \t]+)"
+    r"|(?P<blockquote>[ \t]*>[ \t]?)"
+    r"|(?P<bullet>[ \t]*(?:[-*+]|\d+[.)])[ \t]+)"
+    r"|(?P<newline>))"
+    # emphasis and quotes (usually the target-language examples)
+    r"|(?<=\*)(?:(?P<strong>\*(?P<strong_text>[^\n]+?)\*\*)"
+    r"|(?<![\w*]\*)(?P<em>(?P<em_text>[^*\s](?:[^*\n]*?[^*\s])?)\*(?!\*)))"
+    r"|(?<=_)(?:(?<!\w__)(?P<strong_u>_(?P<strong_u_text>[^\n]+?)__)"
+    r"|(?<!\w_)(?P<em_u>(?P<em_u_text>[^_\s](?:[^_\n]*?[^_\s])?)_(?!\w))"
+    r"|(?<=[^\W_]_)(?P<underscore>)(?=[^\W_]))"
+    r"|(?<=')(?<![\w']')(?P<quote>(?P<quote_text>[^'\n]{1,80}?)'(?!\w))"
+    r"|(?<=\")(?P<dquote>(?P<dquote_text>[^\"\n]{1,80}?)\")"
+    # code, links, images
+    r"|(?<=`)(?:(?P<codeblock>``.*?(?:```|\Z))|(?P<code>(?P<code_text>[^`\n]+)`))"
+    r"|(?<=!)(?P<image>\[[^\]\n]*\]\([^)\n]*\))"
+    r"|(?<=\[)(?P<link>(?P<link_text>[^\]\n]*)\]\([^)\n]*\))"
+    r"|(?<=:)(?P<url>//\S+)"
+    # symbols
+    r"|(?<=[→⟶➜])(?P<arrow>)"
+    r"|(?<=[-=])(?P<arrow2>>)"
+    r"|(?<=&)(?P<amp>)"
+    r"|(?<=/)(?:(?<=km/)(?P<per_hour>h\b)"
+    r"|(?<=[^\W\d_]/)(?P<alternatives>)(?=[^\W\d_])"
+    r"|(?<=\s/)(?P<slash>)(?=\s))"
+    r"|(?<=[#*_`~|\U0001F300-\U0001FAFF☀-➿️])(?P<drop>[#*_`~|️]*)"
+    # anything else: the trigger char is ordinary text ("A1-A2", "3.5", "it's")
+    r"|(?P<literal>)"
+    r")",
+    flags=re.DOTALL,
+)
+
+# Token kinds whose content is an emphasized / quoted span
+_SPANS = frozenset(("strong", "strong_u", "em", "em_u", "quote", "dquote"))
+
+_URL_SCHEME_RE = re.compile(r"\b(?:https?|ftp)$")
+
+
+# Language guess: stopwords and characters that give a language away
+_GERMAN_CHARS_RE = re.compile(r"[äöüßÄÖÜ]")
+_WORD_RE = re.compile(r"[^\W\d_]+")
+_GERMAN_WORDS = frozenset(
+    "der die das den dem des ein eine einen einem einer und oder aber ist sind bin bist "
+    "ich du er sie es wir ihr nicht kein keine mit zu zum zur auf für von im ins am "
+    "habe hast hat haben war waren wird werden kann können auch noch sehr gut ja nein "
+    "wie was wo wer wann warum heute gestern morgen hier dort schon nur mein dein "
+    "gehen gegangen ging danke bitte hallo tschüss guten morgen abend nach hause".split()
+)
+_ENGLISH_WORDS = frozenset(
+    "the a an and or but is are was were be been i you he she it we they not no with "
+    "to of for on in at this that these those my your his her its our their so just "
+    "can could would should will do does did have has had here there what when where "
+    "why how which who because if then than also very great good nice keep practicing "
+    "say use uses used means mean like think".split()
+)
+
+
+@dataclass
+class SpeechSegment:
+    """A piece of text to speak, followed by a pause."""
+    text: str
+    pause_ms: int = 0
+    lang: Optional[str] = None  # "de", "en" or None (unknown -> speaker default)
+
+
+def guess_language(text: str) -> Optional[str]:
+    """
+    Cheap German/English guess from characters and stopwords.
+
+    Args:
+        text: A sentence or short span
+
+    Returns:
+        "de", "en" or None if there is no clear signal
+    """
+    words = _WORD_RE.findall(text.lower())
+    if not words:
+        return None
+
+    de = sum(map(_GERMAN_WORDS.__contains__, words)) + 2 * len(_GERMAN_CHARS_RE.findall(text))
+    en = sum(map(_ENGLISH_WORDS.__contains__, words))
+    if de > en:
+        return "de"
+    if en > de:
+        return "en"
+    return None
+
+
+def compile_speech(markdown: str, detect_language: bool = True) -> List[SpeechSegment]:
+    """
+    Compile a markdown reply into speech segments (single tokenizer pass).
+
+    Args:
+        markdown: Raw LLM output
+        detect_language: Annotate segments with a language guess and split
+                        at emphasized spans (needed for voice switching only)
+
+    Returns:
+        List of SpeechSegment in reading order
+    """
+    segments: List[SpeechSegment] = []
+    parts: List[str] = []
+    span_lang: Optional[str] = None  # language of the text collected in parts, if known
+
+    def flush(ms: int):
+        nonlocal parts, span_lang
+        text = " ".join("".join(parts).split())
+        if text:
+            lang = span_lang or (guess_language(text) if detect_language else None)
+            segments.append(SpeechSegment(text, ms, lang))
+        elif segments and ms > segments[-1].pause_ms:
+            # merge consecutive pauses into the longest one
+            segments[-1].pause_ms = ms
+        parts = []
+        span_lang = None
+
+    text = "\n" + markdown  # line-start tokens are anchored on a newline
+    pos = 1
+
+    for m in _TOKEN_RE.finditer(text, 1):
+        start = m.start()
+        if start > pos:
+            parts.append(text[pos:start])
+        pos = m.end()
+        kind = m.lastgroup
+
+        if kind == "literal":
+            parts.append(m.group())
+        elif kind == "stop":
+            parts.append(m.group())
+            flush(PAUSE_SENTENCE)
+        elif kind == "newline":
+            flush(PAUSE_LINE)
+        elif kind in _SPANS:
+            inner = m.group(kind + "_text").strip("*_` ")
+            if "/" in inner:
+                inner = _WORD_SLASH_RE.sub(", ", inner)
+            if kind == "quote" or kind == "dquote":
+                inner = m.group()[0] + inner + m.group()[-1]
+            lang = guess_language(inner) if detect_language else None
+            if lang:
+                # own segment, so the speaker can switch voice for it
+                if any(not p.isspace() for p in parts):
+                    flush(0)
+                parts.append(inner)
+                span_lang = lang
+                flush(0)
+            else:
+                parts.append(inner)
+        elif kind == "clause":
+            parts.append(m.group())
+            flush(PAUSE_CLAUSE)
+        elif kind == "bullet":
+            flush(PAUSE_LIST_ITEM)
+        elif kind == "heading" or kind == "blockquote":
+            flush(PAUSE_LINE)
+        elif kind == "paragraph":
+            flush(PAUSE_PARAGRAPH)
+        elif kind == "arrow" or kind == "arrow2":
+            flush(PAUSE_CLAUSE)
+        elif kind == "alternatives" or kind == "slash":
+            parts.append(", ")
+        elif kind == "link":
+            parts.append(m.group("link_text"))
+        elif kind == "code":
+            parts.append(m.group("code_text"))
+        elif kind == "codeblock":
+            flush(PAUSE_PARAGRAPH)
+        elif kind == "url":
+            if parts:
+                parts[-1] = _URL_SCHEME_RE.sub("", parts[-1])
+        elif kind == "underscore":
+            parts.append(" ")
+        elif kind == "amp":
+            parts.append(" and ")
+        elif kind == "per_hour":
+            if parts:
+                parts[-1] = _KM_RE.sub("", parts[-1])
+            parts.append("kilometers per hour")
+        # image, rule, drop: not spoken
+
+    if pos < len(text):
+        parts.append(text[pos:])
+    flush(0)
+
+    # a heading / list item that ends without punctuation gets a longer pause
+    for seg in segments:
+        if seg.pause_ms == PAUSE_LINE and seg.text[-1] not in ".!?…:;,":
+            seg.pause_ms = PAUSE_HEADING
+    return segments
+
+
+_KM_RE = re.compile(r"km/?$")
+_WORD_SLASH_RE = re.compile(r"(?<=[^\W\d_])/(?=[^\W\d_])")
+
+
+def render(segments: List[SpeechSegment]) -> str:
+    """
+    Join segments into one TTS string.
+    Pauses become punctuation, since that is what neural voices pause on.
+
+    Args:
+        segments: Output of compile_speech
+
+    Returns:
+        Plain text for the synthesizer
+    """
+    out = ""
+    for seg in segments:
+        text = seg.text
+        if seg.pause_ms >= PAUSE_LINE and text[-1] not in ".!?…:;,":
+            text += "."
+        elif seg.pause_ms >= PAUSE_CLAUSE and text[-1] not in ".!?…:;,":
+            text += ","
+        # punctuation that followed an emphasized span sticks to it
+        out += text if text[0] in ".,!?…:;)" or not out else " " + text
+    return out
+
+
+def to_speech_text(markdown: str) -> str:
+    """Markdown reply -> plain text for TTS (single voice, no language spans)."""
+    return render(compile_speech(markdown, detect_language=False))
+
+
+# ======================================================================== #
+#                              TESTING                                     #
+# ======================================================================== #
+
+if __name__ == "__main__":
+    reply = """### Great Effort!
+Quick fix → **Ich bin ins Kino gegangen**
+
+'Gehen' is a motion verb, so it takes 'sein' not 'haben' in Perfekt. Use der/die/das carefully.
+
+**Other ways to say it:**
+- *Ich ging ins Kino* (simple past)
+- *Ich bin gestern ins Kino gegangen* (with time)
+
+```python
+print("not spoken")
+```
+Keep it up! 🎯"""
+
+    for seg in compile_speech(reply):
+        print(f"[{seg.lang or '--'}] {seg.text!r} +{seg.pause_ms}ms")
+    print()
+    print(to_speech_text(reply))
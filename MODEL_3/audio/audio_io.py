@@ -5,7 +5,7 @@ Real-time microphone recording with silence detection
 
 import pyaudio
 import numpy as np
-from typing import Optional
+from typing import Iterator, Optional, Tuple
 from rich.console import Console
 
 
@@ -45,23 +45,28 @@ class AudioRecorder:
         self.console = Console()
         self._pa = pyaudio.PyAudio()
     
-    def record(self) -> Optional[np.ndarray]:
+    def record(self, stream=None) -> Optional[np.ndarray]:
         """
         Record audio from microphone until silence detected.
         
+        Args:
+            stream: Already open input with pyaudio's read() / stop_stream() / close()
+                    (None -> the microphone; benchmarks feed files through it)
+        
         Returns:
             NumPy array of audio samples (float32, normalized to [-1, 1])
             or None if no speech detected
         """
         try:
             # Open microphone stream
-            stream = self._pa.open(
-                format=pyaudio.paInt16,
-                channels=self.channels,
-                rate=self.sample_rate,
-                input=True,
-                frames_per_buffer=self.chunk_size
-            )
+            if stream is None:
+                stream = self._pa.open(
+                    format=pyaudio.paInt16,
+                    channels=self.channels,
+                    rate=self.sample_rate,
+                    input=True,
+                    frames_per_buffer=self.chunk_size
+                )
             
             frames = []
             silent_chunks = 0
@@ -117,6 +122,100 @@ class AudioRecorder:
             self.console.print(f"[red]Recording error: {e}[/]")
             return None
     
+    def record_chunks(self,
+                    window: float = 8.0,
+                    overlap: float = 1.0,
+                    max_total: float = 120.0,
+                    stream=None) -> Iterator[Tuple[np.ndarray, bool]]:
+        """
+        Dictation: record until silence like record(), but hand out the audio in
+        windows while the learner is still speaking, so they can be transcribed
+        in the background. Memory stays at one window however long the answer is.
+        
+        A window is cut at its quietest frame near the end (not inside a word);
+        the next window starts `overlap` seconds before the cut, the repeated
+        words are removed when the text is stitched.
+        
+        Args:
+            window: Seconds per chunk
+            overlap: Seconds of audio repeated at the start of the next chunk
+            max_total: Hard stop
+            stream: Already open input (see record())
+        
+        Yields:
+            (float32 audio, is_last); nothing if no speech was detected
+            (or the microphone failed, like record() returning None)
+        """
+        try:
+            if stream is None:
+                stream = self._pa.open(
+                    format=pyaudio.paInt16,
+                    channels=self.channels,
+                    rate=self.sample_rate,
+                    input=True,
+                    frames_per_buffer=self.chunk_size
+                )
+        except Exception as e:
+            self.console.print(f"[red]Recording error: {e}[/]")
+            return
+        
+        to_chunks = lambda seconds: max(1, int(seconds * self.sample_rate / self.chunk_size))
+        window_chunks = to_chunks(window)
+        overlap_chunks = to_chunks(overlap) if overlap > 0 else 0
+        search_chunks = min(to_chunks(1.5), window_chunks // 2)  # where to look for a pause
+        max_silent_chunks = int(self.pause_duration * self.sample_rate / self.chunk_size)
+        
+        frames, energies = [], []
+        silent_chunks = 0
+        recording_started = False
+        try:
+            with self.console.status("[bold blue]🎤 Listening (dictation)...[/]", spinner="dots"):
+                for _ in range(to_chunks(max_total)):
+                    data = stream.read(self.chunk_size, exception_on_overflow=False)
+                    energy = np.abs(np.frombuffer(data, dtype=np.int16)).mean()
+                    frames.append(data)
+                    energies.append(energy)
+                    
+                    if energy > self.energy_threshold:
+                        recording_started = True
+                        silent_chunks = 0
+                    elif recording_started:
+                        silent_chunks += 1
+                        if silent_chunks > max_silent_chunks:
+                            break
+                    
+                    if len(frames) < window_chunks:
+                        continue
+                    if not recording_started:
+                        # nothing said yet, keep only a short lead-in
+                        keep = max(overlap_chunks, 1)
+                        frames, energies = frames[-keep:], energies[-keep:]
+                        continue
+                    
+                    # commit the window at its quietest frame near the end
+                    cut = len(frames) - search_chunks + int(np.argmin(energies[-search_chunks:])) + 1
+                    yield self._to_float(frames[:cut]), False
+                    start = max(0, cut - overlap_chunks)
+                    frames, energies = frames[start:], energies[start:]
+        except Exception as e:
+            # end the dictation, the chunks handed out so far are still transcribed
+            self.console.print(f"[red]Recording error: {e}[/]")
+            return
+        finally:
+            try:
+                stream.stop_stream()
+                stream.close()
+            except Exception:
+                pass
+        
+        if recording_started:
+            yield self._to_float(frames), True
+    
+    @staticmethod
+    def _to_float(frames) -> np.ndarray:
+        """int16 frames -> float32 in [-1, 1] (required by Whisper)."""
+        return np.frombuffer(b"".join(frames), dtype=np.int16).astype(np.float32) / 32768.0
+    
     def cleanup(self):
         """Release PyAudio resources."""
         try:
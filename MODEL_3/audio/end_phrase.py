@@ -1,8 +1,6 @@
-import re
-
 # Define END PHRASES (session termination commands)
-def EndPhrases(wake_word):
-    end_phrases = [
+def end_phrase_list(wake_word):
+    return [
         # English
         "bye",
         "bye bye",
@@ -14,7 +12,8 @@ def EndPhrases(wake_word):
         "close",
         "exit",
         "quit",
-        "end",
+        "end the session",
+        "end session",
         "okay bye",
         "that's all",
         "that's all, thanks",
@@ -23,12 +22,19 @@ def EndPhrases(wake_word):
         # German
         "tschüss",
         "tschuess",
+        "tschüs",
         "auf wiedersehen",
         "auf wiedersehn",
         "ciao",
         "mach's gut",
         "machts gut",
         "beenden",
+        # "Ende." / "Schluss." / "Stopp." are answers too (vocabulary, "der Anfang und das ...?")
+        "beende die sitzung",
+        "sitzung beenden",
+        "schluss für heute",
+        "das war's für heute",
+        "ende der sitzung",
         
         # Wake word specific
         f"bye {wake_word}",
@@ -36,12 +42,5 @@ def EndPhrases(wake_word):
         f"close {wake_word}",
         f"exit {wake_word}",
         f"tschüss {wake_word}",
+        f"stopp {wake_word}",
     ]
-
-    # Join phrases into a single alternation pattern, escaping them to avoid regex issues
-    joined = "|".join(re.escape(p) for p in end_phrases)
-
-    # Compile once: match any full phrase (word boundaries), case-insensitive
-    _end_re = re.compile(rf"\b({joined})\b", flags=re.IGNORECASE)
-    
-    return _end_re
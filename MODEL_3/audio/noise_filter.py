@@ -0,0 +1,184 @@
+"""
+Noise and hallucination rejection
+Drops Whisper segments that are not the learner speaking (coughs, TV audio,
+"Untertitel im Auftrag des ZDF") before the turn reaches RAG, the LLM and TTS
+"""
+
+import re
+from typing import List, Optional, Tuple
+from .voice_commands import _TokenTrie, _tokens
+from ..metrics import metrics
+
+
+# Rejection reasons
+ANNOTATION = "annotation"        # "[Musik]", "(Applaus)", "♪"
+NO_SPEECH = "no_speech"          # Whisper itself thinks it heard silence
+TOKEN_RATE = "token_rate"        # more text than anyone can say in that time
+HALLUCINATION = "hallucination"  # known phrase from Whisper's (subtitled) training data
+
+# Whisper's well-known phantom outputs on silence / noise.
+# Always rejected when they make up a whole segment.
+HALLUCINATIONS = [
+    # German
+    "untertitel im auftrag des zdf", "untertitel im auftrag des zdf für funk",
+    "untertitelung im auftrag des zdf", "untertitelung des zdf", "untertitel des zdf",
+    "untertitel der amara org community", "untertitel von stephanie geiges",
+    "untertitelung aufgrund der amara org community", "untertitel im auftrag des zdf für funk 2017",
+    "copyright wdr", "swr", "zdf", "wdr",
+    "vielen dank fürs zuschauen", "vielen dank für's zuschauen", "danke fürs zuschauen",
+    "bis zum nächsten video", "abonniert den kanal",
+    "abonniert meinen kanal", "abonnieren nicht vergessen",
+    # English
+    "thank you for watching", "thanks for watching", "thank you so much for watching",
+    "please subscribe", "subscribe to my channel", "like and subscribe",
+    "subtitles by the amara org community", "transcribed by esa",
+]
+
+# Plausible things for a learner to say, but also frequent phantoms:
+# only rejected when Whisper is not sure there was speech at all
+SUSPICIOUS = [
+    "vielen dank", "danke", "danke schön", "dankeschön", "thank you", "thanks",
+    "you", "ja", "hm", "mhm", "äh", "ähm",
+    # learners end a session like this too
+    "bis zum nächsten mal", "das war's für heute",
+    "vielen dank für die aufmerksamkeit und bis zum nächsten mal",
+]
+
+# Segment text that is only a sound annotation
+_ANNOTATION_RE = re.compile(r"^\W*(?:[\[(*♪].*[\])*♪]|♪+)\W*$")
+
+
+def _phrase_index(phrases: List[str]) -> _TokenTrie:
+    trie = _TokenTrie()
+    for phrase in phrases:
+        trie.add(_tokens(phrase), phrase)
+    trie.build()
+    return trie
+
+
+class NoiseFilter:
+    """
+    Rejects segments and whole turns that are noise or Whisper hallucinations.
+    Each segment is checked on its own, so a real sentence followed by a
+    phantom "Vielen Dank fürs Zuschauen." keeps the sentence.
+    """
+
+    def __init__(self,
+                max_no_speech_prob: float = 0.6,
+                min_avg_logprob: float = -1.0,
+                max_tokens_per_second: float = 12.0,
+                suspicious_no_speech_prob: float = 0.2):
+        """
+        Initialize noise filter.
+
+        Args:
+            max_no_speech_prob: Segments above this with avg_logprob below
+                                min_avg_logprob are silence (Whisper's own rule)
+            min_avg_logprob: See max_no_speech_prob
+            max_tokens_per_second: Faster "speech" than this is made up
+                                (fast German is ~6 tokens per second)
+            suspicious_no_speech_prob: Common phantom phrases ("Danke.") are
+                                    rejected above this no_speech_prob
+        """
+        self.max_no_speech_prob = max_no_speech_prob
+        self.min_avg_logprob = min_avg_logprob
+        self.max_tokens_per_second = max_tokens_per_second
+        self.suspicious_no_speech_prob = suspicious_no_speech_prob
+        self.hallucinations = _phrase_index(HALLUCINATIONS)
+        self.suspicious = _phrase_index(SUSPICIOUS)
+
+    @staticmethod
+    def _covers(index: _TokenTrie, text: str) -> bool:
+        """True if phrases of the index (plus numbers) make up the whole text."""
+        words = _tokens(text)
+        if not words:
+            return False
+        covered = [w.isdigit() for w in words]
+        for begin, end, _ in index.find(words):
+            for i in range(begin, end):
+                covered[i] = True
+        return all(covered)
+
+    def is_hallucination(self, text: str) -> bool:
+        """True if the text is nothing but known phantom phrases."""
+        return self._covers(self.hallucinations, text)
+
+    def check(self, segment) -> Optional[str]:
+        """
+        Reason to drop a Whisper segment.
+
+        Args:
+            segment: faster-whisper Segment
+
+        Returns:
+            Rejection reason, None if the segment is kept
+        """
+        text = segment.text.strip()
+        if _ANNOTATION_RE.match(text):
+            return ANNOTATION
+        if segment.no_speech_prob > self.max_no_speech_prob and segment.avg_logprob < self.min_avg_logprob:
+            return NO_SPEECH
+        duration = max(segment.end - segment.start, 0.5)  # very short segments: timestamps are coarse
+        if len(segment.tokens) / duration > self.max_tokens_per_second:
+            return TOKEN_RATE
+        if self.is_hallucination(text):
+            return HALLUCINATION
+        if segment.no_speech_prob > self.suspicious_no_speech_prob and self._covers(self.suspicious, text):
+            return HALLUCINATION
+        return None
+
+    def filter(self, segments: list) -> Tuple[list, Optional[str]]:
+        """
+        Drop rejected segments.
+
+        Args:
+            segments: faster-whisper Segments of one utterance
+
+        Returns:
+            (kept segments, reason of the first rejected segment or None)
+        """
+        kept, reason = [], None
+        for segment in segments:
+            why = self.check(segment)
+            if why is None:
+                kept.append(segment)
+            else:
+                metrics.incr("stt.segments_rejected." + why)
+                reason = reason or why
+        return kept, reason
+
+    @staticmethod
+    def reject(text: str, reason: str):
+        """Count a dropped turn."""
+        metrics.incr("stt.rejected")
+        metrics.incr("stt.rejected." + reason)
+        metrics.event("stt_rejected", reason=reason, text=text)
+
+
+# ======================================================================== #
+#                              TESTING                                     #
+# ======================================================================== #
+
+if __name__ == "__main__":
+    from types import SimpleNamespace
+
+    noise = NoiseFilter()
+
+    def seg(text, start=0.0, end=2.0, no_speech=0.05, logprob=-0.3, tokens=8):
+        return SimpleNamespace(text=text, start=start, end=end, no_speech_prob=no_speech,
+                            avg_logprob=logprob, tokens=[0] * tokens)
+
+    tests = [
+        seg(" Ich bin gestern ins Kino gegangen."),
+        seg(" Untertitel im Auftrag des ZDF, 2020", no_speech=0.4),
+        seg(" Vielen Dank fürs Zuschauen!"),
+        seg(" Vielen Dank.", no_speech=0.5, tokens=3),
+        seg(" Vielen Dank.", tokens=3),
+        seg(" Bis zum nächsten Mal!", tokens=6),
+        seg(" Bis zum nächsten Mal!", no_speech=0.5, tokens=6),
+        seg(" [Musik]", tokens=3),
+        seg(" Was hast du gesagt?", no_speech=0.8, logprob=-1.3),
+        seg(" Das ist ein sehr langer Satz, der in einer halben Sekunde nicht zu sagen ist.", end=0.4, tokens=20),
+    ]
+    for s in tests:
+        print(f"{s.text!r:84} -> {noise.check(s) or 'kept'}")
@@ -0,0 +1,227 @@
+"""
+Replay of recent replies
+Keeps the last synthesized replies as decoded PCM and replays them
+slower (WSOLA time-stretch, pitch preserved) without a new LLM turn or synthesis
+"""
+
+import shutil
+import subprocess
+import threading
+import time
+import numpy as np
+from collections import deque
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple, Union
+from numpy.lib.stride_tricks import sliding_window_view
+from rich.console import Console
+from .voice_commands import REPEAT, SLOWER
+from ..metrics import metrics
+
+
+# ======================================== #
+#    TIME-STRETCH (WSOLA)                  #
+# ======================================== #
+def time_stretch(audio: np.ndarray,
+                speed: float,
+                sample_rate: int,
+                frame_ms: float = 30.0,
+                search_ms: float = 8.0) -> np.ndarray:
+    """
+    Change the tempo of speech without changing its pitch (WSOLA).
+    Frames are overlap-added at a fixed output hop; each input frame is
+    shifted within +-search_ms to the position that best continues the
+    previous one, found with one matrix product per frame.
+
+    Args:
+        audio: Mono samples (int16 or float)
+        speed: Playback speed, e.g. 0.75 -> 33% longer
+        sample_rate: Sample rate of audio
+        frame_ms: Analysis frame length
+        search_ms: Max shift of a frame from its nominal position
+
+    Returns:
+        Stretched audio, same dtype as the input
+    """
+    if abs(speed - 1.0) < 1e-3 or len(audio) == 0:
+        return audio
+
+    x = audio.astype(np.float32)
+    n = int(sample_rate * frame_ms / 1000) // 2 * 2
+    hop_out = n // 2
+    hop_in = hop_out * speed
+    tol = int(sample_rate * search_ms / 1000)
+    window = np.hanning(n + 1)[:-1].astype(np.float32)  # periodic Hann: 50% overlaps sum to 1
+
+    # zero padding, so every frame and search region is in range
+    x = np.concatenate([np.zeros(tol, np.float32), x, np.zeros(n + 2 * tol + hop_out, np.float32)])
+    n_frames = int((len(audio) - 1) / hop_in) + 2
+    out = np.zeros(n_frames * hop_out + n, np.float32)
+
+    pos = tol
+    for k in range(n_frames):
+        nominal = tol + int(round(k * hop_in))
+        if k:
+            # the best match for the natural continuation of the previous frame
+            template = x[pos + hop_out:pos + hop_out + n]
+            candidates = sliding_window_view(x[nominal - tol:nominal + tol + n], n)
+            pos = nominal - tol + int(np.argmax(candidates @ template))
+        out[k * hop_out:k * hop_out + n] += x[pos:pos + n] * window
+
+    out = out[:int(len(audio) / speed)]
+    if np.issubdtype(audio.dtype, np.integer):
+        info = np.iinfo(audio.dtype)
+        return np.clip(np.round(out), info.min, info.max).astype(audio.dtype)
+    return out.astype(audio.dtype)
+
+
+# ======================================== #
+#    REPLY BUFFER                          #
+# ======================================== #
+@dataclass
+class Utterance:
+    """One spoken reply, as 16-bit mono PCM."""
+    text: str
+    sample_rate: int
+    pcm: Optional[np.ndarray] = None  # None while decoding
+    ready: threading.Event = field(default_factory=threading.Event)
+
+
+class ReplayBuffer:
+    """
+    Ring buffer of the last replies as decoded PCM.
+    TTS backends add every reply they play; replay() plays one back
+    at 0.7x-1.0x without a network round trip.
+    """
+
+    def __init__(self,
+                keep: int = 5,
+                slow_speed: float = 0.8,
+                min_speed: float = 0.7,
+                player=None):
+        """
+        Initialize replay buffer.
+
+        Args:
+            keep: Number of replies kept in memory
+            slow_speed: Speed of the first "slower" request
+            min_speed: Lowest speed, reached by asking "slower" again
+            player: audio_io.AudioPlayer used for playback
+        """
+        self.replies = deque(maxlen=keep)
+        self.slow_speed = slow_speed
+        self.min_speed = min_speed
+        self.player = player
+        self.console = Console()
+        self.last_speed = 1.0
+        self._has_ffmpeg = shutil.which("ffmpeg") is not None
+
+    def add_pcm(self, parts: List[Tuple[Union[bytes, np.ndarray], int]], text: str = ""):
+        """
+        Keep a reply that is already PCM (local TTS, Edge raw PCM).
+
+        Args:
+            parts: (16-bit PCM, sample rate) pieces in order, e.g. one per
+                language span; they are joined at the first piece's rate
+            text: Spoken text
+        """
+        rate = parts[0][1] if parts else 0
+        pieces = []
+        for pcm, sample_rate in parts:
+            if isinstance(pcm, (bytes, bytearray)):
+                pcm = np.frombuffer(pcm[:len(pcm) // 2 * 2], dtype=np.int16)
+            if sample_rate != rate:
+                # another voice model, resample (linear is enough for replay)
+                n = int(len(pcm) * rate / sample_rate)
+                pcm = np.interp(np.linspace(0, len(pcm) - 1, n), np.arange(len(pcm)), pcm).astype(np.int16)
+            pieces.append(pcm)
+        if not pieces or not any(len(p) for p in pieces):
+            return
+
+        utterance = Utterance(text, rate, np.concatenate(pieces).astype(np.int16, copy=False))
+        utterance.ready.set()
+        self.replies.append(utterance)
+        self.last_speed = 1.0
+
+    def add_encoded(self, data: bytes, sample_rate: int = 24000, text: str = ""):
+        """
+        Keep an encoded reply (mp3 / webm), decoded to PCM in the background.
+
+        Args:
+            data: Encoded audio as received from Edge
+            sample_rate: Rate to decode to
+            text: Spoken text
+        """
+        if not data or not self._has_ffmpeg:
+            return
+        utterance = Utterance(text, sample_rate)
+        self.replies.append(utterance)
+        self.last_speed = 1.0
+        threading.Thread(target=self._decode, args=(utterance, data), daemon=True).start()
+
+    def _decode(self, utterance: Utterance, data: bytes):
+        try:
+            result = subprocess.run(
+                ["ffmpeg", "-loglevel", "error", "-i", "pipe:0",
+                "-f", "s16le", "-ac", "1", "-ar", str(utterance.sample_rate), "pipe:1"],
+                input=data, capture_output=True, check=True
+            )
+            utterance.pcm = np.frombuffer(result.stdout, dtype=np.int16)
+        except (OSError, subprocess.CalledProcessError) as e:
+            self.console.print(f"[yellow]Could not decode reply for replay: {e}[/]")
+        finally:
+            utterance.ready.set()
+
+    def last(self, back: int = 0) -> Optional[Utterance]:
+        """The most recent reply (back=1 -> the one before, ...)."""
+        if back >= len(self.replies):
+            return None
+        return self.replies[-1 - back]
+
+    def replay(self, request: str = REPEAT, back: int = 0) -> bool:
+        """
+        Play a recent reply again.
+
+        Args:
+            request: SLOWER (each request a step slower, down to min_speed) or REPEAT
+            back: 0 -> last reply, 1 -> the one before, ...
+
+        Returns:
+            False if there is nothing to replay
+        """
+        utterance = self.last(back)
+        if utterance is None or not utterance.ready.wait(timeout=5) or utterance.pcm is None:
+            self.console.print("[yellow]Nothing to replay yet.[/]")
+            return False
+
+        if request == SLOWER:
+            speed = self.slow_speed if self.last_speed >= 1.0 else self.last_speed - 0.1
+            speed = max(self.min_speed, round(speed, 2))
+        else:
+            speed = self.last_speed  # "repeat" keeps the current speed
+        self.last_speed = speed
+
+        start = time.perf_counter()
+        audio = time_stretch(utterance.pcm, speed, utterance.sample_rate)
+        metrics.observe("replay.stretch_ms", (time.perf_counter() - start) * 1000)
+        metrics.incr("replay." + request)
+
+        self.console.print(f"[dim]🔁 Replaying at {speed:.2f}x[/]")
+        self.player.play(audio, sample_rate=utterance.sample_rate)
+        return True
+
+
+# ======================================================================== #
+#                              TESTING                                     #
+# ======================================================================== #
+
+if __name__ == "__main__":
+    rate = 24000
+    t = np.arange(rate * 2) / rate
+    tone = (0.3 * np.sin(2 * np.pi * 220 * t) * 32767).astype(np.int16)
+
+    for speed in (1.0, 0.85, 0.7):
+        start = time.perf_counter()
+        slow = time_stretch(tone, speed, rate)
+        elapsed = (time.perf_counter() - start) * 1000
+        peak = np.argmax(np.abs(np.fft.rfft(slow))) * rate / len(slow)
+        print(f"{speed:.2f}x: {len(slow) / rate:.2f}s, pitch {peak:.0f} Hz, {elapsed:.1f} ms")
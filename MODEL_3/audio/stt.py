@@ -3,12 +3,240 @@ Speech-to-Text using Faster-Whisper
 Transcribes real-time audio from microphone (not files)
 """
 
-from faster_whisper import WhisperModel
+from faster_whisper import BatchedInferencePipeline, WhisperModel
+import bisect
+import concurrent.futures
+import dataclasses
 import numpy as np
-from typing import Optional, Tuple
+import queue
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from rapidfuzz.distance import Levenshtein
 from rich.console import Console
 from .audio_io import AudioRecorder
-from .end_phrase import EndPhrases
+from .noise_filter import NoiseFilter, HALLUCINATION
+from .stt_workers import SttWorkerPool
+from .voice_commands import CommandRouter, END
+from ..metrics import metrics
+
+
+_WORD_RE = re.compile(r"\w+")
+
+# Silero VAD settings of the main decode (also used by the STT benchmarks)
+VAD_PARAMETERS = dict(
+    min_silence_duration_ms=200,  # Minimum silence to split
+    threshold=0.5,  # Voice activity threshold
+)
+
+
+def transcript_distance(a: str, b: str) -> float:
+    """
+    Word-level normalized edit distance between two transcripts
+    (case and punctuation ignored): 0.0 same words, 1.0 nothing in common.
+    """
+    return Levenshtein.normalized_distance(_WORD_RE.findall(a.lower()), _WORD_RE.findall(b.lower()))
+
+
+def stitch(previous: str, text: str, max_overlap: int = 12) -> str:
+    """
+    Append the transcript of the next dictation chunk, dropping the words that
+    were heard twice (the chunks share `overlap` seconds of audio).
+    The longest tail of previous that matches the head of text is removed from text;
+    one word may differ (cut at the chunk edge) and one leading fragment is skipped.
+    """
+    old, new = previous.split(), text.split()
+    norm = lambda words: [w for word in words for w in _WORD_RE.findall(word.lower())]
+    for n in range(min(max_overlap, len(old)), 0, -1):
+        tail = norm(old[-n:])
+        for skip in (0, 1):  # the first word of the chunk may be half a word
+            head = norm(new[skip:skip + n])
+            if len(head) == len(tail) and Levenshtein.distance(tail, head) <= (n >= 4):
+                return " ".join(old + new[skip + n:])
+    
+    # no repeated words, but maybe the end of the last one ("Bruder" | "der ...")
+    if old and len(new) > 1:
+        last, first = norm(old[-1:]), norm(new[:1])
+        if last and len(first) == 1 and len(first[0]) > 1 and last[-1].endswith(first[0]):
+            new = new[1:]
+    return " ".join(old + new)
+
+
+class _Request:
+    """One utterance waiting for a batch."""
+    __slots__ = ("audio", "language", "beam_size", "future", "enqueued", "detected")
+
+    def __init__(self, audio: np.ndarray, language: Optional[str], beam_size: int):
+        self.audio = audio
+        self.language = language
+        self.beam_size = beam_size
+        self.detected = None  # (language, probability) when auto-detected
+        self.future = concurrent.futures.Future()
+        self.enqueued = time.perf_counter()
+
+
+class BatchScheduler:
+    """
+    Batches utterances from concurrent sessions through faster-whisper's
+    BatchedInferencePipeline instead of letting independent transcribe()
+    calls compete for the cores.
+    
+    A batch closes when no new utterance arrives for `window_ms`, when the first
+    one has waited `max_wait_ms`, or at `max_batch` utterances. Utterances of one
+    batch are concatenated and passed as clips, each decoded as one batch item.
+    The pipeline decodes a whole call in one language, so utterances without a
+    language get theirs detected first and are grouped by it.
+    """
+    
+    CLIP_SECONDS = 30  # Whisper's window, longer utterances are split into several clips
+    
+    def __init__(self,
+                model: WhisperModel,
+                window_ms: float = 30.0,
+                max_wait_ms: float = 150.0,
+                max_batch: int = 8):
+        """
+        Initialize batch scheduler.
+        
+        Args:
+            model: Loaded WhisperModel (shared by every session using the scheduler)
+            window_ms: A batch stays open while utterances keep arriving this close together
+            max_wait_ms: Longest an utterance waits for its batch to fill
+            max_batch: Most utterances per batch
+        """
+        self.model = model
+        self.pipeline = BatchedInferencePipeline(model=model)
+        self.window = window_ms / 1000
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="stt-batcher", daemon=True)
+        self._thread.start()
+    
+    @classmethod
+    def load(cls,
+            model_size: str = "large-v3",
+            device: str = "cpu",
+            compute_type: str = "int8",
+            cpu_threads: int = 0,
+            num_workers: int = 1,
+            **kwargs) -> "BatchScheduler":
+        """Load the model and start a scheduler on it (kwargs: see __init__)."""
+        model = WhisperModel(model_size, device=device, compute_type=compute_type,
+                            cpu_threads=cpu_threads, num_workers=num_workers)
+        return cls(model, **kwargs)
+    
+    def submit(self,
+            audio: np.ndarray,
+            language: Optional[str] = "de",
+            beam_size: int = 5) -> concurrent.futures.Future:
+        """
+        Queue an utterance.
+        
+        Returns:
+            Future with (segments, info) like WhisperModel.transcribe (segments as a list)
+        """
+        request = _Request(audio, language, beam_size)
+        self._queue.put(request)
+        return request.future
+    
+    def transcribe(self, audio: np.ndarray, language: Optional[str] = "de", beam_size: int = 5):
+        """Blocking submit(): (segments, info) of one utterance."""
+        return self.submit(audio, language, beam_size).result()
+    
+    def stop(self):
+        """Finish the queued batches and stop the scheduler thread."""
+        self._queue.put(None)
+        self._thread.join(timeout=10)
+    
+    def _collect(self, first: _Request) -> Tuple[List[_Request], bool]:
+        """Requests for one batch, (batch, stop requested)."""
+        batch = [first]
+        deadline = first.enqueued + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = min(self.window, deadline - time.perf_counter())
+            if timeout <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break  # quiet for a whole window
+            if request is None:
+                return batch, True
+            batch.append(request)
+        return batch, False
+    
+    def _run(self):
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, stop = self._collect(first)
+            
+            # auto-detect per utterance, not once for the whole batch
+            for request in batch:
+                if request.language is None:
+                    try:
+                        language, probability, _ = self.model.detect_language(request.audio)
+                        request.language, request.detected = language, (language, probability)
+                    except Exception as e:
+                        request.future.set_exception(e)
+            batch = [request for request in batch if not request.future.done()]
+            
+            # one pipeline call per decode setting
+            groups: Dict[Tuple[Optional[str], int], List[_Request]] = {}
+            for request in batch:
+                groups.setdefault((request.language, request.beam_size), []).append(request)
+            for (language, beam_size), requests in groups.items():
+                self._decode(requests, language, beam_size)
+    
+    def _decode(self, requests: List[_Request], language: Optional[str], beam_size: int):
+        start = time.perf_counter()
+        for request in requests:
+            metrics.observe("stt.batch.queue_ms", (start - request.enqueued) * 1000)
+        metrics.observe("stt.batch.size", len(requests))
+        
+        # clips in samples on the concatenated audio, and the request each belongs to
+        clips, owners, offset = [], [], 0
+        clip_len = self.CLIP_SECONDS * 16000
+        for i, request in enumerate(requests):
+            for s in range(0, len(request.audio), clip_len):
+                clips.append({"start": offset + s, "end": offset + min(s + clip_len, len(request.audio))})
+                owners.append(i)
+            offset += len(request.audio)
+        starts = [clip["start"] / 16000 for clip in clips]
+        
+        try:
+            segments, info = self.pipeline.transcribe(
+                np.concatenate([request.audio for request in requests]),
+                language=language,
+                beam_size=beam_size,
+                batch_size=len(clips),
+                clip_timestamps=clips,
+                vad_filter=False,  # the clips are the utterances
+                without_timestamps=True,
+            )
+            per_request = [[] for _ in requests]
+            for segment in segments:
+                middle = (segment.start + segment.end) / 2
+                per_request[owners[max(0, bisect.bisect_right(starts, middle) - 1)]].append(segment)
+        except Exception as e:
+            for request in requests:
+                request.future.set_exception(e)
+            return
+        
+        elapsed = time.perf_counter() - start
+        metrics.observe("stt.batch.decode_ms", elapsed * 1000)
+        metrics.observe("stt.batch.throughput", offset / 16000 / elapsed)  # audio seconds per second
+        for request, segments in zip(requests, per_request):
+            if request.detected is not None:
+                language, probability = request.detected
+                request.future.set_result((segments, dataclasses.replace(
+                    info, language=language, language_probability=probability)))
+            else:
+                request.future.set_result((segments, info))
 
 
 class FasterWhisperSTT:
@@ -23,9 +251,29 @@ class FasterWhisperSTT:
         model_size: str = "large-v3",
         device: str = "cuda",  # "cuda" or "cpu"
         compute_type: str = "float16",  # "float16" (GPU) or "int8" (CPU)
+        cpu_threads: int = 0,  # 0 -> CTranslate2 default
+        num_workers: int = 1,
         language: str = "de",  # German, None -> for auto language detection mode
         beam_size: int = 5,
         vad_filter: bool = True,  # Voice activity detection
+        small_model_size: Optional[str] = None,  # e.g. "tiny", None -> no keyword spotting / drafts
+        kws_max_seconds: float = 2.5,
+        kws_min_logprob: float = -0.6,
+        two_pass: bool = False,
+        adaptive_beam: bool = False,
+        min_avg_logprob: float = -0.7,
+        max_compression_ratio: float = 2.4,
+        max_no_speech_prob: float = 0.6,
+        noise_filter: Optional[NoiseFilter] = None,
+        pin_after: int = 3,
+        pin_min_probability: float = 0.8,
+        recheck_logprob: float = -0.8,
+        dictation: bool = False,
+        chunk_seconds: float = 8.0,
+        chunk_overlap: float = 1.0,
+        max_dictation_seconds: float = 120.0,
+        model=None,
+        small_model: Optional[WhisperModel] = None,
     ):
         """
         Initialize Faster-Whisper model.
@@ -41,28 +289,112 @@ class FasterWhisperSTT:
                         - large-v3: Slowest, most accurate
             device: "cuda" for GPU or "cpu"
             compute_type: "float16" (GPU), "int8" (CPU) for speed
+            cpu_threads: CPU threads per decode (0 -> library default)
+            num_workers: Decodes that can run in parallel (threads calling transcribe)
             language: Target language code (de=German, en=English, None -> for auto language detection mode)
             beam_size: Beam search width (higher = better but slower)
             vad_filter: Use voice activity detection to filter silence
+            small_model_size: Small model that checks short utterances for session
+                            commands ("tschüss", "repeat", ...) before the main model runs,
+                            and writes the draft transcript in two-pass mode
+            kws_max_seconds: Only utterances up to this length are checked for commands
+            kws_min_logprob: Min avg log-probability of the small model's transcript
+                            to trust a command (otherwise the main model decides)
+            two_pass: Run the main model in parallel with the small one and hand the
+                    draft transcript to listen_and_transcribe(on_draft=...) early
+            adaptive_beam: Decode greedily first and re-decode only low-confidence
+                        segments with beam_size
+            min_avg_logprob: Segments below this avg log-probability are re-decoded
+            max_compression_ratio: Segments above this (repetitive text) are re-decoded
+            max_no_speech_prob: Segments above this (probably noise, greedy may have
+                                made up words) are re-decoded
+            noise_filter: Drops noise / hallucinated segments and turns
+                        (None -> every non-empty transcript is a turn)
+            pin_after: Auto language mode: after this many confident detections of the
+                    same language it is pinned for the session (0 -> never pin)
+            pin_min_probability: Detection probability that counts as confident
+            recheck_logprob: A pinned-language transcript below this avg log-probability
+                            triggers a language re-check (the learner may have switched)
+            dictation: Answers longer than chunk_seconds are recorded in chunks that are
+                    transcribed while the learner keeps speaking (no 10 s cap)
+            chunk_seconds: Dictation window
+            chunk_overlap: Audio shared by consecutive chunks (its words are de-duplicated)
+            max_dictation_seconds: Hard stop for one dictated answer
+            model: Already loaded main model, used instead of loading model_size:
+                - WhisperModel (e.g. kept by the ResourceManager between sessions)
+                - BatchScheduler: decoded in batches with other sessions' utterances
+                - SttWorkerPool: decoded in worker processes (the small model stays here)
+            small_model: Already loaded small model, used instead of loading small_model_size
+                        model / small_model can also be Futures of models still loading: recording
+                        starts right away and the first decode waits for them
         """
         self.console = Console()
         self.language = language
+        self.last_language = language  # language of the last transcript (detected in auto mode)
+        self.pinned_language = None  # auto mode: the session's language, once detection is settled
+        self.pin_after = pin_after
+        self.pin_min_probability = pin_min_probability
+        self.recheck_logprob = recheck_logprob
+        self._streak = (None, 0)  # (language, confident detections in a row)
         self.beam_size = beam_size
         self.vad_filter = vad_filter
+        self.adaptive_beam = adaptive_beam and beam_size > 1
+        self.min_avg_logprob = min_avg_logprob
+        self.max_compression_ratio = max_compression_ratio
+        self.max_no_speech_prob = max_no_speech_prob
+        self._beam_cost = None  # beam / greedy decode time per audio second, learned from re-decodes
+        self.noise_filter = noise_filter
+        
+        # Models still loading (woken up before they were back): the learner
+        # is recorded anyway, the audio waits for them in _models_ready()
+        self._loading = None
+        self._loading_lock = threading.Lock()
+        if any(isinstance(m, concurrent.futures.Future) for m in (model, small_model)):
+            self._loading = (model, small_model)
+            model = self.model = self.batcher = None
         
         # Load Faster-Whisper model
-        self.console.print(f"[yellow]Loading Faster-Whisper {model_size}...[/]")
-        try:
-            self.model = WhisperModel(
-                model_size,
+        if model is not None:
+            self._use_model(model)
+        elif self._loading is None:
+            self.batcher = None
+            self.console.print(f"[yellow]Loading Faster-Whisper {model_size}...[/]")
+            try:
+                self.model = WhisperModel(
+                    model_size,
+                    device=device,
+                    compute_type=compute_type,
+                    cpu_threads=cpu_threads,
+                    num_workers=num_workers,
+                    download_root=None,  # Use default cache
+                )
+                self.console.print("[green]✓ Model loaded successfully[/]")
+            except Exception as e:
+                self.console.print(f"[red]Failed to load model: {e}[/]")
+                raise
+        
+        # Small model for keyword spotting (session commands) and drafts
+        self.small_model = small_model if self._loading is None else None
+        self.kws_max_seconds = kws_max_seconds
+        self.kws_min_logprob = kws_min_logprob
+        if small_model_size and small_model is None:
+            self.console.print(f"[yellow]Loading Faster-Whisper {small_model_size} (commands / drafts)...[/]")
+            self.small_model = WhisperModel(
+                small_model_size,
                 device=device,
                 compute_type=compute_type,
-                download_root=None,  # Use default cache
             )
-            self.console.print("[green]✓ Model loaded successfully[/]")
-        except Exception as e:
-            self.console.print(f"[red]Failed to load model: {e}[/]")
-            raise
+        
+        # Two-pass mode: the main model decodes in this thread while the draft is used
+        self.two_pass = two_pass and (small_model is not None or self.small_model is not None)
+        self._final_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1) if self.two_pass else None
+        
+        # Dictation: chunks are decoded in order, in the background, while recording goes on
+        self.dictation = dictation
+        self.chunk_seconds = chunk_seconds
+        self.chunk_overlap = chunk_overlap
+        self.max_dictation_seconds = max_dictation_seconds
+        self._chunk_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1) if dictation else None
         
         # Initialize audio recorder
         self.recorder = AudioRecorder(
@@ -72,89 +404,384 @@ class FasterWhisperSTT:
             max_duration=10.0,
         )
         
-        # Define END PHRASES
-        self.end_phrases = EndPhrases(wake_word=wake_word)
+        # END PHRASES (whole-utterance match, "stop" inside a sentence doesn't count)
+        self.commands = CommandRouter(wake_word=wake_word)
+    
+    def _use_model(self, model):
+        self.batcher = model if isinstance(model, BatchScheduler) else None
+        # WhisperModel, or SttWorkerPool (same transcribe() / detect_language())
+        self.model = self.batcher.model if self.batcher is not None else model
+    
+    def _models_ready(self):
+        """Wait for models passed as Futures (the utterance recorded meanwhile is kept)."""
+        with self._loading_lock:
+            if self._loading is None:
+                return
+            pending = [m for m in self._loading if isinstance(m, concurrent.futures.Future) and not m.done()]
+            if pending:
+                self.console.print("[dim]Speech model still loading, your answer is kept...[/]")
+            start = time.perf_counter()
+            model, small_model = (m.result() if isinstance(m, concurrent.futures.Future) else m
+                                for m in self._loading)
+            self._use_model(model)
+            if small_model is not None:
+                self.small_model = small_model
+            self._loading = None
+            if pending:
+                metrics.incr("stt.buffered_utterances")
+                metrics.observe("stt.model_wait_ms", (time.perf_counter() - start) * 1000)
         
     
-    def transcribe(self, audio: np.ndarray) -> Optional[str]:
+    def transcribe(self,
+                audio: np.ndarray,
+                on_draft: Optional[Callable[[str], None]] = None) -> Optional[str]:
         """
         Transcribe audio array to text.
         
         Args:
             audio: NumPy array of audio samples (float32, 16kHz)
+            on_draft: Two-pass mode: called with the small model's transcript
+                    while the main model is still decoding (early dispatch)
             
         Returns:
             Transcribed text or None if transcription failed
         """
         try:
-            # Transcribe with Faster-Whisper
-            segments, info = self.model.transcribe(
-                audio,
-                language=self.language, # or 'None' to allow auto language detection
-                beam_size=self.beam_size,
-                vad_filter=self.vad_filter,
-                vad_parameters=dict(
-                    min_silence_duration_ms=200,  # Minimum silence to split
-                    threshold=0.5,  # Voice activity threshold
-                ),
-            )
+            self._models_ready()
+            short = len(audio) <= self.kws_max_seconds * 16000
+            two_pass = self.two_pass and on_draft is not None
             
-            # Combine all segments into single transcript
-            transcript = " ".join(segment.text for segment in segments).strip()
+            # long utterance: can't be a command, start the main model right away
+            final = self._final_pool.submit(self._decode, audio) if two_pass and not short else None
             
-            if not transcript:
-                return None
+            draft = self._draft(audio) if self.small_model is not None and (short or two_pass) else None
             
-            # if auto language detection is on
-            # -----------------------------------
-            # Log language detection info
-            detected_lang = info.language
-            lang_probability = info.language_probability
-            
-            if detected_lang != self.language and lang_probability > 0.5:
-                self.console.print(
-                    f"[yellow]⚠ Detected {detected_lang} "
-                    f"(expected {self.language}, confidence: {lang_probability:.2f})[/]"
-                )
-            # -----------------------------------------------------------------------------
-            
-            # Detect end phrase match
-            if self.end_phrases.search(transcript):
-                self.console.print(f"[italic red]\n⚠  End phrase detected in: {transcript}[/]")
-                self.cleanup()
-                return "__END_SESSION__"
+            if draft is not None and short and self._is_command(draft):
+                # Short utterance that is just a command, the small model is enough
+                metrics.incr("stt.kws_hits")
+                transcript = draft[0]
+            elif two_pass:
+                if final is None:
+                    final = self._final_pool.submit(self._decode, audio)
+                if draft is not None and draft[0] and not self._is_phantom(draft[0]):
+                    on_draft(draft[0])
+                start = time.perf_counter()
+                transcript = final.result()
+                metrics.observe("stt.final_wait_ms", (time.perf_counter() - start) * 1000)
+                if draft is not None:
+                    metrics.observe("stt.draft_distance", transcript_distance(draft[0], transcript))
+            else:
+                transcript = self._decode(audio)
             
-            return transcript
+            return self._check_end(transcript)
             
         except Exception as e:
             self.console.print(f"[red]Transcription error: {e}[/]")
             return None
     
-    def listen_and_transcribe(self) -> Optional[str]:
+    def _check_end(self, transcript: Optional[str]) -> Optional[str]:
+        """The transcript, None if empty, or "__END_SESSION__" for an end phrase."""
+        if not transcript:
+            return None
+        
+        # Detect end phrase match
+        if self.commands.match(transcript) == END:
+            self.console.print(f"[italic red]\n⚠  End phrase detected in: {transcript}[/]")
+            self.cleanup()
+            return "__END_SESSION__"
+        
+        return transcript
+    
+    def _draft(self, audio: np.ndarray) -> Optional[Tuple[str, float]]:
+        """
+        Cheap first pass with the small model (greedy, no timestamps).
+        
+        Returns:
+            (transcript, lowest segment avg_logprob), None if nothing was heard
+        """
+        start = time.perf_counter()
+        segments, _ = self.small_model.transcribe(
+            audio,
+            language=self.language or self.pinned_language,
+            beam_size=1,
+            without_timestamps=True,
+            condition_on_previous_text=False,
+            vad_filter=self.vad_filter,
+        )
+        segments = list(segments)
+        metrics.observe("stt.draft_ms", (time.perf_counter() - start) * 1000)
+        
+        if not segments:
+            return None
+        text = " ".join(segment.text for segment in segments).strip()
+        return text, min(segment.avg_logprob for segment in segments)
+    
+    def _is_command(self, draft: Tuple[str, float]) -> bool:
+        """True if the draft is a confident session command (skip the main model)."""
+        text, logprob = draft
+        return bool(text) and logprob >= self.kws_min_logprob and self.commands.match(text) is not None
+    
+    def _decode(self, audio: np.ndarray, prompt: Optional[str] = None) -> str:
+        """
+        Full transcription with the main model.
+        
+        Args:
+            audio: Utterance samples (16kHz)
+            prompt: Text said just before (dictation), keeps wording consistent across chunks
+        """
+        start = time.perf_counter()
+        language = self.language or self.pinned_language  # 'None' -> auto language detection
+        beam_size = 1 if self.adaptive_beam else self.beam_size
+        if self.batcher is not None and prompt is None:
+            # decoded together with the other sessions' utterances (no VAD: end-pointed already)
+            segments, info = self.batcher.transcribe(audio, language=language, beam_size=beam_size)
+        else:
+            segments, info = self.model.transcribe(
+                audio,
+                initial_prompt=prompt,
+                language=language,
+                beam_size=beam_size,
+                vad_filter=self.vad_filter,
+                vad_parameters=VAD_PARAMETERS,
+            )
+        
+        # Combine all segments into single transcript
+        segments = list(segments)  # decoding happens here
+        heard = " ".join(segment.text.strip() for segment in segments)
+        rejected = None
+        if self.noise_filter is not None:
+            segments, rejected = self.noise_filter.filter(segments)
+        texts = [segment.text.strip() for segment in segments]
+        if self.adaptive_beam and segments:
+            texts = self._redecode_uncertain(audio, segments, texts, info.language,
+                                            greedy_ms=(time.perf_counter() - start) * 1000)
+        transcript = " ".join(texts).strip()
+        metrics.observe("stt.decode_ms", (time.perf_counter() - start) * 1000)
+        
+        # noise / hallucination: drop the turn before it costs a search, an LLM call and TTS
+        if transcript and self._is_phantom(transcript):
+            rejected, transcript = HALLUCINATION, ""
+        if rejected and not transcript:
+            self.noise_filter.reject(heard, rejected)
+            self.console.print(f"[dim]Ignored ({rejected.replace('_', ' ')}): {heard.strip()}[/]")
+            return ""
+        
+        # if auto language detection is on
+        # -----------------------------------
+        if self.language is None and transcript:
+            if self.pinned_language is not None and self._language_changed(audio, segments):
+                return self._decode(audio, prompt)  # decoded in the wrong language, again with detection
+            self._track_language(info.language, info.language_probability)
+        self.last_language = self.language or self.pinned_language or info.language
+        # -----------------------------------------------------------------------------
+        
+        return transcript
+    
+    def _track_language(self, language: str, probability: float):
+        """Count confident detections and pin the language after pin_after in a row."""
+        if self.pinned_language is not None:
+            metrics.incr("stt.language_detect_skipped")
+            return
+        
+        if probability < self.pin_min_probability:
+            self._streak = (None, 0)
+            return
+        count = self._streak[1] + 1 if self._streak[0] == language else 1
+        self._streak = (language, count)
+        if self.pin_after and count >= self.pin_after:
+            self.pinned_language = language
+            metrics.incr("stt.language_pinned")
+            self.console.print(f"[dim]Language pinned: {language}[/]")
+    
+    def _language_changed(self, audio: np.ndarray, segments: list) -> bool:
+        """
+        Cheap re-check of a pinned language, only when the transcript looks unsure.
+        Language ID runs on the small model if there is one (encoder + one decoder step).
+        
+        Returns:
+            True if the pin was dropped (another language was detected confidently)
+        """
+        if segments and min(segment.avg_logprob for segment in segments) >= self.recheck_logprob:
+            return False
+        
+        metrics.incr("stt.language_rechecks")
+        language, probability, _ = (self.small_model or self.model).detect_language(audio)
+        if language == self.pinned_language or probability < self.pin_min_probability:
+            return False
+        
+        self.console.print(f"[yellow]⚠ Detected {language} (pinned {self.pinned_language}, "
+                        f"confidence: {probability:.2f}), detecting again[/]")
+        metrics.incr("stt.language_unpinned")
+        self.pinned_language = None
+        self._streak = (language, 1)
+        return True
+    
+    def pin_language(self, language: str):
+        """
+        Switch the session to a language (voice command).
+        Auto mode keeps the re-check, so the pin can still follow the learner.
+        """
+        if self.language is None:
+            self.pinned_language = language
+            self._streak = (language, self.pin_after)
+        else:
+            self.language = language
+        self.last_language = language
+    
+    def _is_phantom(self, text: str) -> bool:
+        """True if the text is a known Whisper hallucination."""
+        return self.noise_filter is not None and self.noise_filter.is_hallucination(text)
+    
+    def _uncertain(self, segment) -> bool:
+        """Low-confidence greedy segment that is worth a beam search."""
+        return (
+            segment.avg_logprob < self.min_avg_logprob
+            or segment.compression_ratio > self.max_compression_ratio
+            or segment.no_speech_prob > self.max_no_speech_prob
+        )
+    
+    def _redecode_uncertain(self, audio: np.ndarray, segments: list, texts: list,
+                            language: str, greedy_ms: float) -> list:
+        """
+        Re-decode low-confidence segments with the full beam.
+        
+        Args:
+            audio: Utterance samples (16kHz)
+            segments: Greedy segments (with start / end in seconds)
+            texts: Greedy segment texts
+            language: Language of the greedy pass
+            greedy_ms: Time the greedy pass took
+            
+        Returns:
+            Segment texts, uncertain ones replaced by the beam result
+        """
+        weak = [i for i, segment in enumerate(segments) if self._uncertain(segment)]
+        metrics.incr("stt.segments", len(segments))
+        metrics.incr("stt.segments_redecoded", len(weak))
+        if not weak:
+            self._record_saving(greedy_ms, 0.0)
+            return texts
+        
+        start = time.perf_counter()
+        if len(weak) == len(segments):
+            # nothing to keep, one beam pass over the whole utterance
+            pieces = [audio]
+            texts = [""] * len(segments)
+        else:
+            pad = int(0.2 * 16000)  # context around the segment
+            pieces = [audio[max(0, int(segments[i].start * 16000) - pad):int(segments[i].end * 16000) + pad]
+                    for i in weak]
+        
+        for i, piece in zip(weak, pieces):
+            beam_segments, _ = self.model.transcribe(
+                piece,
+                language=language,
+                beam_size=self.beam_size,
+                without_timestamps=True,
+                condition_on_previous_text=False,
+            )
+            text = " ".join(segment.text.strip() for segment in beam_segments).strip()
+            if text or len(pieces) == 1:
+                texts[i] = text
+        redecode_ms = (time.perf_counter() - start) * 1000
+        
+        # beam vs greedy cost per audio second, to estimate what the adaptive policy saves
+        redecoded = sum(len(piece) for piece in pieces)
+        if redecoded and greedy_ms > 0:
+            ratio = (redecode_ms / redecoded) / (greedy_ms / len(audio))
+            self._beam_cost = ratio if self._beam_cost is None else 0.8 * self._beam_cost + 0.2 * ratio
+        self._record_saving(greedy_ms, redecode_ms)
+        return texts
+    
+    def _record_saving(self, greedy_ms: float, redecode_ms: float):
+        """Estimated time saved vs. decoding everything with the full beam."""
+        metrics.observe("stt.redecode_ms", redecode_ms)
+        if self._beam_cost is not None:
+            metrics.observe("stt.adaptive_saved_ms", greedy_ms * self._beam_cost - greedy_ms - redecode_ms)
+    
+    def listen_and_transcribe(self,
+                            on_draft: Optional[Callable[[str], None]] = None) -> Optional[str]:
         """
         Record from microphone and transcribe in one step.
         
+        Args:
+            on_draft: Receives the draft transcript early (two-pass mode only)
+        
         Returns:
             Transcribed text or None if no speech or error
         """
         # Record audio
-        audio = self.recorder.record()
+        if self.dictation:
+            chunks = self.recorder.record_chunks(
+                window=self.chunk_seconds,
+                overlap=self.chunk_overlap,
+                max_total=self.max_dictation_seconds,
+            )
+            audio, last = next(chunks, (None, True))
+            if audio is not None and not last:
+                return self._dictate(audio, chunks)  # longer than one window
+        else:
+            audio = self.recorder.record()
         
         if audio is None:
             return None
         
         # Transcribe
         with self.console.status("[bold magenta]Transcribing...[/]", spinner="dots"):
-            result = self.transcribe(audio)
+            result = self.transcribe(audio, on_draft=on_draft)
             
             if result == "__END_SESSION__":
                 return "__END_SESSION__"  # signal caller to exit loop
             
             return result
     
+    def _dictate(self, first: np.ndarray, chunks) -> Optional[str]:
+        """
+        Transcribe a dictated answer chunk by chunk while it is being recorded.
+        Each chunk is decoded as soon as it is committed, prompted with the text
+        before it, so at the end only the last chunk is still to decode.
+        
+        Args:
+            first: First (full) window
+            chunks: The rest of AudioRecorder.record_chunks()
+        
+        Returns:
+            Stitched transcript, "__END_SESSION__", or None if decoding failed
+        """
+        def decode(audio, before):
+            self._models_ready()
+            previous = before.result() if before is not None else ""
+            return stitch(previous, self._decode(audio, prompt=previous[-200:] or None))
+        
+        pending = self._chunk_pool.submit(decode, first, None)
+        n = 1
+        try:
+            for audio, _ in chunks:
+                pending = self._chunk_pool.submit(decode, audio, pending)
+                n += 1
+        except Exception as e:
+            self.console.print(f"[red]Recording error: {e}[/]")
+            return None
+        
+        start = time.perf_counter()
+        try:
+            with self.console.status("[bold magenta]Transcribing last chunk...[/]", spinner="dots"):
+                transcript = pending.result()  # raises the first chunk's decode error
+        except Exception as e:
+            self.console.print(f"[red]Transcription error: {e}[/]")
+            return None
+        metrics.incr("stt.dictation_chunks", n)
+        metrics.observe("stt.dictation_final_ms", (time.perf_counter() - start) * 1000)
+        return self._check_end(transcript.strip())
+    
     def cleanup(self):
-        """Release resources."""
+        """Release resources (the models are dropped, shared ones stay with their owner)."""
         self.recorder.cleanup()
+        if self._final_pool is not None:
+            self._final_pool.shutdown(wait=False)
+        if self._chunk_pool is not None:
+            self._chunk_pool.shutdown(wait=False)
+        self.model = self.small_model = self.batcher = None
 
 
 # ======================================================================== #
@@ -0,0 +1,340 @@
+"""
+Multi-process STT workers
+Whisper decodes run in worker processes, so a long decode can't hold up the
+PyAudio read loop (input overflows silently drop frames) and several decodes
+use several cores. Audio goes to the workers through shared-memory ring slots,
+only small tuples travel over the queues.
+
+Memory: each process holds its own copy of the weights. CTranslate2 starts its
+threads while loading a model and threads don't survive fork(), so a model
+can't be loaded once and forked to share it copy-on-write (a fork server that
+only preloads the imports saves a few MB, not the weights). Replicas inside one
+worker do share the weights, so prefer a few processes with several replicas
+each; the unique RSS printed at startup is what one more process costs.
+"""
+
+import concurrent.futures
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+import numpy as np
+from rich.console import Console
+from ..metrics import metrics
+
+
+# What the parent gets back instead of faster-whisper's Segment / TranscriptionInfo
+Segment = namedtuple("Segment", "start end text tokens avg_logprob compression_ratio no_speech_prob")
+Info = namedtuple("Info", "language language_probability duration")
+
+SAMPLE_RATE = 16000
+
+
+def process_memory(pid: int) -> Optional[Tuple[float, float]]:
+    """
+    (RSS, unique RSS) of a process in MB. Unique is what the process alone
+    holds (private pages), i.e. what stopping it would free.
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+            fields = {line.split(":")[0]: int(line.split()[1]) for line in f if line.endswith("kB\n")}
+        return fields["Rss"] / 1024, (fields["Private_Clean"] + fields["Private_Dirty"]) / 1024
+    except (OSError, KeyError):  # not Linux
+        try:
+            import psutil
+            info = psutil.Process(pid).memory_full_info()
+            return info.rss / 2**20, info.uss / 2**20
+        except Exception:
+            return None
+
+
+def _worker_main(shm_name: str, slot_samples: int, tasks, results, model_options: Dict):
+    """
+    Worker process: load the model, then decode the slots it is handed,
+    one thread per model replica.
+
+    Tasks are (job_id, slot, length, method, options), None stops one replica.
+    Results are (job_id, slot, error, payload).
+    """
+    from faster_whisper import WhisperModel
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = np.ndarray((len(shm.buf) // (slot_samples * 4), slot_samples), dtype=np.float32, buffer=shm.buf)
+
+    def serve():
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            job_id, slot, length, method, options = task
+            try:
+                audio = ring[slot, :length].copy()  # the slot is reused once the result is in
+                if method == "detect_language":
+                    language, probability, _ = model.detect_language(audio)
+                    payload = (language, probability, None)
+                else:
+                    segments, info = model.transcribe(audio, **options)
+                    payload = (
+                        [Segment(s.start, s.end, s.text, list(s.tokens), s.avg_logprob,
+                                s.compression_ratio, s.no_speech_prob) for s in segments],
+                        Info(info.language, info.language_probability, info.duration),
+                    )
+                results.put((job_id, slot, None, payload))
+            except Exception as e:
+                results.put((job_id, slot, f"{type(e).__name__}: {e}", None))
+
+    try:
+        try:
+            model = WhisperModel(**model_options)
+        except Exception as e:
+            results.put((None, None, f"{type(e).__name__}: {e}", os.getpid()))
+            return
+        results.put((None, None, None, os.getpid()))  # ready
+        threads = [threading.Thread(target=serve, daemon=True) for _ in range(model_options["num_workers"])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        del ring
+        shm.close()
+
+
+class SttWorkerPool:
+    """
+    Pool of processes with one WhisperModel each (with one or more replicas).
+    Has WhisperModel's transcribe() / detect_language(), so FasterWhisperSTT
+    can use it in place of its model (segments come back as a list).
+    """
+
+    def __init__(self,
+                model_size: str = "large-v3",
+                device: str = "cpu",
+                compute_type: str = "int8",
+                cpu_threads: int = 0,
+                processes: int = 2,
+                replicas: int = 1,
+                slots: int = 8,
+                max_seconds: float = 30.0,
+                wait: bool = True):
+        """
+        Start the workers and wait for their models.
+
+        Args:
+            model_size, device, compute_type: As for WhisperModel
+            cpu_threads: Threads per replica (0 -> the cores split between all replicas)
+            processes: Worker processes
+            replicas: Decodes in parallel per process, sharing its weights
+                    (more decoders for little extra memory)
+            slots: Utterances that can be in flight at once (submit blocks beyond)
+            max_seconds: Longest utterance a slot holds
+            wait: Wait for the models here (False -> call wait_ready(), e.g. from a
+                startup thread; work submitted before is queued)
+        """
+        self.console = Console()
+        self.slot_samples = int(max_seconds * SAMPLE_RATE)
+        self.shm = shared_memory.SharedMemory(create=True, size=slots * self.slot_samples * 4)
+        self.ring = np.ndarray((slots, self.slot_samples), dtype=np.float32, buffer=self.shm.buf)
+        self._free: "queue.Queue[int]" = queue.Queue()
+        for slot in range(slots):
+            self._free.put(slot)
+
+        # fork where there is one: spawn re-imports the main script (german_tutor_V3.py
+        # has no __main__ guard). Start the pool before any model is loaded in this process.
+        method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        context = multiprocessing.get_context(method)
+        self._tasks = context.Queue()
+        self._results = context.Queue()
+        self._decoders = processes * replicas
+        model_options = dict(
+            model_size_or_path=model_size,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=cpu_threads or max(1, (os.cpu_count() or 1) // self._decoders),
+            num_workers=replicas,
+        )
+        self.console.print(f"[yellow]Starting {processes} STT workers x {replicas} replicas ({model_size})...[/]")
+        shared = (self.shm.name, self.slot_samples, self._tasks, self._results, model_options)
+        self.processes = [context.Process(target=_worker_main, name=f"stt-worker-{i}", daemon=True, args=shared)
+                        for i in range(processes)]
+        for process in self.processes:
+            process.start()
+
+        # each worker reports once its model is loaded (see _collect)
+        self.pids = []
+        self._processes = processes
+        self._errors = []
+        self._ready = threading.Event()
+        self._broken: Optional[str] = None  # why the pool stopped working (a worker died)
+        self._closed = False
+        self._reported = False
+        self._jobs: Dict[int, Tuple[concurrent.futures.Future, int]] = {}  # job -> (future, slot)
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._collector = threading.Thread(target=self._collect, name="stt-results", daemon=True)
+        self._collector.start()
+        if wait:
+            self.wait_ready()
+
+    def wait_ready(self):
+        """Block until every worker has its model (raises if one failed to start)."""
+        self._ready.wait()
+        if self._errors or self._broken:
+            self.close()
+            raise RuntimeError(f"STT worker failed to start: {self._errors[0] if self._errors else self._broken}")
+        with self._lock:
+            first, self._reported = not self._reported, True
+        if first:
+            self.console.print(f"[green]✓ {self._processes} STT workers ready[/]")
+            self.report_memory()
+
+    def memory(self) -> Dict[int, Optional[Tuple[float, float]]]:
+        """(RSS, unique RSS) in MB per worker pid (None where it can't be read)."""
+        return {pid: process_memory(pid) for pid in self.pids}
+
+    def report_memory(self):
+        """Print each worker's memory; unique RSS is what one more worker costs."""
+        for pid, usage in self.memory().items():
+            if usage is None:
+                continue
+            rss, unique = usage
+            metrics.observe("stt.workers.unique_mb", unique)
+            self.console.print(f"[dim]  worker {pid}: {rss:.0f} MB RSS, {unique:.0f} MB unique, "
+                            f"{rss - unique:.0f} MB shared[/]")
+
+    def submit(self, audio: np.ndarray, method: str = "transcribe", **options) -> concurrent.futures.Future:
+        """
+        Copy the audio into a free slot and queue it for the next idle worker.
+
+        Args:
+            audio: float32 samples (16kHz), at most max_seconds
+            method: "transcribe" or "detect_language"
+            **options: WhisperModel.transcribe keyword arguments
+
+        Returns:
+            Future with (segments, info) or (language, probability, None)
+        """
+        if len(audio) > self.slot_samples:
+            raise ValueError(f"Audio of {len(audio) / SAMPLE_RATE:.1f}s does not fit a "
+                            f"{self.slot_samples / SAMPLE_RATE:.0f}s slot")
+        start = time.perf_counter()
+        slot = self._free.get()  # blocks while every slot is in flight (freed too if a worker dies)
+        metrics.observe("stt.workers.slot_wait_ms", (time.perf_counter() - start) * 1000)
+
+        future = concurrent.futures.Future()
+        with self._lock:
+            if self._broken:
+                self._free.put(slot)
+                raise RuntimeError(self._broken)
+            self.ring[slot, :len(audio)] = audio
+            job_id = next(self._ids)
+            self._jobs[job_id] = (future, slot)
+        self._tasks.put((job_id, slot, len(audio), method, options))
+        return future
+
+    def transcribe(self, audio: np.ndarray, **options):
+        """WhisperModel.transcribe in a worker: (segments, info)."""
+        return self.submit(audio, **options).result()
+
+    def detect_language(self, audio: np.ndarray):
+        """WhisperModel.detect_language in a worker: (language, probability, None)."""
+        return self.submit(audio, method="detect_language").result()
+
+    def _collect(self):
+        """Hand results to their futures and free the slots; notice dead workers."""
+        while True:
+            try:
+                message = self._results.get(timeout=1.0)
+            except queue.Empty:
+                self._check_workers()
+                continue
+            if message is None:
+                break
+            job_id, slot, error, payload = message
+            if job_id is None:  # a worker is up (payload: its pid) or failed to start
+                self.pids.append(payload)
+                if error:
+                    self._errors.append(error)
+                if len(self.pids) == self._processes:
+                    self._ready.set()
+                continue
+            with self._lock:
+                job = self._jobs.pop(job_id, None)
+            if job is None:  # already failed when a worker died
+                continue
+            future, slot = job
+            self._free.put(slot)
+            if error:
+                future.set_exception(RuntimeError(f"STT worker failed: {error}"))
+            else:
+                future.set_result(payload)
+
+    def _check_workers(self):
+        """
+        A worker that died (OOM, crash in CTranslate2) never answers: fail the work
+        in flight, give its slots back and refuse new work instead of blocking.
+        """
+        if self._closed or self._broken:
+            return
+        dead = [p for p in self.processes if not p.is_alive()]
+        if not dead:
+            return
+        reason = ", ".join(f"{p.name} exited with code {p.exitcode}" for p in dead)
+        with self._lock:
+            self._broken = f"STT worker died: {reason}"
+            jobs, self._jobs = list(self._jobs.values()), {}
+        for future, slot in jobs:
+            self._free.put(slot)
+            future.set_exception(RuntimeError(self._broken))
+        metrics.incr("stt.workers.died")
+        self.console.print(f"[red]{self._broken}[/]")
+        self._ready.set()  # wait_ready() raises
+
+    def _stop_processes(self):
+        for _ in range(self._decoders):
+            self._tasks.put(None)
+        for process in self.processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+
+    def close(self):
+        """Stop the workers and release the shared memory."""
+        if self._closed:
+            return
+        self._closed = True
+        self._stop_processes()
+        self._results.put(None)
+        self._collector.join(timeout=5)
+        with self._lock:
+            for future, _ in self._jobs.values():
+                future.set_exception(RuntimeError("STT workers stopped"))
+            self._jobs.clear()
+        del self.ring
+        self.shm.close()
+        self.shm.unlink()
+
+
+# ======================================================================== #
+#                              TESTING                                     #
+# ======================================================================== #
+
+if __name__ == "__main__":
+    pool = SttWorkerPool(model_size="base", processes=2)
+    try:
+        t = np.arange(3 * SAMPLE_RATE) / SAMPLE_RATE
+        audio = (0.1 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+        start = time.perf_counter()
+        futures = [pool.submit(audio, language="de", beam_size=1) for _ in range(6)]
+        for future in futures:
+            segments, info = future.result()
+            print(f"{info.language} {len(segments)} segments: {' '.join(s.text for s in segments)!r}")
+        print(f"6 decodes in {time.perf_counter() - start:.2f}s")
+    finally:
+        pool.close()
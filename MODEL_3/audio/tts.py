@@ -1,28 +1,291 @@
 """
 Text-to-Speech using Edge-TTS
 Fast, free, high-quality German voices
+Offline fallback: Piper / espeak-ng on the CPU
 """
 
 import edge_tts
+import abc
 import asyncio
-from typing import Optional
-from rich.console import Console
-import tempfile
+import concurrent.futures
+import json
 import os
+import shutil
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from rich.console import Console
+import pyaudio
 import subprocess
+from ..LLM.speech_compiler import compile_speech, render, to_speech_text
+from ..metrics import metrics
 
 
-class EdgeTTS:
+class TTSLoop:
+    """
+    Long-lived asyncio event loop running in a daemon thread.
+    All TTS coroutines are submitted here instead of creating
+    and tearing down a loop per utterance with asyncio.run().
+    """
+    
+    _shared = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="tts-loop", daemon=True)
+        self.thread.start()
+        self._ready.wait()
+    
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self._ready.set)
+        self.loop.run_forever()
+    
+    @classmethod
+    def shared(cls) -> "TTSLoop":
+        """Process-wide loop, started on first use."""
+        with cls._shared_lock:
+            if cls._shared is None or not cls._shared.thread.is_alive():
+                cls._shared = cls()
+            return cls._shared
+    
+    def submit(self, coro) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the loop.
+        
+        Returns:
+            Future with the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+    
+    def run(self, coro, timeout: Optional[float] = None):
+        """Run a coroutine on the loop and wait for its result."""
+        return self.submit(coro).result(timeout)
+    
+    def stop(self):
+        """Stop the loop thread."""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=2)
+
+
+class _MpvOutput:
+    """mpv decoding an encoded stream (Edge's MP3) from stdin."""
+    
+    def __init__(self, demuxer: str):
+        # the demuxer hint skips mpv's format probing before the first frame
+        mpv_command = ["mpv", "--no-cache", "--no-terminal",
+                    f"--demuxer-lavf-format={demuxer}", "--demuxer-lavf-probesize=1024", "--", "-"]
+        self.process = subprocess.Popen(mpv_command, stdin=subprocess.PIPE)
+    
+    def write(self, data: bytes):
+        self.process.stdin.write(data)
+    
+    def close(self) -> Optional[float]:
+        """
+        Wait for playback to end.
+        
+        Returns:
+            CPU seconds mpv spent (decoding + output), None if the OS can't tell
+        """
+        if self.process.stdin:
+            self.process.stdin.close()
+        if not hasattr(os, "wait4"):  # Windows
+            self.process.wait()
+            return None
+        _, status, usage = os.wait4(self.process.pid, 0)
+        self.process.returncode = os.waitstatus_to_exitcode(status)
+        return usage.ru_utime + usage.ru_stime
+
+
+class _PcmOutput:
+    """16-bit mono PCM written straight to the output device."""
+    
+    def __init__(self, pa: "pyaudio.PyAudio", rate: int):
+        self.stream = pa.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=rate,
+            output=True
+        )
+        self._carry = b""
+    
+    def write(self, data: bytes):
+        data = self._carry + data
+        cut = len(data) - len(data) % 2  # keep whole samples
+        self._carry = data[cut:]
+        self.stream.write(data[:cut])
+    
+    def close(self) -> float:
+        self.stream.stop_stream()
+        self.stream.close()
+        return 0.0  # nothing was decoded
+
+
+class _SinkOutput:
+    """Hands the encoded bytes to a callback, e.g. a remote client connection."""
+    
+    def __init__(self, sink: Callable[[bytes], None]):
+        self.sink = sink
+    
+    def write(self, data: bytes):
+        self.sink(data)
+    
+    def close(self) -> None:
+        return None  # decoded by the receiver
+
+
+class FirstByteTimeout(Exception):
+    """Edge TTS sent no audio within the first-byte deadline."""
+
+
+class TTSBackend(abc.ABC):
+    """
+    Common interface of all speech synthesizers.
+    A backend only has to implement speak_spans(); plain, mixed-language
+    and structured replies are all turned into (language, text) spans here.
+    """
+    
+    name = "tts"
+    
+    def __init__(
+        self,
+        voice: str,
+        voices: Optional[Dict[str, str]] = None,  # language -> voice
+        voice_switching: bool = False,
+        min_span_words: int = 1,
+        replay=None,
+    ):
+        """
+        Args:
+            voice: Default voice
+            voices: Voice per language code, e.g. {"de": ..., "en": ...}
+            voice_switching: Speak each language span of a reply in its own voice
+            min_span_words: Shorter language spans stay in the surrounding voice
+            replay: replay.ReplayBuffer that keeps the played audio ("slower please")
+        """
+        self.voice = voice
+        self.voices = voices or {}
+        self.voice_switching = voice_switching
+        self.min_span_words = min_span_words
+        self.replay = replay
+        self.console = Console()
+    
+    def voice_for(self, lang: Optional[str]) -> str:
+        """Voice for a language code (None -> default voice)."""
+        return self.voices.get(lang, self.voice) if lang else self.voice
+    
+    def has_voice(self, lang: Optional[str]) -> bool:
+        """True if the language has its own voice."""
+        return lang in self.voices
+    
+    def follow_language(self, lang: Optional[str]):
+        """Make a language's voice the default, e.g. Whisper's detected language."""
+        if lang and self.has_voice(lang):
+            self.voice = self.voice_for(lang)
+    
+    @abc.abstractmethod
+    def speak_spans(self, spans: List[Tuple[Optional[str], str]]):
+        """
+        Speak (language, text) spans in order.
+        
+        Args:
+            spans: List of (language code or None, text) in reading order
+        """
+    
+    def speak(self, text: str):
+        """Speak plain text in the default voice."""
+        if text:
+            self.speak_spans([(None, text)])
+    
+    def speak_mixed(self, text: str):
+        """
+        Speak a mixed-language reply, each language span in its own voice.
+        
+        Args:
+            text: Reply to speak (raw markdown keeps the most language hints)
+        """
+        if self.voice_switching:
+            spans = self.language_spans(text)
+        else:
+            spans = [(None, to_speech_text(text))]
+        self.speak_spans([span for span in spans if span[1]])
+    
+    def speak_structured(self, reply):
+        """
+        Speak a structured LLM reply (response_formatter.StructuredReply).
+        The corrected sentence is played first in the German voice while
+        the explanation is still being synthesized.
+        
+        Args:
+            reply: StructuredReply with plain-text fields
+        """
+        first, rest = reply.speech_parts()
+        spans = [("de", first)] if first else []
+        if rest:
+            spans += self.language_spans(rest) if self.voice_switching else [(None, rest)]
+        self.speak_spans(spans)
+    
+    def language_spans(self, text: str) -> List[Tuple[Optional[str], str]]:
+        """
+        Split text (markdown or plain) into language spans.
+        
+        Args:
+            text: Reply to speak
+            
+        Returns:
+            List of (language, text) in reading order, consecutive
+            segments of the same language merged
+        """
+        segments = compile_speech(text)
+        
+        # unmarked segments ("Since", "(simple past)") belong to the reply's main language
+        words = {}
+        for seg in segments:
+            if self.has_voice(seg.lang):
+                words[seg.lang] = words.get(seg.lang, 0) + len(seg.text.split())
+        default_lang = next((lang for lang, v in self.voices.items() if v == self.voice), None)
+        main_lang = max(words, key=words.get) if words else default_lang
+        
+        grouped = []  # (lang, [segments])
+        for seg in segments:
+            lang = seg.lang
+            if not any(c.isalnum() for c in seg.text):
+                lang = grouped[-1][0] if grouped else main_lang  # punctuation only
+            elif not self.has_voice(lang) or len(seg.text.split()) < self.min_span_words:
+                lang = main_lang
+            if grouped and grouped[-1][0] == lang:
+                grouped[-1][1].append(seg)
+            else:
+                grouped.append((lang, [seg]))
+        
+        return [(lang, render(segs).lstrip(",;: ")) for lang, segs in grouped]
+
+
+class EdgeTTS(TTSBackend):
     """
     Text-to-Speech using Microsoft Edge TTS.
     Free, fast, and high quality.
     """
     
+    name = "edge"
+    
     def __init__(
         self,
         voice: str = "de-DE-KatjaNeural",  # German female voice
         rate: str = "+0%",  # Speaking rate
         pitch: str = "+7Hz",  # Pitch adjustment
+        voices: Optional[Dict[str, str]] = None,  # language -> voice
+        voice_switching: bool = False,
+        min_span_words: int = 1,
+        max_concurrency: int = 4,
+        fallback: Optional[TTSBackend] = None,
+        first_byte_deadline: Optional[float] = None,
+        sink: Optional[Callable[[bytes], None]] = None,
+        catalog=None,
+        gender: Optional[str] = None,
+        replay=None,
     ):
         """
         Initialize Edge TTS.
@@ -36,88 +299,218 @@ class EdgeTTS:
                 - "de-CH-LeniNeural" (Swiss female)
             rate: Speaking rate adjustment (e.g., "+10%" faster, "-10%" slower)
             pitch: Pitch adjustment (e.g., "+5Hz" higher, "-5Hz" lower)
+            voices: Voice per language code, e.g. {"de": "de-DE-KatjaNeural", "en": "en-US-JennyNeural"}
+            voice_switching: Speak each language span of a reply in its own voice
+            min_span_words: Shorter language spans stay in the surrounding voice
+            max_concurrency: Max spans synthesized at the same time
+            fallback: Backend that speaks the reply when Edge fails (e.g. LocalTTS)
+            first_byte_deadline: Seconds to wait for the first audio chunk
+                                before giving up on Edge (None -> wait)
+            sink: Receives the MP3 bytes instead of local playback (forwarding to a remote client)
+            catalog: voice_catalog.VoiceCatalog, picks voices for languages missing in `voices`
+            gender: Preferred gender of catalog voices ("Female" or "Male")
+            replay: replay.ReplayBuffer that keeps the played audio ("slower please")
         """
-        self.voice = voice
+        super().__init__(voice, voices, voice_switching, min_span_words, replay)
         self.rate = rate
         self.pitch = pitch
-        self.console = Console()
+        self.max_concurrency = max_concurrency
+        self.fallback = fallback
+        self.first_byte_deadline = first_byte_deadline
+        self.sink = sink
+        self.catalog = catalog
+        self.gender = gender
+        self._loop = TTSLoop.shared()
     
-    async def _stream_speak(self, text: str):
-        """
-        Streams audio directly to mpv without saving a file.
-        """
-        communicate = edge_tts.Communicate(
+    def voice_for(self, lang: Optional[str]) -> str:
+        """Voice for a language code, looked up in the catalog if not configured."""
+        if lang and lang not in self.voices and self.catalog is not None:
+            voice = self.catalog.resolve(lang, self.gender)
+            if voice:
+                self.voices[lang] = voice  # remember, the next reply skips the lookup
+        return super().voice_for(lang)
+    
+    def has_voice(self, lang: Optional[str]) -> bool:
+        """True if the language has its own voice (configured or from the catalog)."""
+        if lang is None:
+            return False
+        self.voice_for(lang)
+        return lang in self.voices
+    
+    def _communicate(self, text: str, voice: str) -> "edge_tts.Communicate":
+        """edge_tts.Communicate (edge-tts always streams MP3, 24kHz mono)."""
+        return edge_tts.Communicate(
             text=text,
-            voice=self.voice,
+            voice=voice,
             rate=self.rate,
             pitch=self.pitch
         )
-
-        # Open mpv process to receive audio data via stdin
-        # '--no-cache' and '--untied-lirc-interface' help with instant playback
-        mpv_command = ["mpv", "--no-cache", "--no-terminal", "--", "-"]
-        process = subprocess.Popen(mpv_command, stdin=subprocess.PIPE)
-
+    
+    def _open_output(self):
+        """Local playback through mpv, or forwarding to the sink."""
+        if self.sink is not None:
+            return _SinkOutput(self.sink)
+        return _MpvOutput("mp3")
+    
+    async def _stream_speak(self, text: str, voice: Optional[str] = None):
+        """
+        Streams audio directly to the output without saving a file.
+        
+        Args:
+            text: Text to speak
+            voice: Voice override (defaults to self.voice)
+        """
+        await self._stream_spans([(voice or self.voice, text)])
+    
+    async def _stream_spans(self, spans: List[Tuple[str, str]]):
+        """
+        Synthesizes all (voice, text) spans concurrently and streams them
+        in order into ONE mpv process, so playback is seamless.
+        
+        Args:
+            spans: List of (voice, text) in reading order
+            
+        Raises:
+            FirstByteTimeout: No audio within first_byte_deadline
+            Exception: Synthesis failed before any audio was played
+        """
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        queues = [asyncio.Queue() for _ in spans]
+        limit = asyncio.Semaphore(self.max_concurrency)
+        
+        async def produce(queue: asyncio.Queue, voice: str, text: str):
+            try:
+                async with limit:
+                    communicate = self._communicate(text, voice)
+                    async for chunk in communicate.stream():
+                        if chunk["type"] == "audio":
+                            queue.put_nowait(chunk["data"])
+            finally:
+                queue.put_nowait(None)  # end of span
+        
+        tasks = [
+            asyncio.create_task(produce(queue, voice, text))
+            for queue, (voice, text) in zip(queues, spans)
+        ]
+        
+        output = None
+        captured = [] if self.replay is not None else None
+        n_bytes = 0
+        first_byte = None
+        decode_cpu = None
         try:
-            async for chunk in communicate.stream():
-                if chunk["type"] == "audio":
-                    process.stdin.write(chunk["data"])
+            output = self._open_output()  # mpv / PyAudio missing -> the tasks are still cancelled
+            # play span i while spans i+1.. are still being synthesized
+            for queue in queues:
+                while True:
+                    if start is not None and self.first_byte_deadline:
+                        # one deadline for the whole reply, not per chunk
+                        remaining = self.first_byte_deadline - (time.perf_counter() - start)
+                        try:
+                            data = await asyncio.wait_for(queue.get(), max(remaining, 0.0))
+                        except asyncio.TimeoutError:
+                            raise FirstByteTimeout(
+                                f"no audio from Edge within {self.first_byte_deadline}s") from None
+                    else:
+                        data = await queue.get()
+                    if data is None:
+                        break
+                    if start is not None:
+                        first_byte = time.perf_counter() - start
+                        metrics.observe("tts.first_byte", first_byte)
+                        start = None
+                    n_bytes += len(data)
+                    if captured is not None:
+                        captured.append(data)
+                    await loop.run_in_executor(None, output.write, data)
         finally:
-            if process.stdin:
-                process.stdin.close()
-            process.wait()
-
-    def speak(self, text: str):
+            for task in tasks:
+                task.cancel()
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            # wait off the loop so concurrent synthesis tasks keep running
+            if output is not None:
+                decode_cpu = await loop.run_in_executor(None, output.close)
+        
+        self._record(n_bytes, first_byte, decode_cpu)
+        if captured:
+            text = " ".join(text for _, text in spans)
+            self.replay.add_encoded(b"".join(captured), text=text)
+        
+        errors = [(voice, r) for r, (voice, _) in zip(results, spans) if isinstance(r, Exception)]
+        if errors and start is not None:
+            raise errors[0][1]  # nothing was played -> let the caller fall back
+        # a failed span is skipped, not fatal
+        for voice, error in errors:
+            self.console.print(f"[yellow]Span in {voice} failed: {error}[/]")
+    
+    def _record(self, n_bytes: int, first_byte: Optional[float], decode_cpu: Optional[float]):
+        """Report transfer size and local decode cost of one reply."""
+        metrics.observe("tts.bytes", n_bytes)
+        if decode_cpu is not None:
+            metrics.observe("tts.decode_cpu", decode_cpu)
+        metrics.event("tts_reply", bytes=n_bytes,
+                    first_byte_ms=round(first_byte * 1000) if first_byte is not None else None,
+                    decode_ms=round(decode_cpu * 1000) if decode_cpu is not None else None)
+    
+    def speak_spans(self, spans: List[Tuple[Optional[str], str]]):
         """
-        Synthesize and play audio immediately.
-        Tries direct streaming with mpv first, falls back to temp file method.
+        Speak (language, text) spans, each in its language's voice.
+        Falls back to the offline backend if Edge fails or is too slow.
+        
+        Args:
+            spans: List of (language code or None, text) in reading order
         """
-        if not text:
+        if not spans:
             return
         
+        voiced = [(self.voice_for(lang), text) for lang, text in spans]
         with self.console.status("[bold green]🔊 Speaking...[/]", spinner="material"):
-            # First try direct streaming with mpv
-            try:
-                asyncio.run(self._stream_speak(text))
-                return  # Success, exit function
-            except Exception as e:
-                self.console.print(f"[yellow]Streaming failed: {e}. Falling back to temp file method...[/]")
-            
-            # Fallback: use temp file method
             try:
-                with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp:
-                    tmp.write(audio_data)
-                    tmp_path = tmp.name
-                
-                # Play audio
-                audio = AudioSegment.from_mp3(tmp_path)
-                play(audio)
-                
-                # Cleanup
-                os.unlink(tmp_path)
+                self._loop.run(self._stream_spans(voiced))
+                return
             except Exception as e:
-                self.console.print(f"[red]Playback error: {e}[/]")
+                error = e
+        # outside the spinner: the fallback shows its own
+        self._fall_back(error, spans)
+    
+    def _fall_back(self, error: Exception, spans: List[Tuple[Optional[str], str]]):
+        """Speak spans with the fallback backend after an Edge failure."""
+        metrics.incr("tts.fallback")
+        metrics.event("tts_fallback", reason=type(error).__name__,
+                    backend=self.fallback.name if self.fallback else None)
+        if self.fallback is None:
+            self.console.print(f"[red]Playback error: {error}[/]")
+            return
+        
+        self.console.print(f"[yellow]Edge TTS failed ({error}). Speaking with {self.fallback.name}...[/]")
+        self.fallback.speak_spans(spans)
+
+    def speak_async(self, text: str) -> concurrent.futures.Future:
+        """
+        Queue text for playback without blocking the caller.
+        
+        Returns:
+            Future that resolves when playback has finished
+        """
+        return self._loop.submit(self._stream_speak(text))
     
     # ======================================== #
     #    [OPTIONAL] PLAY FROM TEMP FILE        #
     # ======================================== #
-    async def _synthesize(self, text: str) -> Optional[bytes]:
+    async def _synthesize(self, text: str, voice: Optional[str] = None) -> Optional[bytes]:
         """
         Synthesize text to audio bytes (async).
         
         Args:
             text: Text to synthesize
+            voice: Voice override (defaults to self.voice)
             
         Returns:
-            Audio data as bytes (MP3 format)
+            Audio data as bytes (MP3)
         """
         try:
-            communicate = edge_tts.Communicate(
-                text=text,
-                voice=self.voice,
-                rate=self.rate,
-                pitch=self.pitch
-            )
+            communicate = self._communicate(text, voice or self.voice)
             
             # Collect audio chunks
             audio_data = b""
@@ -139,35 +532,199 @@ class EdgeTTS:
             text: Text to synthesize
             
         Returns:
-            Audio data as bytes (MP3 format)
+            Audio data as bytes (MP3)
         """
-        return asyncio.run(self._synthesize(text))
+        return self._loop.run(self._synthesize(text))
+    
+    def synthesize_async(self, text: str, voice: Optional[str] = None) -> concurrent.futures.Future:
+        """
+        Submit text for synthesis without blocking.
+        Several submissions are synthesized concurrently on the shared loop.
+        
+        Returns:
+            Future with the audio bytes (MP3) or None
+        """
+        return self._loop.submit(self._synthesize(text, voice=voice))
     
     # ======================================== #
     #    [OPTIONAL] VOICES LISTING FUNCTION    #
     # ======================================== #
-    def _list_voices():
+    def list_voices(self, language: str = "de") -> List[Dict[str, str]]:
         """
-        List all available voices (async).
+        List available voices for a language.
         Useful for finding voice IDs.
-        """
-        async def _list():
-            voices = await edge_tts.VoicesManager.create()
-            voices_list = voices.voices
+        
+        Args:
+            language: Language code, e.g. "de"
             
-            # Filter German voices
-            german_voices = [
-                v for v in voices_list 
-                if v["Locale"].startswith("de-")
+        Returns:
+            Voice dicts (ShortName, Gender, Locale, ...)
+        """
+        if self.catalog is not None and self.catalog.voices:
+            voices = self.catalog.find(language=language)
+        else:
+            voices = [
+                v for v in self._loop.run(edge_tts.list_voices())
+                if v["Locale"].split("-")[0] == language
             ]
+        
+        print(f"\n=== Available '{language}' Voices ===")
+        for v in voices:
+            print(f"  {v['ShortName']} - {v['Gender']} ({v['Locale']})")
+        
+        return voices
+
+
+class LocalTTS(TTSBackend):
+    """
+    Offline Text-to-Speech on the CPU.
+    Runs Piper (ONNX neural voices) or espeak-ng and streams the raw
+    PCM straight to the output device, no network and no temp files.
+    """
+    
+    ENGINES = ("espeak-ng", "piper")
+    
+    def __init__(
+        self,
+        engine: str = "espeak-ng",
+        voice: str = "de",
+        voices: Optional[Dict[str, str]] = None,  # language -> voice
+        voice_switching: bool = False,
+        min_span_words: int = 1,
+        speed: float = 1.0,
+        sample_rate: int = 22050,
+        executable: Optional[str] = None,
+        replay=None,
+    ):
+        """
+        Initialize local TTS.
+        
+        Args:
+            engine: "espeak-ng" (robotic, tiny, always available) or "piper" (neural)
+            voice: espeak-ng voice name ("de", "en-us") or path to a Piper .onnx model
+            voices: Voice per language code, e.g. {"de": "de", "en": "en-us"}
+            voice_switching: Speak each language span of a reply in its own voice
+            min_span_words: Shorter language spans stay in the surrounding voice
+            speed: Speaking rate factor (1.0 -> engine default)
+            sample_rate: Piper output rate, used if the model has no .onnx.json config
+            executable: Engine binary (defaults to the engine name on PATH)
+            replay: replay.ReplayBuffer that keeps the played audio ("slower please")
+        """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown TTS engine '{engine}', expected one of {list(self.ENGINES)}")
+        
+        super().__init__(voice, voices, voice_switching, min_span_words, replay)
+        self.engine = engine
+        self.name = engine
+        self.speed = speed
+        self.sample_rate = sample_rate
+        self.executable = executable or engine
+        self._pa = None  # opened on first playback (not at all if the engine is missing)
+    
+    def available(self) -> bool:
+        """True if the engine binary is installed."""
+        return shutil.which(self.executable) is not None
+    
+    def _command(self, voice: str) -> List[str]:
+        """Engine command line reading text on stdin and writing audio to stdout."""
+        if self.engine == "piper":
+            return [self.executable, "--model", voice, "--output-raw",
+                    "--length_scale", f"{1 / self.speed:.2f}"]
+        return [self.executable, "-v", voice, "-s", str(int(175 * self.speed)), "--stdin", "--stdout"]
+    
+    def _piper_sample_rate(self, model: str) -> int:
+        """Sample rate from the Piper model config (<model>.onnx.json)."""
+        try:
+            with open(model + ".json", "r", encoding="utf-8") as f:
+                return json.load(f)["audio"]["sample_rate"]
+        except (OSError, KeyError, ValueError):
+            return self.sample_rate
+    
+    def _stream_pcm(self, text: str, voice: str, capture: Optional[List[bytes]] = None) -> int:
+        """
+        Synthesize text and play the 16-bit mono PCM while it is produced.
+        
+        Args:
+            text: Text to speak
+            voice: Engine voice (name or model path)
+            capture: Collects the played PCM (for replay)
             
-            print("\n=== Available German Voices ===")
-            for v in german_voices:
-                print(f"  {v['ShortName']} - {v['Gender']} ({v['Locale']})")
+        Returns:
+            Sample rate of the audio
+        """
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            self._command(voice),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        process.stdin.write(text.replace("\n", " ").encode("utf-8") + b"\n")
+        process.stdin.close()
+        
+        output = None
+        try:
+            if self.engine == "piper":
+                rate = self._piper_sample_rate(voice)
+            else:
+                # espeak-ng writes a WAV header first, the rate is at byte 24
+                header = process.stdout.read(44)
+                if len(header) < 44:
+                    raise RuntimeError(f"{self.engine} produced no audio (voice '{voice}')")
+                rate = int.from_bytes(header[24:28], "little")
             
-            return german_voices
+            if self._pa is None:
+                self._pa = pyaudio.PyAudio()
+            output = _PcmOutput(self._pa, rate)
+            while True:
+                data = process.stdout.read1(4096)  # whatever is ready, don't wait for a full block
+                if not data:
+                    break
+                if start is not None:
+                    metrics.observe("tts.local.first_byte", time.perf_counter() - start)
+                    start = None
+                if capture is not None:
+                    capture.append(data)
+                output.write(data)
+        finally:
+            if output is not None:
+                output.close()
+            process.stdout.close()
+            process.wait()
+        return rate
+    
+    def speak_spans(self, spans: List[Tuple[Optional[str], str]]):
+        """
+        Speak (language, text) spans one after another.
         
-        return asyncio.run(_list())
+        Args:
+            spans: List of (language code or None, text) in reading order
+        """
+        if not spans:
+            return
+        
+        with self.console.status(f"[bold green]🔊 Speaking ({self.engine})...[/]", spinner="material"):
+            parts = []
+            try:
+                for lang, text in spans:
+                    capture = [] if self.replay is not None else None
+                    rate = self._stream_pcm(text, self.voice_for(lang), capture)
+                    if capture:
+                        parts.append((b"".join(capture), rate))
+            except Exception as e:
+                self.console.print(f"[red]Playback error: {e}[/]")
+            if parts:
+                self.replay.add_pcm(parts, " ".join(text for _, text in spans))
+    
+    def cleanup(self):
+        """Release PyAudio resources."""
+        if self._pa is None:
+            return
+        try:
+            self._pa.terminate()
+        except Exception:
+            pass
+        self._pa = None
 
 
 # ======================================================================== #
@@ -208,4 +765,8 @@ if __name__ == "__main__":
     
     
     # # list all voices
-    # EdgeTTS.list_voices()
\ No newline at end of file
+    # tts.list_voices("de")    
+    
+    # # offline voice (espeak-ng or a Piper model)
+    # local = LocalTTS(engine="espeak-ng", voice="de", voices={"de": "de", "en": "en-us"}, voice_switching=True)
+    # local.speak_mixed("Quick fix → **Ich bin ins Kino gegangen**. Motion verbs take *sein*.")
@@ -0,0 +1,212 @@
+"""
+Edge TTS voice catalog
+Fetched once, cached on disk and refreshed in the background,
+indexed by locale, language and gender for automatic voice selection
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+import edge_tts
+from rich.console import Console
+from .tts import TTSLoop
+
+
+# Locale picked first when only a language is asked for
+DEFAULT_LOCALES = {
+    "de": "de-DE",
+    "en": "en-US",
+    "fr": "fr-FR",
+    "es": "es-ES",
+    "it": "it-IT",
+    "pt": "pt-BR",
+}
+
+# Keys kept from the Edge voice list (the rest is never used)
+_FIELDS = ("ShortName", "Locale", "Gender", "FriendlyName")
+
+
+class VoiceCatalog:
+    """
+    Disk-cached list of Edge voices.
+    Loading never waits on the network: a missing or stale cache
+    is refreshed in a background thread while lookups use what is there.
+    """
+
+    def __init__(self,
+                cache_path: str = "cache/edge_voices.json",
+                refresh_days: float = 7):
+        """
+        Initialize voice catalog.
+
+        Args:
+            cache_path: JSON file the voice list is stored in
+            refresh_days: Age after which the cache is fetched again
+        """
+        self.cache_path = Path(cache_path)
+        self.refresh_days = refresh_days
+        self.console = Console()
+        self.voices: List[Dict[str, str]] = []
+        self.by_locale: Dict[str, List[Dict[str, str]]] = {}
+        self.by_language: Dict[str, List[Dict[str, str]]] = {}
+        self._lock = threading.Lock()
+        self._refreshing = None  # background refresh thread
+
+    # ======================================== #
+    #    LOADING / CACHING                     #
+    # ======================================== #
+    def load(self, background: bool = True) -> "VoiceCatalog":
+        """
+        Load the cached voice list, refreshing it if missing or stale.
+
+        Args:
+            background: Refresh in a daemon thread (False -> block until fetched)
+
+        Returns:
+            self, for chaining
+        """
+        if self.cache_path.exists():
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    self._index(json.load(f)["voices"])
+            except (OSError, KeyError, ValueError) as e:
+                self.console.print(f"[yellow]Voice cache unreadable ({e}), fetching again[/]")
+
+        if self.is_stale():
+            if background:
+                self.refresh_async()
+            else:
+                self.refresh()
+        return self
+
+    def is_stale(self) -> bool:
+        """True if the cache is missing or older than refresh_days."""
+        if not self.voices or not self.cache_path.exists():
+            return True
+        age = time.time() - self.cache_path.stat().st_mtime
+        return age > self.refresh_days * 86400
+
+    def refresh(self) -> bool:
+        """
+        Fetch the voice list from Edge and write the cache.
+
+        Returns:
+            True if the list was fetched (on failure the old list is kept)
+        """
+        try:
+            voices = TTSLoop.shared().run(edge_tts.list_voices(), timeout=30)
+        except Exception as e:
+            self.console.print(f"[yellow]Voice list fetch failed: {e}[/]")
+            return False
+
+        voices = [{k: v[k] for k in _FIELDS if k in v} for v in voices]
+        self._index(voices)
+
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"fetched": time.time(), "voices": voices}, f, ensure_ascii=False, indent=1)
+            os.replace(tmp, self.cache_path)  # readers never see a half-written file
+        except OSError as e:
+            # the fresh list is already in use, it just isn't cached for the next start
+            self.console.print(f"[yellow]Voice cache write failed: {e}[/]")
+        return True
+
+    def refresh_async(self) -> threading.Thread:
+        """Refresh in a daemon thread (at most one at a time)."""
+        if self._refreshing is None or not self._refreshing.is_alive():
+            self._refreshing = threading.Thread(target=self.refresh, name="voice-catalog", daemon=True)
+            self._refreshing.start()
+        return self._refreshing
+
+    def _index(self, voices: List[Dict[str, str]]):
+        """Build the locale and language indexes (swapped in atomically)."""
+        by_locale: Dict[str, List[Dict[str, str]]] = {}
+        by_language: Dict[str, List[Dict[str, str]]] = {}
+        for v in voices:
+            by_locale.setdefault(v["Locale"], []).append(v)
+            by_language.setdefault(v["Locale"].split("-")[0], []).append(v)
+
+        with self._lock:
+            self.voices = voices
+            self.by_locale = by_locale
+            self.by_language = by_language
+
+    # ======================================== #
+    #    LOOKUP                                #
+    # ======================================== #
+    def find(self,
+            language: Optional[str] = None,
+            locale: Optional[str] = None,
+            gender: Optional[str] = None) -> List[Dict[str, str]]:
+        """
+        Voices matching all given attributes.
+
+        Args:
+            language: Language code, e.g. "de"
+            locale: Locale, e.g. "de-AT"
+            gender: "Female" or "Male" (case-insensitive)
+
+        Returns:
+            List of voice dicts (ShortName, Locale, Gender, FriendlyName)
+        """
+        with self._lock:
+            if locale:
+                found = self.by_locale.get(locale, [])
+            elif language:
+                found = self.by_language.get(language.lower(), [])
+            else:
+                found = self.voices
+        if gender:
+            found = [v for v in found if v["Gender"].lower() == gender.lower()]
+        return found
+
+    def resolve(self,
+                language: str,
+                gender: Optional[str] = None,
+                locale: Optional[str] = None) -> Optional[str]:
+        """
+        Pick one voice for a language, e.g. resolve("de", "Female").
+        Prefers the language's main locale (de-DE over de-CH) and
+        falls back to any gender if none matches.
+
+        Args:
+            language: Language code, e.g. "de" (Whisper's detected language)
+            gender: "Female" or "Male"
+            locale: Preferred locale (defaults to DEFAULT_LOCALES)
+
+        Returns:
+            Voice ShortName, or None if the catalog has no voice for the language
+        """
+        locale = locale or DEFAULT_LOCALES.get(language)
+        for g in (gender, None) if gender else (None,):
+            if locale:
+                found = self.find(locale=locale, gender=g)
+                if found:
+                    return found[0]["ShortName"]
+            found = self.find(language=language, gender=g)
+            if found:
+                return found[0]["ShortName"]
+        return None
+
+
+# ======================================================================== #
+#                              TESTING                                     #
+# ======================================================================== #
+
+if __name__ == "__main__":
+    catalog = VoiceCatalog().load(background=False)
+
+    print(f"\n{len(catalog.voices)} voices, {len(catalog.by_locale)} locales")
+    print("\n=== Available German Voices ===")
+    for v in catalog.find(language="de"):
+        print(f"  {v['ShortName']} - {v['Gender']} ({v['Locale']})")
+
+    print()
+    print("German female:", catalog.resolve("de", "Female"))
+    print("English male: ", catalog.resolve("en", "Male"))
+    print("Austrian:     ", catalog.resolve("de", locale="de-AT"))
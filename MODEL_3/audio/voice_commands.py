@@ -0,0 +1,248 @@
+"""
+Local voice commands
+Session control ("tschüss", "repeat", "langsamer", "translate that", "switch to English")
+recognized in microseconds, without an LLM round trip
+"""
+
+import re
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from rapidfuzz.distance import Levenshtein
+from .end_phrase import end_phrase_list
+from ..metrics import metrics
+
+
+# Commands
+END = "end"
+REPEAT = "repeat"
+SLOWER = "slower"
+TRANSLATE = "translate"
+ENGLISH = "english"
+GERMAN = "german"
+
+# Synonyms per command (end phrases come from end_phrase.py)
+COMMANDS: Dict[str, List[str]] = {
+    REPEAT: [
+        "repeat", "repeat that", "repeat it", "say that again", "say it again",
+        "one more time", "come again",
+        "noch einmal", "nochmal", "noch mal", "wiederholen", "wiederhol das",
+        "wiederhole das", "das wiederholen", "wie bitte",
+    ],
+    SLOWER: [
+        "slower", "more slowly", "slow down", "speak slower", "say it slower",
+        "langsamer", "sprich langsamer", "etwas langsamer", "noch langsamer",
+        "langsamer sprechen", "langsamer wiederholen",
+    ],
+    TRANSLATE: [
+        "translate", "translate that", "translate it", "translate this", "what does that mean",
+        "übersetzen", "übersetz das", "übersetze das", "das übersetzen",
+        "was heißt das", "was bedeutet das",
+    ],
+    # language switches need a command frame: a bare "English." or "Deutsch?" is an answer
+    ENGLISH: [
+        "switch to english", "in english", "speak english", "english mode",
+        "auf englisch", "sprich englisch", "wechsel zu englisch", "auf englisch sprechen",
+    ],
+    GERMAN: [
+        "switch to german", "in german", "speak german", "german mode",
+        "auf deutsch", "sprich deutsch", "wechsel zu deutsch", "auf deutsch sprechen",
+    ],
+}
+
+# Language a switch command selects
+COMMAND_LANGUAGE = {ENGLISH: "en", GERMAN: "de"}
+
+# When one utterance contains several commands, the first of these wins
+# ("say it again slower" -> slower)
+PRIORITY = (END, SLOWER, TRANSLATE, ENGLISH, GERMAN, REPEAT)
+
+_FOLD = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss", "’": "'"})
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+def _tokens(text: str) -> List[str]:
+    """Lowercase, umlaut-folded words ("Tschüß!" -> ["tschuess"])."""
+    return _TOKEN_RE.findall(text.lower().translate(_FOLD))
+
+
+# Politeness / filler words allowed around a command
+FILLERS = frozenset(_tokens(
+    "please bitte okay ok hey hi so now jetzt mal doch und and um uh äh ähm"
+))
+
+# Request frames allowed before a command ("Kannst du das wiederholen?"),
+# only at the start: "kannst du" + a bare word is a question, not a command
+REQUEST_FRAMES = [_tokens(frame) for frame in (
+    "can you", "could you", "would you", "kannst du", "könntest du", "können sie", "könnten sie",
+)]
+
+# Never fuzzy-matched: "Germany" / "In Germany." are answers, not switches
+NO_FUZZY = {ENGLISH, GERMAN}
+
+
+class _TokenTrie:
+    """
+    Aho-Corasick automaton over words.
+    Finds every phrase occurrence in one left-to-right pass.
+    """
+
+    def __init__(self):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[Tuple[int, str]]] = [[]]  # (phrase length, command)
+
+    def add(self, words: List[str], command: str):
+        node = 0
+        for w in words:
+            if w not in self.goto[node]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+                self.goto[node][w] = len(self.goto) - 1
+            node = self.goto[node][w]
+        self.out[node].append((len(words), command))
+
+    def build(self):
+        """Compute failure links (breadth-first)."""
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for w, child in self.goto[node].items():
+                f = self.fail[node]
+                while f and w not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[child] = self.goto[f].get(w, 0) if node else 0
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+                queue.append(child)
+
+    def find(self, words: List[str]) -> List[Tuple[int, int, str]]:
+        """All occurrences as (start, end, command)."""
+        found = []
+        node = 0
+        for i, w in enumerate(words):
+            while node and w not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(w, 0)
+            for n, command in self.out[node]:
+                found.append((i + 1 - n, i + 1, command))
+        return found
+
+
+class CommandRouter:
+    """
+    Recognizes session-control commands in a transcript.
+    A command only counts if it (plus filler words) is the WHOLE utterance,
+    so "stop" or "langsamer" inside a normal sentence is left to the tutor.
+    """
+
+    def __init__(self,
+                wake_word: str = "jarvis",
+                max_fuzzy_words: int = 4):
+        """
+        Initialize command router.
+
+        Args:
+            wake_word: Wake word (allowed as a filler, part of some end phrases)
+            max_fuzzy_words: Longest utterance checked with fuzzy matching
+        """
+        self.max_fuzzy_words = max_fuzzy_words
+        self.fillers = FILLERS | set(_tokens(wake_word))
+
+        phrases = {**COMMANDS, END: end_phrase_list(wake_word)}
+        self.trie = _TokenTrie()
+        self.by_length: Dict[int, List[Tuple[str, str]]] = {}  # fuzzy candidates
+        for command, synonyms in phrases.items():
+            for phrase in synonyms:
+                words = _tokens(phrase)
+                self.trie.add(words, command)
+                # fuzzy for multi-word phrases only: one-word answers are too easy to hit
+                if len(words) > 1 and command not in NO_FUZZY:
+                    key = " ".join(words)
+                    self.by_length.setdefault(len(key), []).append((key, command))
+        self.trie.build()
+
+    def match(self, transcript: str) -> Optional[str]:
+        """
+        Command in a transcript.
+
+        Args:
+            transcript: STT output
+
+        Returns:
+            Command name (END, REPEAT, SLOWER, ...) or None for normal input
+        """
+        start = time.perf_counter()
+        command = self._match(_tokens(transcript))
+        metrics.observe("commands.match_us", (time.perf_counter() - start) * 1e6)
+        if command:
+            metrics.incr("commands." + command)
+        return command
+
+    def _ignored(self, words: List[str]) -> List[bool]:
+        """Per word: filler, or part of a request frame at the start."""
+        ignored = [w in self.fillers for w in words]
+        begin = next((i for i, w in enumerate(ignored) if not w), len(words))
+        for frame in REQUEST_FRAMES:
+            if words[begin:begin + len(frame)] == frame:
+                for i in range(begin, begin + len(frame)):
+                    ignored[i] = True
+                break
+        return ignored
+
+    def _match(self, words: List[str]) -> Optional[str]:
+        if not words:
+            return None
+        ignored = self._ignored(words)
+
+        # 1. exact: phrases + fillers must cover every word
+        covered = list(ignored)
+        commands = set()
+        for begin, end, command in self.trie.find(words):
+            commands.add(command)
+            for i in range(begin, end):
+                covered[i] = True
+        if commands and all(covered):
+            return next(c for c in PRIORITY if c in commands)
+
+        # 2. fuzzy: short multi-word utterances only, bounded edit distance
+        content = [w for w, skip in zip(words, ignored) if not skip]
+        if len(content) < 2 or len(content) > self.max_fuzzy_words:
+            return None
+        text = " ".join(content)
+        best, best_distance = None, None
+        for length in range(len(text) - 2, len(text) + 3):
+            for phrase, command in self.by_length.get(length, ()):
+                limit = 1 if len(phrase) < 10 else 2
+                distance = Levenshtein.distance(text, phrase, score_cutoff=limit)
+                if distance <= limit and (best_distance is None or distance < best_distance):
+                    best, best_distance = command, distance
+        return best
+
+
+# ======================================================================== #
+#                              TESTING                                     #
+# ======================================================================== #
+
+if __name__ == "__main__":
+    router = CommandRouter(wake_word="jarvis")
+
+    tests = [
+        "Tschüss!", "Tschüs", "Okay bye Jarvis", "Kannst du das bitte wiederholen?",
+        "Langsamer, bitte.", "Say it again, slower", "Translate that, please",
+        "Switch to English.", "Auf Deutsch bitte", "Repeet that",
+        "Schluss für heute", "Beende die Sitzung, bitte", "Stopp Jarvis",
+        # normal input, must stay None
+        "I can't stop thinking about it", "Ich laufe langsamer als du",
+        "At the end of the day", "Ich spreche Deutsch", "shop",
+        "Germany", "Kannst du Deutsch?", "Again.", "English.", "In Germany.", "Langsam.",
+        "Ende.", "Schluss.", "Stopp!", "End.",
+    ]
+    for text in tests:
+        print(f"{text!r:36} -> {router.match(text)}")
+
+    n = 10000
+    start = time.perf_counter()
+    for _ in range(n):
+        router.match("Ich habe gestern ins Kino gegangen")
+    print(f"\n{(time.perf_counter() - start) / n * 1e6:.1f} µs per sentence")
@@ -46,9 +46,13 @@ class WakeWordDetector:
             sensitivities = [sensitivity],
         )
         
-        # setup pyaudio stream for wake work detection
-        # NOTE: we only use this stream for the start hotword
+        # setup pyaudio for wake work detection
+        # NOTE: the stream is only open while waiting for the hotword, so the
+        # session's recorder gets the mic to itself (and no stale audio piles up)
         self._pa = pyaudio.PyAudio()
+        self.stream = None
+    
+    def _open_stream(self):
         self.stream = self._pa.open(
             rate = self.porcupine.sample_rate,
             channels = 1,
@@ -56,6 +60,16 @@ class WakeWordDetector:
             input = True,
             frames_per_buffer = self.porcupine.frame_length,
         )
+    
+    def _close_stream(self):
+        if self.stream is None:
+            return
+        try:
+            self.stream.stop_stream()
+            self.stream.close()
+        except Exception:
+            pass
+        self.stream = None
         
     # ---------------------------------------------------------------- #
     def wait_for_wake_word(self):
@@ -70,6 +84,7 @@ class WakeWordDetector:
             spinner="moon"
         ):
             try:
+                self._open_stream()
                 while True:
                     # Read audio frame
                     pcm_bytes = self.stream.read(
@@ -91,15 +106,14 @@ class WakeWordDetector:
             except KeyboardInterrupt: 
                 self.console.print("[red]Exiting...[/]")
                 return False
+            
+            finally:
+                self._close_stream()
 
     # ---------------------------------------------------------------- #
     def cleanup(self):
         """Release resources."""
-        try:
-            self.stream.stop_stream()
-            self.stream.close()
-        except:
-            pass
+        self._close_stream()
         
         try:
             self._pa.terminate()
@@ -0,0 +1,134 @@
+"""
+Concurrent startup
+Builds the pipeline stages (speech models, TTS, LLM client, ...) in background
+threads while the wake word is already being listened for, and tracks when
+each stage is ready
+"""
+
+import concurrent.futures
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from rich.console import Console
+from .metrics import metrics
+
+
+# Stage states
+STARTING = "starting"
+READY = "ready"
+FAILED = "failed"
+
+
+class Bootstrap:
+    """
+    Runs one build function per stage in parallel.
+    A stage is waited for only where it is first needed.
+
+    Usage:
+        boot = Bootstrap()
+        boot.start("tts", build_tts)
+        ...
+        my_tts = boot.get("tts")  # waits if it is still being built
+    """
+
+    def __init__(self, max_workers: int = 4):
+        """
+        Initialize bootstrap.
+
+        Args:
+            max_workers: Stages built at the same time
+        """
+        self.console = Console()
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bootstrap")
+        self._stages: Dict[str, concurrent.futures.Future] = {}
+        self._seconds: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    def start(self, name: str, build: Callable[[], Any]) -> concurrent.futures.Future:
+        """
+        Build a stage in the background.
+
+        Args:
+            name: Stage name (for get() / ready() and the metrics)
+            build: Returns the stage's object (None is fine for side effects only)
+        """
+        def run():
+            start = time.perf_counter()
+            try:
+                return build()
+            finally:
+                seconds = time.perf_counter() - start
+                with self._lock:
+                    self._seconds[name] = seconds
+                metrics.observe(f"bootstrap.{name}_ms", seconds * 1000)
+
+        future = self._pool.submit(run)
+        with self._lock:
+            self._stages[name] = future
+        future.add_done_callback(lambda f: self._report(name, f))
+        return future
+
+    def _report(self, name: str, future: concurrent.futures.Future):
+        seconds = self._seconds.get(name, 0.0)
+        if future.exception() is not None:
+            self.console.print(f"[red]✗ {name} failed to start: {future.exception()}[/]")
+        else:
+            self.console.print(f"[dim]✓ {name} ready ({seconds:.1f}s)[/]")
+
+    def ready(self, name: str) -> bool:
+        """True once the stage is built (and didn't fail)."""
+        with self._lock:
+            future = self._stages[name]
+        return future.done() and future.exception() is None
+
+    def get(self, name: str, timeout: Optional[float] = None) -> Any:
+        """
+        The stage's object, waiting for it if it is still being built.
+        Raises the build's exception if it failed.
+        """
+        with self._lock:
+            future = self._stages[name]
+        if not future.done():
+            start = time.perf_counter()
+            with self.console.status(f"[bold yellow]Waiting for {name}...[/]", spinner="dots"):
+                future.result(timeout)
+            metrics.observe(f"bootstrap.wait_ms.{name}", (time.perf_counter() - start) * 1000)
+        return future.result()
+
+    def status(self) -> Dict[str, str]:
+        """Stage -> STARTING, READY or FAILED."""
+        with self._lock:
+            stages = dict(self._stages)
+        return {
+            name: STARTING if not f.done() else FAILED if f.exception() is not None else READY
+            for name, f in stages.items()
+        }
+
+    def wait_all(self):
+        """Block until every stage is done; print the total startup time."""
+        with self._lock:
+            futures = list(self._stages.values())
+        concurrent.futures.wait(futures)
+        total = time.perf_counter() - self._start
+        serial = sum(self._seconds.values())
+        metrics.observe("bootstrap.total_ms", total * 1000)
+        self.console.print(f"[dim]All stages ready in {total:.1f}s ({serial:.1f}s if built one after another)[/]")
+
+
+# ======================================================================== #
+#                              TESTING                                     #
+# ======================================================================== #
+
+if __name__ == "__main__":
+    boot = Bootstrap()
+    boot.start("stt", lambda: time.sleep(1.5) or "whisper")
+    boot.start("tts", lambda: time.sleep(0.8) or "edge")
+    boot.start("llm", lambda: time.sleep(0.3) or "groq")
+    boot.start("broken", lambda: 1 / 0)
+
+    print(boot.status())
+    print("llm:", boot.get("llm"))
+    print(boot.status())
+    boot.wait_all()
+    print(boot.status())
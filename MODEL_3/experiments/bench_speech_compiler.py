@@ -0,0 +1,134 @@
+"""
+Benchmark: single-pass speech compiler vs. the old multi-regex _remove_md
+Run from MODEL_3/:  python -m experiments.bench_speech_compiler
+"""
+
+import re
+import timeit
+from LLM import speech_compiler
+
+
+# ========================================= #
+# ======     OLD IMPLEMENTATION     ======= #
+# ========================================= #
+def legacy_remove_md(text: str):
+    """_remove_md as it was before the speech compiler (kept for comparison)."""
+    clean = re.sub(r"#+\s+", "", text)  # Headings
+    clean = re.sub(r"[*_`]{1,2}(.*?)[*_`]{1,2}", r"\1", clean)  # Bold/italic/code
+    clean = re.sub(r"^>\s+", "", clean, flags=re.MULTILINE)  # Blockquotes
+    clean = re.sub(r"\[(.*?)\]\(.*?\)", r"\1", clean)  # Links
+    clean = re.sub(r"!\[.*?\]\(.*?\)", "", clean)  # Images
+    clean = re.sub(r"```.*?```", "", clean, flags=re.DOTALL)  # Code blocks
+    clean = clean.replace("/", " slash ")
+    clean = clean.replace("&", " and ")
+    clean = clean.replace("#", " ")
+    clean = re.sub(r"\s+", " ", clean).strip()
+    clean = re.sub(r"([.!?;])\s+", r"\1  ", clean)
+    clean = re.sub(r",\s+", r", ", clean)
+    return clean
+
+
+# ========================================= #
+# ==========     REPLY CORPUS     ========= #
+# ========================================= #
+# Typical tutor replies: the first two are the samples from experiments/testing_tts.py
+# and response_formatter.py, the rest cover tables, code, links, quotes and symbols
+CORPUS = [
+    '''### Great Effort!
+Your sentence, *Ich habe gestern ins Kino gegangen*, is almost perfect! The only thing to tweak is the verb "gegangen". Since "gehen" (to go) is a motion verb, it uses the verb "sein" (to be) in the perfect tense, not "haben".
+
+So, the corrected sentence would be: *Ich bin gestern ins Kino gegangen*. Think of it like this: when talking about moving from one place to another, German uses "sein" to show that change in location. You're doing fantastic, keep it up!
+Some other ways to say this could be:
+- *Ich ging gestern ins Kino* (using the simple past for a completed action)
+- *Gestern bin ich ins Kino gegangen* (changing the word order for emphasis)
+Keep practicing, and you'll get the hang of these verb patterns in no time!''',
+
+    '''Quick fix → **Ich bin ins Kino gegangen**
+
+'Gehen' is a motion verb, so it takes 'sein' not 'haben' in Perfekt.
+
+**Other ways to say it:**
+- *Ich ging ins Kino* (simple past)
+- *Ich bin gestern ins Kino gegangen* (with time)
+
+Keep it up! 🎯''',
+
+    '''Spot on! **Ich wohne in Berlin** is exactly right.
+
+If you want to sound a bit more natural you could also say:
+1. *Ich lebe in Berlin* – a little more general
+2. *Ich bin in Berlin zu Hause* – "Berlin is my home"
+
+Nice work!''',
+
+    '''German has three articles: **der/die/das** (masculine/feminine/neuter).
+
+- **der** → *der Tisch* (the table)
+- **die** → *die Lampe* (the lamp)
+- **das** → *das Buch* (the book)
+
+> Tip: learn every noun *with* its article, e.g. `der Hund`, not just `Hund`.
+
+A common mistake is guessing from the English word & meaning – gender in German is often arbitrary!''',
+
+    '''Sure! "I love you" in French is **Je t'aime** (pronounced *zhuh tem*).
+
+For something softer you can say *Je t'adore*. In a text message people often just write `jtm`.''',
+
+    '''The capital of Japan is **Tokyo** (東京). It has been the capital since 1869 and the greater Tokyo area has around 37 million people – the largest metro area in the world.''',
+
+    '''Almost! Here's the fix:
+
+```
+Ich fahre mit dem Auto zur Arbeit.
+```
+
+*mit* always takes the **dative**, so *das Auto* → *dem Auto*. See [this table](https://example.com/dativ) for all dative prepositions.''',
+
+    '''## Dativ vs. Akkusativ
+
+- **Akkusativ**: direct object → *Ich sehe den Mann*
+- **Dativ**: indirect object → *Ich gebe dem Mann das Buch*
+
+Prepositions like *mit, bei, nach, von, zu* always use Dativ; *für, durch, gegen, ohne, um* always use Akkusativ. Speed limits are in km/h, by the way 😉''',
+]
+
+# Cases the old function got wrong
+CHECKS = [
+    ("code block", "Here:\n```python\nprint('x')\n```\nDone.", "print"),
+    ("slash alternatives", "Use der/die/das.", "slash"),
+    ("units", "The limit is 50 km/h.", "slash"),
+    ("link", "See [the table](https://example.com/a/b).", "example.com"),
+    ("snake_case", "Call my_function_name now.", "myfunctionname"),
+    ("bare url", "Read more at https://example.com/dativ.", "dativ"),
+]
+
+
+if __name__ == "__main__":
+    n = 2000
+
+    # Speed
+    # ------
+    old = timeit.timeit(lambda: [legacy_remove_md(t) for t in CORPUS], number=n)
+    new = timeit.timeit(lambda: [speech_compiler.to_speech_text(t) for t in CORPUS], number=n)
+    per_reply = 1e6 / (n * len(CORPUS))
+    print("\n=== Speed (per reply) ===")
+    print(f"  legacy _remove_md : {old * per_reply:7.1f} µs")
+    print(f"  speech compiler   : {new * per_reply:7.1f} µs  ({old / new:.2f}x)")
+    spans = timeit.timeit(lambda: [speech_compiler.compile_speech(t) for t in CORPUS], number=n)
+    print(f"  + language spans  : {spans * per_reply:7.1f} µs")
+
+    # Correctness
+    # ------------
+    print("\n=== Correctness (text that must NOT be spoken) ===")
+    for name, text, forbidden in CHECKS:
+        old_ok = forbidden not in legacy_remove_md(text)
+        new_ok = forbidden not in speech_compiler.to_speech_text(text)
+        print(f"  {name:20} legacy: {'ok' if old_ok else 'WRONG':5}  compiler: {'ok' if new_ok else 'WRONG'}")
+
+    # Side-by-side
+    # -------------
+    print("\n=== Side by side ===")
+    for text in CORPUS[:2]:
+        print(f"\n[legacy]   {legacy_remove_md(text)}")
+        print(f"[compiler] {speech_compiler.to_speech_text(text)}")
@@ -0,0 +1,226 @@
+"""
+Benchmark: STT accuracy / latency regressions on the pinned German corpus
+Every utterance (clean, noisy, accented, commands, long) goes through
+AudioRecorder's end-pointing and FasterWhisperSTT.transcribe with the settings
+of config.yaml. WER / CER and decode latency are written as JSON per commit,
+and two result files can be compared (non-zero exit on a regression).
+
+Run from the repo root:
+    python -m MODEL_3.experiments.bench_stt [--direct] [--out results.json]
+    python -m MODEL_3.experiments.bench_stt --compare logs/bench_stt/OLD.json logs/bench_stt/NEW.json
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+import numpy as np
+import yaml
+from MODEL_3.experiments import stt_corpus
+
+
+CONFIG_PATH = Path(__file__).parent.parent / "config.yaml"
+RESULTS_DIR = Path("logs/bench_stt")
+
+# faster_whisper keys that change what the benchmark measures (stored with the results)
+_CONFIG_KEYS = (
+    "model_size", "device", "compute_type", "cpu_threads", "num_workers", "language",
+    "beam_size", "vad_filter", "small_model_size", "kws_max_seconds", "kws_min_logprob",
+    "adaptive_beam", "min_avg_logprob", "max_compression_ratio", "max_no_speech_prob",
+    "noise_filter",
+)
+
+
+class FileStream:
+    """
+    A recording played into AudioRecorder.record() like a microphone:
+    short silence before, enough silence after for the recorder to stop.
+    """
+
+    def __init__(self, audio: np.ndarray, lead_s: float = 0.3, tail_s: float = 2.0, sample_rate: int = 16000):
+        pcm = np.clip(np.round(audio * 32768.0), -32768, 32767).astype(np.int16)
+        silence = lambda s: np.zeros(int(s * sample_rate), np.int16)
+        self.pcm = np.concatenate([silence(lead_s), pcm, silence(tail_s)]).tobytes()
+        self.pos = 0
+
+    def read(self, frames: int, exception_on_overflow: bool = False) -> bytes:
+        chunk = self.pcm[self.pos:self.pos + 2 * frames]
+        self.pos += 2 * frames
+        return chunk.ljust(2 * frames, b"\0")  # past the end: more silence
+
+    def stop_stream(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _git(*args) -> str:
+    try:
+        return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _summary(rows: List[Dict]) -> Dict:
+    """Aggregate WER / CER / latency of some utterances."""
+    scored = [r for r in rows if r["hypothesis"] is not None]
+    pairs = [(r["reference"], r["hypothesis"]) for r in scored]
+    latencies = [r["latency_s"] for r in rows]
+    summary = {
+        "n": len(rows),
+        "wer": stt_corpus.error_rate(pairs),
+        "cer": stt_corpus.error_rate(pairs, stt_corpus.char_errors),
+        "latency_p50": float(np.percentile(latencies, 50)),
+        "latency_p95": float(np.percentile(latencies, 95)),
+        "rtf": sum(latencies) / sum(r["audio_s"] for r in rows),
+    }
+    commands = [r for r in rows if "command_ok" in r]
+    if commands:
+        summary["command_accuracy"] = sum(r["command_ok"] for r in commands) / len(commands)
+    return summary
+
+
+def run(config: Dict, direct: bool = False) -> Dict:
+    """Transcribe the corpus and score it."""
+    from MODEL_3.audio.noise_filter import NoiseFilter
+    from MODEL_3.audio.stt import FasterWhisperSTT
+    from MODEL_3.audio.voice_commands import END
+
+    corpus = stt_corpus.load()
+    noise = config["noise_filter"]
+    stt = FasterWhisperSTT(
+        model_size=config["model_size"],
+        device=config["device"],
+        compute_type=config["compute_type"],
+        cpu_threads=config["cpu_threads"],
+        num_workers=config["num_workers"],
+        language=config["language"],
+        beam_size=config["beam_size"],
+        vad_filter=config["vad_filter"],
+        small_model_size=config["small_model_size"],
+        kws_max_seconds=config["kws_max_seconds"],
+        kws_min_logprob=config["kws_min_logprob"],
+        adaptive_beam=config["adaptive_beam"],
+        min_avg_logprob=config["min_avg_logprob"],
+        max_compression_ratio=config["max_compression_ratio"],
+        max_no_speech_prob=config["max_no_speech_prob"],
+        noise_filter=NoiseFilter(
+            max_no_speech_prob=noise["max_no_speech_prob"],
+            min_avg_logprob=noise["min_avg_logprob"],
+            max_tokens_per_second=noise["max_tokens_per_second"],
+            suspicious_no_speech_prob=noise["suspicious_no_speech_prob"],
+        ) if noise["enabled"] else None,
+    )
+    stt.console.quiet = True
+    stt.recorder.console.quiet = True
+    stt.transcribe(corpus[0]["audio"])  # warm-up
+
+    rows = []
+    for u in corpus:
+        audio = u["audio"] if direct else stt.recorder.record(stream=FileStream(u["audio"]))
+        start = time.perf_counter()
+        hypothesis = stt.transcribe(audio) if audio is not None else None
+        latency = time.perf_counter() - start
+
+        row = {
+            "id": u["id"],
+            "category": u["category"],
+            "reference": u["text"],
+            "hypothesis": hypothesis or "",
+            "latency_s": latency,
+            "audio_s": len(u["audio"]) / 16000,
+            "recorded_s": len(audio) / 16000 if audio is not None else 0.0,
+        }
+        if u["category"] == "commands":
+            expected = stt.commands.match(u["text"])
+            got = END if hypothesis == "__END_SESSION__" else stt.commands.match(hypothesis or "")
+            row["command_ok"] = got == expected
+            if hypothesis == "__END_SESSION__":
+                row["hypothesis"] = None  # the transcript isn't returned, only scored as a command
+        if row["hypothesis"] is not None:
+            edits, words = stt_corpus.word_errors(row["reference"], row["hypothesis"])
+            row["wer"] = edits / words if words else 0.0
+        rows.append(row)
+        print(f"  {u['id']:12} {latency * 1000:7.0f} ms   WER {row.get('wer', 0.0):5.0%}   {row['hypothesis']!r}")
+
+    categories = sorted({r["category"] for r in rows})
+    return {
+        "commit": _git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "host": platform.node(),
+        "corpus": stt_corpus.fingerprint(),
+        "through_recorder": not direct,
+        "config": {k: config.get(k) for k in _CONFIG_KEYS},
+        "overall": _summary(rows),
+        "categories": {c: _summary([r for r in rows if r["category"] == c]) for c in categories},
+        "utterances": rows,
+    }
+
+
+def _print_summary(result: Dict):
+    print(f"\n  {'category':10} {'n':>3}   {'WER':>6} {'CER':>6}   {'p50':>7} {'p95':>7}   {'RTF':>5}")
+    for name, s in [*result["categories"].items(), ("overall", result["overall"])]:
+        extra = f"   commands {s['command_accuracy']:.0%}" if "command_accuracy" in s else ""
+        print(f"  {name:10} {s['n']:3}   {s['wer']:6.1%} {s['cer']:6.1%}   "
+            f"{s['latency_p50'] * 1000:5.0f}ms {s['latency_p95'] * 1000:5.0f}ms   {s['rtf']:5.2f}{extra}")
+
+
+def compare(old: Dict, new: Dict, max_wer_increase: float, max_latency_increase: float) -> bool:
+    """
+    Print per-category deltas.
+
+    Returns:
+        False if WER or p95 latency got worse beyond the allowed margins
+    """
+    if old["corpus"] != new["corpus"]:
+        sys.exit(f"Different corpora ({old['corpus']} vs {new['corpus']}), results are not comparable "
+                "(the corpus audio changed, restore the committed stt_audio files or re-run the baseline).")
+    changed = {k for k in _CONFIG_KEYS if old["config"].get(k) != new["config"].get(k)}
+    if changed:
+        print(f"⚠ Config differs: {', '.join(sorted(changed))}")
+
+    ok = True
+    print(f"\n  {old['commit']} -> {new['commit']}")
+    print(f"  {'category':10}   {'WER':>15}   {'p95 latency':>19}")
+    for name in [*new["categories"], "overall"]:
+        a = old["overall"] if name == "overall" else old["categories"].get(name)
+        b = new["overall"] if name == "overall" else new["categories"][name]
+        if a is None:
+            continue
+        wer_bad = b["wer"] - a["wer"] > max_wer_increase
+        lat_bad = b["latency_p95"] > a["latency_p95"] * (1 + max_latency_increase)
+        ok = ok and not wer_bad and not lat_bad
+        print(f"  {name:10}   {a['wer']:5.1%} -> {b['wer']:5.1%}{' ✗' if wer_bad else '  '}   "
+            f"{a['latency_p95'] * 1000:6.0f} -> {b['latency_p95'] * 1000:6.0f} ms{' ✗' if lat_bad else ''}")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="STT regression benchmark")
+    parser.add_argument("--direct", action="store_true", help="skip AudioRecorder, transcribe the files as they are")
+    parser.add_argument("--out", type=Path, help="result file (default: logs/bench_stt/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("OLD", "NEW"))
+    parser.add_argument("--max-wer-increase", type=float, default=0.01, help="absolute, e.g. 0.01 = 1 point")
+    parser.add_argument("--max-latency-increase", type=float, default=0.15, help="relative, e.g. 0.15 = +15%%")
+    args = parser.parse_args()
+
+    if args.compare:
+        old, new = (json.loads(p.read_text(encoding="utf-8")) for p in args.compare)
+        sys.exit(0 if compare(old, new, args.max_wer_increase, args.max_latency_increase) else 1)
+
+    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f)["faster_whisper"]
+    result = run(config, direct=args.direct)
+    _print_summary(result)
+
+    out = args.out or RESULTS_DIR / f"{result['commit'] or 'result'}{'-dirty' if result['dirty'] else ''}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=1, ensure_ascii=False), encoding="utf-8")
+    print(f"\n✓ Results written to {out}")
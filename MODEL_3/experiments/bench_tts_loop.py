@@ -0,0 +1,79 @@
+"""
+Benchmark: per-call TTS setup cost, asyncio.run() per utterance vs. the shared TTSLoop
+Run from the repo root:  python -m MODEL_3.experiments.bench_tts_loop
+"""
+
+import asyncio
+import statistics
+import time
+import edge_tts
+from MODEL_3.audio.tts import TTSLoop
+
+
+PHRASES = [
+    "Ich bin gegangen.",
+    "Genau richtig!",
+    "Gut gemacht.",
+    "Noch einmal, bitte.",
+    "Das ist korrekt.",
+]
+VOICE = "de-DE-KatjaNeural"
+
+
+async def _noop():
+    return None
+
+
+async def _first_byte(text: str) -> float:
+    """Seconds until the first audio chunk arrives."""
+    start = time.perf_counter()
+    communicate = edge_tts.Communicate(text=text, voice=VOICE)
+    async for chunk in communicate.stream():
+        if chunk["type"] == "audio":
+            return time.perf_counter() - start
+    return float("nan")
+
+
+def _report(name: str, samples):
+    samples_ms = [s * 1000 for s in samples]
+    print(f"  {name:28} median {statistics.median(samples_ms):8.2f} ms   max {max(samples_ms):8.2f} ms")
+
+
+if __name__ == "__main__":
+    loop = TTSLoop.shared()
+
+    # 1. Loop overhead only
+    # ----------------------
+    n = 200
+    before, after = [], []
+    for _ in range(n):
+        t = time.perf_counter()
+        asyncio.run(_noop())
+        before.append(time.perf_counter() - t)
+
+        t = time.perf_counter()
+        loop.run(_noop())
+        after.append(time.perf_counter() - t)
+
+    print("\n=== Event loop setup per call ===")
+    _report("asyncio.run (before)", before)
+    _report("TTSLoop.run (after)", after)
+
+    # 2. Time to first audio byte (network)
+    # --------------------------------------
+    before = [asyncio.run(_first_byte(p)) for p in PHRASES]
+    after = [loop.run(_first_byte(p)) for p in PHRASES]
+
+    print("\n=== Time to first audio byte ===")
+    _report("asyncio.run (before)", before)
+    _report("TTSLoop.run (after)", after)
+
+    # 3. Concurrent submissions on the shared loop
+    # ---------------------------------------------
+    t = time.perf_counter()
+    futures = [loop.submit(_first_byte(p)) for p in PHRASES]
+    for f in futures:
+        f.result()
+    print(f"\n  {len(PHRASES)} concurrent submissions: {(time.perf_counter() - t) * 1000:.1f} ms total")
+
+    loop.stop()
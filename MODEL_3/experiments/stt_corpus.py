@@ -0,0 +1,234 @@
+"""
+German STT evaluation corpus
+Reference texts live in stt_audio/manifest.json, the audio is committed next to
+it (16kHz mono wav) and pinned by the fingerprint in the manifest, so results
+from different machines are comparable. Spoken utterances are synthesized
+offline with espeak-ng (German voice variants; the accented ones are German
+text read by other languages' voices), noisy variants are mixed from clean ones
+with seeded noise. Categories: clean, noisy, accented, commands, long (10+ s).
+Also WER / CER scoring against the references.
+
+Adding utterances (needs espeak-ng): add them to the manifest, run
+    python -m MODEL_3.experiments.stt_corpus
+to create the missing wav files, then commit them with the new fingerprint
+("audio_fingerprint" in the manifest).
+"""
+
+import hashlib
+import io
+import json
+import re
+import subprocess
+import wave
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from rapidfuzz.distance import Levenshtein
+
+
+CORPUS_DIR = Path(__file__).parent / "stt_audio"
+_WORD_RE = re.compile(r"\w+")
+
+
+# ======================================== #
+#    SCORING                               #
+# ======================================== #
+def _normalize(text: str) -> List[str]:
+    """Lowercase words, punctuation dropped (what WER is computed on)."""
+    return _WORD_RE.findall(text.lower())
+
+
+def word_errors(reference: str, hypothesis: str) -> Tuple[int, int]:
+    """(word edits, reference words) -> sum over a corpus for its WER."""
+    ref = _normalize(reference)
+    return Levenshtein.distance(ref, _normalize(hypothesis)), len(ref)
+
+
+def char_errors(reference: str, hypothesis: str) -> Tuple[int, int]:
+    """(character edits, reference characters), spaces normalized."""
+    ref = " ".join(_normalize(reference))
+    return Levenshtein.distance(ref, " ".join(_normalize(hypothesis))), len(ref)
+
+
+def error_rate(pairs: List[Tuple[str, str]], errors=word_errors) -> float:
+    """Corpus-level WER (or CER with errors=char_errors) of (reference, hypothesis) pairs."""
+    edits, total = map(sum, zip(*(errors(r, h) for r, h in pairs))) if pairs else (0, 0)
+    return edits / total if total else 0.0
+
+
+# ======================================== #
+#    AUDIO                                 #
+# ======================================== #
+def read_wav(path: Path) -> np.ndarray:
+    """16-bit mono wav -> float32 in [-1, 1] (what AudioRecorder hands to Whisper)."""
+    with wave.open(str(path), "rb") as f:
+        return np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def write_wav(path: Path, audio: np.ndarray, sample_rate: int = 16000):
+    """float32 in [-1, 1] -> 16-bit mono wav."""
+    pcm = np.clip(np.round(audio * 32768.0), -32768, 32767).astype(np.int16)
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(pcm.tobytes())
+
+
+def _resample(audio: np.ndarray, rate: int, target: int) -> np.ndarray:
+    """Linear resampling (deterministic, no extra dependency)."""
+    if rate == target:
+        return audio.astype(np.float32)
+    n = int(round(len(audio) * target / rate))
+    return np.interp(np.arange(n) * rate / target, np.arange(len(audio)), audio).astype(np.float32)
+
+
+def _synthesize(text: str, voice: str, sample_rate: int) -> np.ndarray:
+    """espeak-ng voice reading the text -> float32 at sample_rate."""
+    result = subprocess.run(["espeak-ng", "-v", voice, "--stdout"],
+                            input=text.encode("utf-8"), capture_output=True, check=True)
+    with wave.open(io.BytesIO(result.stdout), "rb") as f:
+        rate = f.getframerate()
+        audio = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16).astype(np.float32) / 32768.0
+    return _resample(audio, rate, sample_rate)
+
+
+def add_noise(audio: np.ndarray,
+            kind: str,
+            snr_db: float,
+            seed: int,
+            others: List[np.ndarray] = (),
+            sample_rate: int = 16000) -> np.ndarray:
+    """
+    Mix seeded noise into speech at a signal-to-noise ratio.
+
+    Args:
+        audio: Clean speech
+        kind: "white", "hum" (50 Hz mains with harmonics) or "babble" (other speakers)
+        snr_db: Speech to noise power ratio
+        seed: RNG seed (same seed -> same file)
+        others: Speech used for babble
+        sample_rate: Sample rate of audio
+
+    Returns:
+        Noisy audio, same length
+    """
+    rng = np.random.default_rng(seed)
+    n = len(audio)
+    if kind == "white":
+        noise = rng.standard_normal(n)
+    elif kind == "hum":
+        t = np.arange(n) / sample_rate
+        noise = sum(np.sin(2 * np.pi * 50 * k * t + rng.uniform(0, 2 * np.pi)) / k for k in (1, 2, 3, 5))
+    elif kind == "babble":
+        noise = np.zeros(n)
+        for i in rng.choice(len(others), size=min(3, len(others)), replace=False):
+            other = np.resize(others[i], n)  # repeated / cut to length
+            noise += np.roll(other, rng.integers(n))
+    else:
+        raise ValueError(f"Unknown noise type: {kind}")
+
+    speech_power = np.mean(audio ** 2)
+    noise_power = np.mean(noise ** 2) or 1.0
+    noise *= np.sqrt(speech_power / (noise_power * 10 ** (snr_db / 10)))
+    mixed = audio + noise
+    return (mixed / max(1.0, np.abs(mixed).max())).astype(np.float32)
+
+
+def load_manifest(directory: Path = CORPUS_DIR) -> Dict:
+    """The manifest, with the text of derived (noisy) utterances filled in from their source."""
+    with open(directory / "manifest.json", "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    by_id = {u["id"]: u for u in manifest["utterances"]}
+    for u in manifest["utterances"]:
+        if "source" in u:
+            u["text"] = by_id[u["source"]]["text"]
+    return manifest
+
+
+def build(directory: Path = CORPUS_DIR):
+    """Synthesize / mix the wav files that are missing (only needed for new utterances)."""
+    manifest = load_manifest(directory)
+    rate = manifest["sample_rate"]
+    missing = [u for u in manifest["utterances"] if not (directory / f"{u['id']}.wav").exists()]
+    if not missing:
+        return
+
+    # 1. synthesized utterances
+    spoken = [u for u in missing if "voice" in u]
+    if spoken:
+        print(f"Synthesizing {len(spoken)} corpus utterances...")
+    for u in spoken:
+        write_wav(directory / f"{u['id']}.wav", _synthesize(u["text"], u["voice"], rate), rate)
+
+    # 2. noisy variants of clean ones (babble is made of the other clean utterances)
+    clean = {u["id"]: u for u in manifest["utterances"] if u.get("category") == "clean"}
+    for u in missing:
+        if "source" not in u:
+            continue
+        source = read_wav(directory / f"{u['source']}.wav")
+        others = [read_wav(directory / f"{i}.wav") for i in sorted(clean) if i != u["source"]]
+        noise = u["noise"]
+        audio = add_noise(source, noise["type"], noise["snr_db"], noise["seed"], others, rate)
+        write_wav(directory / f"{u['id']}.wav", audio, rate)
+
+
+def fingerprint(directory: Path = CORPUS_DIR) -> str:
+    """
+    Hash of the utterances (ids, texts, settings) and every wav file.
+    Benchmark results are only comparable if their fingerprints match.
+    """
+    manifest = load_manifest(directory)
+    digest = hashlib.sha256(json.dumps(manifest["utterances"], sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    for u in manifest["utterances"]:
+        digest.update((directory / f"{u['id']}.wav").read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def verify(directory: Path = CORPUS_DIR):
+    """Raise if the audio is not the committed corpus (modified or re-synthesized files)."""
+    expected = load_manifest(directory).get("audio_fingerprint")
+    actual = fingerprint(directory)
+    if expected and actual != expected:
+        raise RuntimeError(f"Corpus fingerprint {actual} does not match the committed {expected}: "
+                        f"restore the wav files in {directory} (git checkout), or commit the new "
+                        f"fingerprint if the corpus was changed on purpose.")
+
+
+def load(directory: Path = CORPUS_DIR, categories: Optional[List[str]] = None) -> List[Dict]:
+    """
+    The corpus, synthesized first if needed.
+
+    Args:
+        directory: Corpus directory (manifest.json + wav files)
+        categories: Only these categories (None -> all)
+
+    Returns:
+        Utterance dicts of the manifest, each with "audio" (float32, 16kHz) added
+    """
+    build(directory)
+    verify(directory)
+    utterances = load_manifest(directory)["utterances"]
+    if categories:
+        utterances = [u for u in utterances if u["category"] in categories]
+    for u in utterances:
+        u["audio"] = read_wav(directory / f"{u['id']}.wav")
+    return utterances
+
+
+# ======================================================================== #
+#                              TESTING                                     #
+# ======================================================================== #
+
+if __name__ == "__main__":
+    pairs = [
+        ("Ich bin gestern ins Kino gegangen.", "Ich bin gestern ins Kino gegangen"),
+        ("Ich bin gestern ins Kino gegangen.", "Ich habe gestern ins Kino gegangen."),
+        ("Wie spät ist es?", "Wie spät es?"),
+    ]
+    for r, h in pairs:
+        print(f"{h!r:40} WER {error_rate([(r, h)]):.2f}  CER {error_rate([(r, h)], char_errors):.2f}")
+
+    corpus = load()
+    print(f"\n{len(corpus)} utterances, {sum(len(u['audio']) for u in corpus) / 16000:.1f}s of audio, "
+        f"fingerprint {fingerprint()}")
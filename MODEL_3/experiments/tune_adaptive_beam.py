@@ -0,0 +1,94 @@
+"""
+Tuning: confidence-adaptive beam search thresholds on a replay corpus
+Decodes every recording once with the full beam (reference), then greedily with
+beam re-decodes of unsure segments for a grid of thresholds, and reports the
+re-decode rate, the time saved and how far the transcripts drift from the reference.
+Run from the repo root:  python -m MODEL_3.experiments.tune_adaptive_beam <dir with .wav files>
+"""
+
+import itertools
+import sys
+import time
+import wave
+from pathlib import Path
+import numpy as np
+import yaml
+from MODEL_3.audio.stt import FasterWhisperSTT, transcript_distance
+from MODEL_3.metrics import metrics
+
+
+MIN_AVG_LOGPROB = (-0.5, -0.7, -0.9)
+MAX_COMPRESSION_RATIO = (2.0, 2.4)
+MAX_NO_SPEECH_PROB = (0.4, 0.6)
+
+
+def load_wav(path: Path) -> np.ndarray:
+    """16-bit PCM wav -> float32 mono at 16kHz (what the recorder hands to Whisper)."""
+    with wave.open(str(path), "rb") as f:
+        rate, channels = f.getframerate(), f.getnchannels()
+        audio = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+    audio = audio.reshape(-1, channels).mean(axis=1) / 32768.0
+    if rate != 16000:
+        n = int(len(audio) * 16000 / rate)
+        audio = np.interp(np.linspace(0, len(audio) - 1, n), np.arange(len(audio)), audio)
+    return audio.astype(np.float32)
+
+
+def run(stt: FasterWhisperSTT, corpus):
+    """Transcripts and total decode seconds over the corpus."""
+    start = time.perf_counter()
+    transcripts = [stt._decode(audio) for audio in corpus]
+    return transcripts, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    files = sorted(Path(sys.argv[1]).glob("*.wav"))
+    corpus = [load_wav(f) for f in files]
+    print(f"\n{len(corpus)} recordings, {sum(map(len, corpus)) / 16000:.1f}s of audio")
+
+    with open("MODEL_3/config.yaml", "r") as f:
+        config = yaml.safe_load(f)["faster_whisper"]
+    stt = FasterWhisperSTT(
+        model_size=config["model_size"],
+        device=config["device"],
+        compute_type=config["compute_type"],
+        language=config["language"],
+        beam_size=config["beam_size"],
+        vad_filter=config["vad_filter"],
+    )
+    stt.console.quiet = True
+    stt._decode(corpus[0])  # warm-up
+
+    # 1. Reference: full beam everywhere
+    # -----------------------------------
+    stt.adaptive_beam = False
+    reference, reference_s = run(stt, corpus)
+    print(f"\nbeam_size={stt.beam_size} everywhere: {reference_s:.2f}s\n")
+
+    # 2. Adaptive, per threshold setting
+    # -----------------------------------
+    stt.adaptive_beam = True
+    print(f"  {'logprob':>7} {'compr':>5} {'no_sp':>5}   {'redecoded':>9}   {'time':>6}   {'saved':>6}   {'mean dist':>9}   {'changed':>7}")
+    for logprob, compression, no_speech in itertools.product(MIN_AVG_LOGPROB, MAX_COMPRESSION_RATIO, MAX_NO_SPEECH_PROB):
+        stt.min_avg_logprob = logprob
+        stt.max_compression_ratio = compression
+        stt.max_no_speech_prob = no_speech
+
+        segments, redecoded = metrics.count("stt.segments"), metrics.count("stt.segments_redecoded")
+        transcripts, elapsed = run(stt, corpus)
+        segments = metrics.count("stt.segments") - segments
+        redecoded = metrics.count("stt.segments_redecoded") - redecoded
+
+        distances = [transcript_distance(a, b) for a, b in zip(transcripts, reference)]
+        print(
+            f"  {logprob:7.2f} {compression:5.1f} {no_speech:5.2f}   "
+            f"{redecoded / max(segments, 1):9.0%}   {elapsed:5.2f}s   "
+            f"{1 - elapsed / reference_s:6.0%}   {np.mean(distances):9.3f}   "
+            f"{sum(d > 0 for d in distances):3}/{len(distances)}"
+        )
+
+    stt.cleanup()
@@ -0,0 +1,228 @@
+"""
+STT auto-tuner: find the best faster-whisper settings for THIS host
+Runs the German corpus (experiments/stt_audio) through every candidate of
+model_size x compute_type x cpu_threads x num_workers x beam_size on the CPU,
+measures latency / real-time factor, peak RSS and WER, prints the Pareto front
+and writes the best choice within the latency target into config.yaml.
+
+Run from the repo root:  python -m MODEL_3.experiments.tune_stt [--target 1.5] [--dry-run]
+"""
+
+import argparse
+import concurrent.futures
+import multiprocessing
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+from MODEL_3.experiments import stt_corpus
+
+
+CONFIG_PATH = Path(__file__).parent.parent / "config.yaml"
+
+# Search space (CPU). Models are tried smallest first: once a model misses the
+# latency target even greedily, larger ones are skipped for that setting.
+MODEL_SIZES = ["base", "small", "medium", "large-v3"]
+COMPUTE_TYPES = ["int8", "int8_float32", "float32"]
+BEAM_SIZES = [1, 5]
+NUM_WORKERS = [1, 2]
+
+# Turn-sized utterances (the long dictation ones would dominate the latency percentile)
+CATEGORIES = ["clean", "noisy", "accented", "commands"]
+
+
+def _thread_counts() -> List[int]:
+    cores = os.cpu_count() or 1
+    return sorted({max(1, cores // 2), cores})
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KB on Linux
+    except ImportError:  # Windows
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / 2**20
+        except ImportError:
+            return None
+
+
+# ======================================== #
+#    MEASUREMENT (one process per model)   #
+# ======================================== #
+def _measure(setting: Dict, beam_sizes: List[int], language: str, vad_filter: bool) -> List[Dict]:
+    """
+    Load one model configuration and decode the corpus with each beam size.
+    Runs in a fresh process, so the peak RSS is this configuration's own.
+    """
+    from faster_whisper import WhisperModel
+    from MODEL_3.audio.stt import VAD_PARAMETERS
+
+    corpus = stt_corpus.load(categories=CATEGORIES)
+    start = time.perf_counter()
+    model = WhisperModel(
+        setting["model_size"],
+        device="cpu",
+        compute_type=setting["compute_type"],
+        cpu_threads=setting["cpu_threads"],
+        num_workers=setting["num_workers"],
+    )
+    load_s = time.perf_counter() - start
+
+    def decode(audio, beam_size):
+        start = time.perf_counter()
+        segments, _ = model.transcribe(audio, language=language, beam_size=beam_size,
+                                    vad_filter=vad_filter, vad_parameters=VAD_PARAMETERS)
+        text = " ".join(segment.text.strip() for segment in segments)
+        return text, time.perf_counter() - start
+
+    decode(corpus[0]["audio"], 1)  # warm-up
+    results = []
+    for beam_size in beam_sizes:
+        # num_workers > 1: as many decodes in flight as the model has workers
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=setting["num_workers"]) as pool:
+            outputs = list(pool.map(lambda u: decode(u["audio"], beam_size), corpus))
+        wall = time.perf_counter() - start
+
+        audio_s = sum(len(u["audio"]) for u in corpus) / 16000
+        latencies = [seconds for _, seconds in outputs]
+        results.append({
+            **setting,
+            "beam_size": beam_size,
+            "latency_p95": float(np.percentile(latencies, 95)),
+            "rtf": sum(latencies) / audio_s,        # per stream
+            "throughput_rtf": wall / audio_s,       # all workers together
+            "wer": stt_corpus.error_rate([(u["text"], text) for u, (text, _) in zip(corpus, outputs)]),
+            "load_s": load_s,
+        })
+    peak = _peak_rss_mb()
+    for r in results:
+        r["peak_rss_mb"] = peak
+    return results
+
+
+def measure(setting: Dict, beam_sizes: List[int], language: str, vad_filter: bool) -> List[Dict]:
+    """_measure in a spawned process (no memory shared with earlier candidates)."""
+    context = multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(_measure, setting, beam_sizes, language, vad_filter).result()
+
+
+# ======================================== #
+#    SELECTION                             #
+# ======================================== #
+def _dominates(a: Dict, b: Dict) -> bool:
+    keys = ("latency_p95", "wer", "peak_rss_mb")
+    pairs = [(a[k], b[k]) for k in keys if a[k] is not None and b[k] is not None]
+    return all(x <= y for x, y in pairs) and any(x < y for x, y in pairs)
+
+
+def pareto_front(results: List[Dict]) -> List[Dict]:
+    """Candidates no other candidate beats on latency, WER and memory at once."""
+    return [r for r in results if not any(_dominates(o, r) for o in results)]
+
+
+def choose(results: List[Dict], target: float) -> Dict:
+    """Most accurate Pareto candidate within the latency target (else the fastest)."""
+    fitting = [r for r in pareto_front(results) if r["latency_p95"] <= target]
+    if not fitting:
+        print(f"\n⚠ Nothing meets the {target:.2f}s target, taking the fastest candidate")
+        return min(results, key=lambda r: r["latency_p95"])
+    return min(fitting, key=lambda r: (round(r["wer"], 3), r["latency_p95"], r["peak_rss_mb"] or 0))
+
+
+# ======================================== #
+#    CONFIG                                #
+# ======================================== #
+def _yaml_value(value) -> str:
+    return f'"{value}"' if isinstance(value, str) else str(value)
+
+
+def write_config(values: Dict, path: Path = CONFIG_PATH):
+    """
+    Set keys of the faster_whisper section in place.
+    Line edits instead of a YAML round trip, so comments and layout survive.
+    """
+    lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+    section = None
+    for i, line in enumerate(lines):
+        if re.match(r"^\w", line):
+            section = line.split(":")[0]
+            continue
+        m = re.match(r"^  (\w+):[^#\n]*(#.*)?$", line)
+        if section != "faster_whisper" or not m or m.group(1) not in values:
+            continue
+        new = f"  {m.group(1)}: {_yaml_value(values[m.group(1)])}"
+        if m.group(2):
+            new = new.ljust(line.index("#") - 1) + " " + m.group(2)
+        lines[i] = new + "\n"
+    path.write_text("".join(lines), encoding="utf-8")
+
+
+def _row(r: Dict) -> str:
+    rss = f"{r['peak_rss_mb']:7.0f}" if r["peak_rss_mb"] is not None else "      -"
+    return (f"  {r['model_size']:9} {r['compute_type']:13} {r['cpu_threads']:3} {r['num_workers']:3} {r['beam_size']:3}"
+            f"   {r['latency_p95']:6.2f}s {r['rtf']:6.2f} {r['throughput_rtf']:6.2f}   {r['wer']:6.1%}   {rss}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tune faster-whisper settings for this host")
+    parser.add_argument("--target", type=float, default=1.5, help="p95 decode latency per utterance (s)")
+    parser.add_argument("--models", nargs="+", default=MODEL_SIZES)
+    parser.add_argument("--compute-types", nargs="+", default=COMPUTE_TYPES)
+    parser.add_argument("--dry-run", action="store_true", help="don't write config.yaml")
+    args = parser.parse_args()
+
+    import yaml
+    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f)["faster_whisper"]
+    language = config["language"] or "de"
+
+    corpus = stt_corpus.load(categories=CATEGORIES)  # loaded and verified once, not in every worker
+    print(f"\n{len(corpus)} utterances, {sum(len(u['audio']) for u in corpus) / 16000:.1f}s of audio, "
+        f"target p95 latency {args.target:.2f}s\n")
+    print(f"  {'model':9} {'compute':13} {'thr':>3} {'wrk':>3} {'bm':>3}   {'p95':>7} {'RTF':>6} {'tp RTF':>6}   {'WER':>6}   {'RSS MB':>7}")
+
+    results = []
+    for compute_type in args.compute_types:
+        for cpu_threads in _thread_counts():
+            for num_workers in NUM_WORKERS:
+                for model_size in args.models:
+                    setting = dict(model_size=model_size, compute_type=compute_type,
+                                cpu_threads=cpu_threads, num_workers=num_workers)
+                    try:
+                        measured = measure(setting, BEAM_SIZES, language, config["vad_filter"])
+                    except Exception as e:  # e.g. compute type not supported by this CPU
+                        print(f"  {model_size:9} {compute_type:13} {cpu_threads:3} {num_workers:3}   failed: {e}")
+                        break
+                    for r in measured:
+                        print(_row(r))
+                    results += measured
+                    if min(r["latency_p95"] for r in measured) > args.target:
+                        break  # larger models will be slower still
+
+    if not results:
+        sys.exit("No candidate could be measured.")
+
+    print("\n=== Pareto front (latency / WER / memory) ===")
+    for r in sorted(pareto_front(results), key=lambda r: r["latency_p95"]):
+        print(_row(r))
+
+    best = choose(results, args.target)
+    print("\n=== Best for this host ===")
+    print(_row(best))
+
+    values = {k: best[k] for k in ("model_size", "compute_type", "cpu_threads", "num_workers", "beam_size")}
+    values["device"] = "cpu"
+    if args.dry_run:
+        print("\n(dry run, config.yaml unchanged)")
+    else:
+        write_config(values)
+        print(f"\n✓ Written to {CONFIG_PATH}")
@@ -0,0 +1,103 @@
+"""
+Lightweight metrics for tuning the pipeline
+Counters, value distributions and an append-only JSON-lines event log
+"""
+
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Optional
+
+
+class Metrics:
+    """
+    Process-wide counters, distributions and event log.
+    Thread-safe, no external dependencies.
+    """
+
+    def __init__(self, log_path: Optional[str] = None, window: int = 1000):
+        """
+        Initialize metrics store.
+
+        Args:
+            log_path: JSON-lines file events are appended to (None -> memory only)
+            window: Number of recent observations kept per distribution
+        """
+        self.log_path = Path(log_path) if log_path else None
+        self.window = window
+        self._lock = threading.Lock()
+        self._counters = defaultdict(int)
+        self._values = defaultdict(lambda: deque(maxlen=self.window))
+
+    def configure(self, log_path: Optional[str] = None, window: Optional[int] = None):
+        """Change the event log destination and/or the distribution window."""
+        with self._lock:
+            self.log_path = Path(log_path) if log_path else None
+            if window:
+                self.window = window
+                self._values = defaultdict(
+                    lambda: deque(maxlen=self.window),
+                    {k: deque(v, maxlen=window) for k, v in self._values.items()},
+                )
+
+    def incr(self, name: str, n: int = 1):
+        """Increase a counter."""
+        with self._lock:
+            self._counters[name] += n
+
+    def observe(self, name: str, value: float):
+        """Record one value of a distribution (latency, length, ...)."""
+        with self._lock:
+            self._values[name].append(float(value))
+
+    def event(self, kind: str, **fields):
+        """Append one structured event to the log file (if configured)."""
+        if self.log_path is None:
+            return
+        record = {"ts": round(time.time(), 3), "event": kind, **fields}
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            try:
+                self.log_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            except OSError:
+                pass
+
+    def count(self, name: str) -> int:
+        """Current value of a counter."""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def percentile(self, name: str, q: float) -> Optional[float]:
+        """q-th percentile (0-100) of a distribution, None if empty."""
+        with self._lock:
+            values = sorted(self._values.get(name, ()))
+        if not values:
+            return None
+        idx = min(len(values) - 1, max(0, int(round(q / 100 * (len(values) - 1)))))
+        return values[idx]
+
+    def summary(self) -> dict:
+        """Snapshot of all counters and distribution percentiles."""
+        with self._lock:
+            counters = dict(self._counters)
+            names = list(self._values)
+        dists = {}
+        for name in names:
+            with self._lock:
+                n = len(self._values[name])
+            if n:
+                dists[name] = {
+                    "n": n,
+                    "p50": self.percentile(name, 50),
+                    "p95": self.percentile(name, 95),
+                    "max": self.percentile(name, 100),
+                }
+        return {"counters": counters, "distributions": dists}
+
+
+# Shared instance used by all pipeline stages
+metrics = Metrics()
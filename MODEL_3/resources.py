@@ -0,0 +1,317 @@
+"""
+Resource manager for loaded models
+Keeps heavy components (Whisper models, the Porcupine handle) between sessions,
+unloads them after an idle time or, least recently used first, when the process
+goes over a memory budget, and reloads them in the background when needed again
+"""
+
+import concurrent.futures
+import gc
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from rich.console import Console
+from .metrics import metrics
+
+
+def process_rss_mb() -> Optional[float]:
+    """Current resident memory of this process in MB (None if it can't be read)."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, AttributeError, ValueError):  # not Linux
+        try:
+            import psutil
+            return psutil.Process().memory_info().rss / 2**20
+        except ImportError:
+            return None
+
+
+class _Resource:
+    """One managed component and its state."""
+
+    def __init__(self, name: str, load: Callable[[], Any], unload: Optional[Callable[[Any], None]],
+                pinned: bool, external_mb: Optional[Callable[[Any], float]]):
+        self.name = name
+        self.load = load
+        self.unload = unload
+        self.pinned = pinned
+        self.external_mb = external_mb
+        self.value = None
+        self.loading: Optional[concurrent.futures.Future] = None
+        self.users = 0
+        self.last_used = time.monotonic()
+        self.size_mb = None  # RSS growth when it was loaded
+
+    @property
+    def loaded(self) -> bool:
+        return self.value is not None
+
+
+class ResourceManager:
+    """
+    Loads components on demand, keeps them while they are used and
+    unloads idle ones (LRU) by time or memory budget.
+
+    Usage:
+        resources.register("whisper", load=lambda: WhisperModel("large-v3"))
+        resources.preload("whisper")          # background, e.g. on the wake word
+        model = resources.acquire("whisper")  # waits for the load if needed
+        ...
+        resources.release("whisper")          # unloadable again
+    """
+
+    def __init__(self,
+                idle_seconds: Optional[float] = 1800,
+                budget_mb: Optional[float] = None,
+                check_seconds: float = 30.0):
+        """
+        Initialize resource manager.
+
+        Args:
+            idle_seconds: Unload components unused for this long (None -> never)
+            budget_mb: Unload least recently used components while the memory of
+                    this process (plus worker processes it knows of) is above this
+                    (None -> no budget)
+            check_seconds: How often idle time and budget are checked
+        """
+        self.console = Console()
+        self.idle_seconds = idle_seconds
+        self.budget_mb = budget_mb
+        self._resources: Dict[str, _Resource] = {}
+        self._lock = threading.RLock()
+        self._loader = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="resource-load")
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch, args=(check_seconds,), name="resources", daemon=True)
+        self._thread.start()
+
+    def register(self,
+                name: str,
+                load: Callable[[], Any],
+                unload: Optional[Callable[[Any], None]] = None,
+                pinned: bool = False,
+                external_mb: Optional[Callable[[Any], float]] = None):
+        """
+        Add a component (not loaded yet).
+
+        Args:
+            name: Key for acquire() / release()
+            load: Builds the component
+            unload: Frees it (close handles, stop threads); dropping the reference
+                    is enough for plain models
+            pinned: Never unloaded (tracked for the budget only)
+            external_mb: Memory it holds outside this process (worker processes)
+        """
+        with self._lock:
+            self._resources[name] = _Resource(name, load, unload, pinned, external_mb)
+
+    # ======================================== #
+    #    LOADING                               #
+    # ======================================== #
+    def preload(self, *names: str, wait: bool = False):
+        """
+        Start loading the given (or all) components that aren't loaded, in parallel.
+
+        Args:
+            wait: Return once they are loaded (raises if one fails)
+        """
+        with self._lock:
+            loading = []
+            for name in names or list(self._resources):
+                resource = self._resources[name]
+                if not resource.loaded and resource.loading is None:
+                    resource.loading = self._loader.submit(self._load, resource)
+                if resource.loading is not None:
+                    loading.append(resource.loading)
+        if wait:
+            for future in loading:
+                future.result()
+
+    def _load(self, resource: _Resource) -> Any:
+        start = time.perf_counter()
+        before = process_rss_mb()
+        try:
+            value = resource.load()
+        except Exception:
+            with self._lock:
+                resource.loading = None
+            raise
+        seconds = time.perf_counter() - start
+        after = process_rss_mb()
+        with self._lock:
+            resource.value = value
+            resource.loading = None
+            resource.last_used = time.monotonic()
+            if before is not None and after is not None:
+                resource.size_mb = max(0.0, after - before)  # rough when loads overlap
+        metrics.incr(f"resources.loads.{resource.name}")
+        metrics.observe(f"resources.load_ms.{resource.name}", seconds * 1000)
+        size = f", +{resource.size_mb:.0f} MB" if resource.size_mb else ""
+        self.console.print(f"[dim]Loaded {resource.name} ({seconds:.1f}s{size})[/]")
+        return value
+
+    def acquire(self, name: str) -> Any:
+        """
+        The component, loaded if needed (waits for a background load).
+        Not unloaded until every acquire() has its release().
+        """
+        start = time.perf_counter()
+        while True:
+            with self._lock:
+                resource = self._resources[name]
+                if resource.loaded:
+                    resource.users += 1
+                    resource.last_used = time.monotonic()
+                    value = resource.value
+                    break
+                if resource.loading is None:
+                    resource.loading = self._loader.submit(self._load, resource)
+                loading = resource.loading
+            loading.result()  # raises if loading failed
+        waited = (time.perf_counter() - start) * 1000
+        if waited > 1:
+            metrics.observe(f"resources.wait_ms.{name}", waited)  # what the learner noticed
+        return value
+
+    def acquire_async(self, name: str) -> concurrent.futures.Future:
+        """acquire() without blocking: a Future of the component (already done if loaded)."""
+        future = concurrent.futures.Future()
+        with self._lock:
+            resource = self._resources[name]
+            if resource.loaded:
+                resource.users += 1
+                resource.last_used = time.monotonic()
+                future.set_result(resource.value)
+                return future
+
+        def wait():
+            try:
+                future.set_result(self.acquire(name))
+            except Exception as e:
+                future.set_exception(e)
+        threading.Thread(target=wait, name=f"acquire-{name}", daemon=True).start()
+        return future
+
+    def release(self, name: str):
+        """Done with the component for now."""
+        with self._lock:
+            resource = self._resources[name]
+            resource.users = max(0, resource.users - 1)
+            resource.last_used = time.monotonic()
+        self._enforce_budget()
+
+    def loaded(self, name: str) -> bool:
+        with self._lock:
+            return self._resources[name].loaded
+
+    # ======================================== #
+    #    UNLOADING                             #
+    # ======================================== #
+    def _unloadable(self):
+        """Loaded, unused, unpinned components, least recently used first."""
+        return sorted((r for r in self._resources.values() if r.loaded and not r.pinned and r.users == 0),
+                    key=lambda r: r.last_used)
+
+    def _unload(self, resource: _Resource, reason: str):
+        with self._lock:
+            if not resource.loaded or resource.users or resource.pinned:
+                return
+            value, resource.value = resource.value, None
+        try:
+            if resource.unload is not None:
+                resource.unload(value)
+        except Exception as e:
+            self.console.print(f"[red]Unloading {resource.name} failed: {e}[/]")
+        del value
+        gc.collect()
+        metrics.incr(f"resources.unloaded.{reason}")
+        metrics.event("resource_unloaded", name=resource.name, reason=reason, size_mb=resource.size_mb)
+        self.console.print(f"[dim]Unloaded {resource.name} ({reason})[/]")
+
+    def usage_mb(self) -> Optional[float]:
+        """Memory counted against the budget: this process plus external components."""
+        rss = process_rss_mb()
+        if rss is None:
+            return None
+        with self._lock:
+            external = [(r.external_mb, r.value) for r in self._resources.values() if r.loaded and r.external_mb]
+        return rss + sum(measure(value) for measure, value in external)
+
+    def _enforce_budget(self):
+        if self.budget_mb is None:
+            return
+        while True:
+            usage = self.usage_mb()
+            if usage is None or usage <= self.budget_mb:
+                return
+            with self._lock:
+                candidates = self._unloadable()
+            if not candidates:
+                return  # everything left is in use or pinned
+            self._unload(candidates[0], "budget")
+
+    def sweep(self):
+        """Unload idle components, then enforce the budget."""
+        if self.idle_seconds is not None:
+            now = time.monotonic()
+            with self._lock:
+                idle = [r for r in self._unloadable() if now - r.last_used > self.idle_seconds]
+            for resource in idle:
+                self._unload(resource, "idle")
+        self._enforce_budget()
+
+    def _watch(self, check_seconds: float):
+        while not self._stop.wait(check_seconds):
+            self.sweep()
+
+    def close(self):
+        """Stop the watcher and unload everything."""
+        self._stop.set()
+        self._loader.shutdown(wait=True)
+        with self._lock:
+            resources = list(self._resources.values())
+        for resource in resources:
+            resource.users, resource.pinned = 0, False
+            self._unload(resource, "shutdown")
+
+    def status(self) -> Dict[str, Dict]:
+        """Per component: loaded, users, idle seconds, size when loaded."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                r.name: {"loaded": r.loaded, "users": r.users, "idle_s": round(now - r.last_used),
+                        "size_mb": r.size_mb}
+                for r in self._resources.values()
+            }
+
+
+# ======================================================================== #
+#                              TESTING                                     #
+# ======================================================================== #
+
+if __name__ == "__main__":
+    resources = ResourceManager(idle_seconds=1.0, budget_mb=None, check_seconds=0.5)
+
+    def load_model():
+        time.sleep(0.5)
+        return bytearray(200 * 2**20)  # stands in for a model
+
+    resources.register("model", load_model)
+    resources.register("small", lambda: bytearray(50 * 2**20))
+
+    resources.preload()
+    print("rss after preload call:", f"{process_rss_mb():.0f} MB")
+    model = resources.acquire("model")
+    print("acquired:", resources.status())
+    resources.release("model")
+    del model
+
+    time.sleep(2.5)
+    print("after idle:", resources.status(), f"{process_rss_mb():.0f} MB")
+
+    resources.budget_mb = process_rss_mb() + 100
+    resources.acquire("model"), resources.release("model")
+    resources.acquire("small"), resources.release("small")
+    print("budget:", resources.status())
+    resources.close()
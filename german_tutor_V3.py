@@ -1,7 +1,15 @@
-from MODEL_3.audio import stt, wake_word,tts
-from MODEL_3.LLM import correction_engine
+from MODEL_3.audio import stt, wake_word,tts, voice_catalog, replay, voice_commands, noise_filter
+from MODEL_3.audio.audio_io import AudioPlayer
+from MODEL_3.LLM import correction_engine, intent_router, length_controller, grammar_checker
+from MODEL_3.LLM.response_formatter import StructuredFormatter
 from MODEL_3.RAG import tavily_rag
+from MODEL_3.metrics import metrics
+from MODEL_3.resources import ResourceManager
+from MODEL_3.bootstrap import Bootstrap
 
+import atexit
+import concurrent.futures
+import threading
 import yaml
 from pathlib import Path
 from rich.console import Console
@@ -14,6 +22,22 @@ def load_config():
         return yaml.safe_load(f)
 
 config = load_config()
+metrics.configure(log_path=config["metrics"]["log_path"])
+
+# STT worker processes are forked first, before this process loads any model
+stt_workers = stt.SttWorkerPool(
+    model_size = config["faster_whisper"]["model_size"],
+    device = config["faster_whisper"]["device"],
+    compute_type = config["faster_whisper"]["compute_type"],
+    cpu_threads = config["faster_whisper"]["cpu_threads"],
+    processes = config["faster_whisper"]["workers"]["processes"],
+    replicas = config["faster_whisper"]["workers"]["replicas"],
+    slots = config["faster_whisper"]["workers"]["slots"],
+    max_seconds = config["faster_whisper"]["workers"]["max_seconds"],
+    wait = False  # models load while the rest starts up
+) if config["faster_whisper"]["workers"]["processes"] > 0 else None
+if stt_workers is not None:
+    atexit.register(stt_workers.close)  # any exit path, also a failure while starting up
 
 console = Console()
 if config["RAG"]["use_RAG"]:
@@ -25,69 +49,327 @@ else:
         "Enable it by setting `RAG.use_RAG: true` in the config file.",
         style="dim")
 
+def web_search(query):
+    return tavily_rag.search_web(query=query,
+                                include_answer=config["RAG"]["include_answer"],
+                                search_depth=config["RAG"]["search_depth"],
+                                max_results=config["RAG"]["max_results"])
+
+# web searches started early on the STT draft (two-pass mode)
+search_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+
+router = intent_router.IntentRouter(
+    routes=config["LLM"]["routes"],
+    default_model=config["LLM"]["model"]
+) if config["LLM"]["use_router"] else None
+
+lengths = length_controller.LengthController(
+    verbosity=config["LLM"]["verbosity"],
+    min_tokens=config["LLM"]["min_tokens"],
+    max_tokens=config["LLM"]["max_tokens"]
+) if config["LLM"]["use_length_control"] else None
+
+# last replies kept as PCM, for "slower please" without a new LLM turn
+replays = replay.ReplayBuffer(
+    keep = config["audio"]["replay"]["keep_replies"],
+    slow_speed = config["audio"]["replay"]["slow_speed"],
+    min_speed = config["audio"]["replay"]["min_speed"],
+    player = AudioPlayer()
+)
+
+# everything but the wake word is built in the background, each stage is waited
+# for only where it is first needed (the wake word is listened for right away)
+boot = Bootstrap()
+
+def build_tts():
+    # offline voice: the main backend, or the fallback when Edge is down / too slow
+    local_tts = tts.LocalTTS(
+        engine = config["audio"]["local_tts"]["engine"],
+        voice = config["audio"]["local_tts"]["voice"],
+        voices = config["audio"]["local_tts"]["voices"],
+        voice_switching = config["audio"]["voice_switching"],
+        min_span_words = config["audio"]["min_span_words"],
+        speed = config["audio"]["local_tts"]["speed"],
+        replay = replays
+    )
+    if not local_tts.available():
+        console.print(f"{local_tts.engine} not found, no offline voice available.", style="dim")
+
+    # voice list from the disk cache, refreshed in the background when stale
+    catalog = voice_catalog.VoiceCatalog(
+        cache_path = config["audio"]["voice_catalog"]["cache_path"],
+        refresh_days = config["audio"]["voice_catalog"]["refresh_days"]
+    ).load()
+
+    # tts is built once, it keeps one event loop alive for the whole run
+    if config["audio"]["tts_backend"] == "local":
+        my_tts = local_tts
+    else:
+        my_tts = tts.EdgeTTS(
+            voice = config["audio"]["voice"]
+                or catalog.resolve("de", config["audio"]["voice_gender"])
+                or "de-DE-KatjaNeural",
+            rate = config["audio"]["rate"],
+            pitch = config["audio"]["pitch"],
+            voices = config["audio"]["voices"],
+            voice_switching = config["audio"]["voice_switching"],
+            min_span_words = config["audio"]["min_span_words"],
+            max_concurrency = config["audio"]["max_concurrent_synthesis"],
+            fallback = local_tts if local_tts.available() else None,
+            first_byte_deadline = config["audio"]["first_byte_deadline"],
+            catalog = catalog,
+            gender = config["audio"]["voice_gender"],
+            replay = replays
+        )
+    return my_tts
+
+boot.start("tts", build_tts)
+boot.start("llm", lambda: correction_engine.GermanTutor(
+    model= config["LLM"]["model"],
+    length_controller= lengths
+))
+
+checker = grammar_checker.GermanGrammarChecker() if config["grammar"]["mode"] != "off" else None
+
+# coughs, TV audio and Whisper hallucinations never become turns
+noise = noise_filter.NoiseFilter(
+    max_no_speech_prob = config["faster_whisper"]["noise_filter"]["max_no_speech_prob"],
+    min_avg_logprob = config["faster_whisper"]["noise_filter"]["min_avg_logprob"],
+    max_tokens_per_second = config["faster_whisper"]["noise_filter"]["max_tokens_per_second"],
+    suspicious_no_speech_prob = config["faster_whisper"]["noise_filter"]["suspicious_no_speech_prob"]
+) if config["faster_whisper"]["noise_filter"]["enabled"] else None
+
+# models stay loaded between sessions; idle ones are unloaded and reloaded on the wake word
+resources = ResourceManager(
+    idle_seconds = config["resources"]["idle_minutes"] * 60 if config["resources"]["idle_minutes"] else None,
+    budget_mb = config["resources"]["memory_budget_mb"]
+)
+
+def load_whisper():
+    if stt_workers is not None:
+        return stt_workers  # forked at startup, stays up
+    if config["faster_whisper"]["batching"]["enabled"]:
+        # concurrent sessions share one main model and are decoded in batches
+        return stt.BatchScheduler.load(
+            model_size = config["faster_whisper"]["model_size"],
+            device = config["faster_whisper"]["device"],
+            compute_type = config["faster_whisper"]["compute_type"],
+            cpu_threads = config["faster_whisper"]["cpu_threads"],
+            num_workers = config["faster_whisper"]["num_workers"],
+            window_ms = config["faster_whisper"]["batching"]["window_ms"],
+            max_wait_ms = config["faster_whisper"]["batching"]["max_wait_ms"],
+            max_batch = config["faster_whisper"]["batching"]["max_batch"]
+        )
+    return stt.WhisperModel(
+        config["faster_whisper"]["model_size"],
+        device = config["faster_whisper"]["device"],
+        compute_type = config["faster_whisper"]["compute_type"],
+        cpu_threads = config["faster_whisper"]["cpu_threads"],
+        num_workers = config["faster_whisper"]["num_workers"]
+    )
+
+resources.register("whisper", load_whisper,
+    unload = lambda model: model.stop() if isinstance(model, stt.BatchScheduler) else None,
+    pinned = stt_workers is not None,
+    external_mb = (lambda pool: sum(usage[1] for usage in pool.memory().values() if usage))
+        if stt_workers is not None else None
+)
+if config["faster_whisper"]["small_model_size"]:
+    resources.register("whisper_small", lambda: stt.WhisperModel(
+        config["faster_whisper"]["small_model_size"],
+        device = config["faster_whisper"]["device"],
+        compute_type = config["faster_whisper"]["compute_type"]
+    ))
+resources.register("wake_word", lambda: wake_word.WakeWordDetector(
+        keyword = config["audio"]["wake_word"],
+        sensitivity = config["audio"]["sensitivity"]
+    ),
+    unload = lambda detector: detector.cleanup(),
+    pinned = True  # it is what listens while the tutor idles
+)
+stt_models = [name for name in ("whisper", "whisper_small") if name in resources.status()]
+
+def build_stt():
+    if stt_workers is not None:
+        stt_workers.wait_ready()
+    resources.preload(*stt_models, wait=True)
+
+boot.start("stt", build_stt)
+threading.Thread(target=boot.wait_all, daemon=True).start()  # prints the startup time
+
 # 1. wake word
 # -------------
 while True:
-    detector = wake_word.WakeWordDetector(
-                keyword = config["audio"]["wake_word"],
-                sensitivity = config["audio"]["sensitivity"]
-            )
+    detector = resources.acquire("wake_word")
     try:
         if detector.wait_for_wake_word():
             
             # 2. sst
             # -------
+            # whatever is still loading (startup) or was unloaded while idle is loaded in
+            # parallel; recording starts right away and the answer waits for the models
+            resources.preload(*stt_models)
+            models = {name: resources.acquire_async(name) for name in stt_models}
             my_stt = stt.FasterWhisperSTT(
                 model_size = config["faster_whisper"]["model_size"],
                 device = config["faster_whisper"]["device"],
                 compute_type = config["faster_whisper"]["compute_type"],
+                cpu_threads = config["faster_whisper"]["cpu_threads"],
+                num_workers = config["faster_whisper"]["num_workers"],
                 language = config["faster_whisper"]["language"],
                 beam_size = config["faster_whisper"]["beam_size"],
-                vad_filter = config["faster_whisper"]["vad_filter"]
+                vad_filter = config["faster_whisper"]["vad_filter"],
+                small_model_size = config["faster_whisper"]["small_model_size"],
+                kws_max_seconds = config["faster_whisper"]["kws_max_seconds"],
+                kws_min_logprob = config["faster_whisper"]["kws_min_logprob"],
+                two_pass = config["faster_whisper"]["two_pass"],
+                adaptive_beam = config["faster_whisper"]["adaptive_beam"],
+                min_avg_logprob = config["faster_whisper"]["min_avg_logprob"],
+                max_compression_ratio = config["faster_whisper"]["max_compression_ratio"],
+                max_no_speech_prob = config["faster_whisper"]["max_no_speech_prob"],
+                noise_filter = noise,
+                pin_after = config["faster_whisper"]["language_pinning"]["pin_after"],
+                pin_min_probability = config["faster_whisper"]["language_pinning"]["min_probability"],
+                recheck_logprob = config["faster_whisper"]["language_pinning"]["recheck_logprob"],
+                dictation = config["faster_whisper"]["dictation"]["enabled"],
+                chunk_seconds = config["faster_whisper"]["dictation"]["chunk_seconds"],
+                chunk_overlap = config["faster_whisper"]["dictation"]["overlap_seconds"],
+                max_dictation_seconds = config["faster_whisper"]["dictation"]["max_seconds"],
+                model = models["whisper"],
+                small_model = models.get("whisper_small")
             )
             
+            last_reply = None  # for "translate that"
+            speculative = {}   # draft transcript -> web search started on it
+            
+            def on_draft(draft):
+                # early dispatch: search on the draft while the large model finishes
+                if config["RAG"]["use_RAG"] and my_stt.commands.match(draft) is None:
+                    speculative[draft] = search_pool.submit(web_search, draft)
+            
             try:                
                 while True:
-                    transcript = my_stt.listen_and_transcribe()
+                    speculative.clear()
+                    transcript = my_stt.listen_and_transcribe(on_draft=on_draft)
                     
                     if transcript:
                         if transcript == "__END_SESSION__":
                             print("\nSession ended")
+                            p95 = metrics.percentile("reply.latency", 95)
+                            if p95 is not None:
+                                console.print(f"LLM reply latency p95: {p95:.2f}s", style="dim")
+                            tts_bytes = metrics.percentile("tts.bytes", 50)
+                            if tts_bytes is not None:
+                                decode = metrics.percentile("tts.decode_cpu", 50)
+                                console.print(f"TTS per reply (median): {tts_bytes / 1024:.0f} KB"
+                                            + (f", {decode * 1000:.0f} ms decode CPU" if decode is not None else ""),
+                                            style="dim")
+                            rejected = metrics.count("stt.rejected")
+                            if rejected:
+                                console.print(f"Ignored {rejected} noise / hallucinated turns", style="dim")
+                            queued = metrics.percentile("stt.batch.queue_ms", 95)
+                            if queued is not None:
+                                console.print(f"STT batches: {metrics.percentile('stt.batch.size', 50):.0f} utterances (median), "
+                                            f"{queued:.0f} ms queueing p95, "
+                                            f"{metrics.percentile('stt.batch.throughput', 50):.1f}x real time", style="dim")
                             break
                         
-                        # 3. rag
-                        # --------
-                        if config["RAG"]["use_RAG"]:
-                            rag_response = tavily_rag.search_web(query=transcript,
-                                                        include_answer=config["RAG"]["include_answer"],
-                                                        search_depth=config["RAG"]["search_depth"],
-                                                        max_results=config["RAG"]["max_results"])
+                        my_tts = boot.get("tts")  # waits only if woken before it was built
                         
-                        # 4. llm
-                        # -------
-                        model = correction_engine.GermanTutor(
-                            model= config["LLM"]["model"]
+                        # 3. local voice commands: no LLM round trip
+                        # ---------------------------------------------
+                        command = my_stt.commands.match(transcript)
+                        if command in (voice_commands.REPEAT, voice_commands.SLOWER):
+                            if replays.replay(command):
+                                continue
+                        elif command in voice_commands.COMMAND_LANGUAGE:
+                            lang = voice_commands.COMMAND_LANGUAGE[command]
+                            my_stt.pin_language(lang)
+                            my_tts.follow_language(lang)
+                            console.print(f"Switched to {command.capitalize()}.", style="bold magenta")
+                            continue
+                        elif command == voice_commands.TRANSLATE and last_reply:
+                            transcript = f'Translate the German parts of your last reply into English: "{last_reply}"'
+                        
+                        # auto language mode: the default voice follows the learner's (pinned) language
+                        if config["faster_whisper"]["language"] is None:
+                            my_tts.follow_language(my_stt.last_language)
+                        
+                        # 4. local grammar fast path
+                        # ----------------------------
+                        route = router.route(transcript) if router else None
+                        grammar = checker.check(transcript) if checker and command is None else None
+                        # only when the router says it's a plain correction, never for questions
+                        answer_locally = (
+                            grammar is not None
+                            and config["grammar"]["mode"] == "answer"
+                            and route is not None
+                            and route.intent == intent_router.CORRECTION
                         )
-                        llm_response = model.response(
-                            prompt= transcript,
-                            RAG_answer=rag_response["answer"] if config["RAG"]["use_RAG"] else None, # -> send the answer only
-                            use_simple_format= config["LLM"]["use_simple_format"]
+                        
+                        if answer_locally:
+                            llm_response = StructuredFormatter().format_and_print(
+                                grammar.to_reply(), user_input=transcript
                             )
+                        else:
+                            # 5. rag
+                            # --------
+                            if config["RAG"]["use_RAG"]:
+                                draft, search = next(iter(speculative.items()), (None, None))
+                                if search is not None and stt.transcript_distance(draft, transcript) \
+                                        <= config["faster_whisper"]["draft_max_distance"]:
+                                    metrics.incr("stt.draft_kept")  # final ~ draft: keep the early search
+                                    rag_response = search.result()
+                                else:
+                                    if search is not None:
+                                        metrics.incr("stt.draft_redone")
+                                    rag_response = web_search(transcript)
+                            
+                            # 6. llm
+                            # -------
+                            model = boot.get("llm")
+                            try:
+                                llm_response = model.response(
+                                    prompt= transcript,
+                                    RAG_answer=rag_response["answer"] if config["RAG"]["use_RAG"] else None, # -> send the answer only
+                                    use_simple_format= config["LLM"]["use_simple_format"],
+                                    route= route,
+                                    structured= config["LLM"]["use_structured_output"],
+                                    grammar_hint= grammar.hint() if grammar else None,
+                                    language= my_stt.last_language if config["faster_whisper"]["language"] is None else None
+                                    )
+                            except correction_engine.APIError as e:
+                                if router:
+                                    router.log_outcome(route, **model.last_stats)  # ok=False
+                                # skip the turn, the session goes on
+                                console.print(f"LLM request failed: {e}", style="bold red")
+                                continue
+                            if router:
+                                router.log_outcome(route, **model.last_stats)
                         
-                        # 5. tts
+                        # 7. tts
                         # -------
-                        my_tts = tts.EdgeTTS(
-                                voice=config["audio"]["voice"],
-                                rate = config["audio"]["rate"],
-                                pitch = config["audio"]["pitch"]
-                                )
-                        my_tts.speak(llm_response)
+                        if not isinstance(llm_response, str):
+                            last_reply = " ".join(part for part in llm_response.speech_parts() if part)
+                        else:
+                            last_reply = llm_response
+                        
+                        if not isinstance(llm_response, str):
+                            my_tts.speak_structured(llm_response)
+                        elif config["audio"]["voice_switching"]:
+                            my_tts.speak_mixed(model.last_response) # -> raw markdown keeps the language hints
+                        else:
+                            my_tts.speak(llm_response)
                     
             except KeyboardInterrupt:
                 print("\nInterrupted by user")
             finally:
                 my_stt.cleanup()
+                for name, future in models.items():
+                    if future.exception() is None:  # (waits for a load still running)
+                        resources.release(name)
+                del models
                 
     finally:
-        detector.cleanup()
+        resources.release("wake_word")
 